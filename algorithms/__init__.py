@@ -1,3 +1,49 @@
 """
 Scheduling algorithms package for the Energy-Efficient CPU Scheduling Simulator.
-""" 
\ No newline at end of file
+"""
+from typing import Dict, List, Type
+from models.scheduler import Scheduler
+from .traditional import FCFS, SJF, SRTF, Priority, PreemptivePriority, RoundRobin
+from .energy_efficient import DVFS, DPM, EASJF, GRR, EAEDF, YDS
+
+# Display name -> scheduler class, in the order the GUI lists them
+ALGORITHMS: Dict[str, Type[Scheduler]] = {
+    "FCFS": FCFS,
+    "SJF": SJF,
+    "SJF (Preemptive)": SRTF,
+    "Priority": Priority,
+    "Priority (Preemptive)": PreemptivePriority,
+    "Round Robin": RoundRobin,
+    "DVFS": DVFS,
+    "DPM": DPM,
+    "EA-SJF": EASJF,
+    "GRR": GRR,
+    "EA-EDF": EAEDF,
+    "YDS": YDS,
+}
+
+_ALIASES = {
+    "srtf": "SJF (Preemptive)",
+    "rr": "Round Robin",
+}
+
+def _normalize(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+_LOOKUP = {_normalize(name): name for name in ALGORITHMS}
+_LOOKUP.update({_normalize(alias): name for alias, name in _ALIASES.items()})
+
+def algorithm_names() -> List[str]:
+    """Return the registered algorithm names"""
+    return list(ALGORITHMS)
+
+def get_algorithm(name: str) -> Type[Scheduler]:
+    """Resolve an algorithm name (case and punctuation insensitive) to its class"""
+    try:
+        return ALGORITHMS[_LOOKUP[_normalize(name)]]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm {name!r}; choose from {', '.join(ALGORITHMS)}") from None
+
+def create_scheduler(name: str, **kwargs) -> Scheduler:
+    """Build a scheduler by algorithm name, passing keyword arguments to it"""
+    return get_algorithm(name)(**kwargs)
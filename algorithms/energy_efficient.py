@@ -0,0 +1,215 @@
+from typing import Dict, List, Optional, Tuple
+from models.scheduler import Scheduler
+from models.process import Process
+from models.ready_queue import PriorityReadyQueue
+from algorithms.traditional import FCFS
+
+# Discrete (voltage, frequency) operating points, sorted by frequency.
+# Frequencies are relative to the nominal speed burst times are measured at.
+OPERATING_POINTS: List[Tuple[float, float]] = [
+    (0.7, 0.4),
+    (0.8, 0.6),
+    (0.9, 0.8),
+    (1.0, 1.0),
+]
+
+def select_operating_point(speed: float,
+                           operating_points: List[Tuple[float, float]] = OPERATING_POINTS) -> Tuple[float, float]:
+    """Return the slowest operating point running at least at the given speed"""
+    for voltage, frequency in operating_points:
+        if frequency >= speed:
+            return voltage, frequency
+    return operating_points[-1]
+
+class DVFS(Scheduler):
+    """FCFS with Dynamic Voltage and Frequency Scaling.
+
+    Each dispatch runs at the slowest operating point that keeps up with the
+    ready queue backlog and still meets the process's deadline, if it has one.
+    """
+
+    queue_ordered = True
+
+    def __init__(self, operating_points: Optional[List[Tuple[float, float]]] = None,
+                 high_load: int = 4, **kwargs):
+        super().__init__(**kwargs)
+        self.operating_points = sorted(operating_points or OPERATING_POINTS, key=lambda point: point[1])
+        self.high_load = high_load  # Ready queue length that calls for full speed
+
+    def next_process(self) -> Optional[Process]:
+        """Select the next process and set its operating point"""
+        process = self.ready_queue.pop()
+        if process is not None:
+            speed = self.required_speed(process)
+            process.set_dvfs_parameters(*select_operating_point(speed, self.operating_points))
+        return process
+
+    def required_speed(self, process: Process) -> float:
+        """Return the frequency the process should at least run at"""
+        max_frequency = self.operating_points[-1][1]
+        speed = max_frequency * min(1.0, len(self.ready_queue) / self.high_load)
+        if process.deadline is not None:
+            slack = process.deadline - self.current_time
+            speed = max(speed, process.remaining_time / slack if slack > 0 else max_frequency)
+        return speed
+
+class DPM(FCFS):
+    """FCFS with Dynamic Power Management.
+
+    The CPU draws idle_power while idle, as under every policy, and drops to
+    sleep_power once it has been idle for sleep_threshold. Waking up costs
+    wakeup_latency and wakeup_energy.
+    """
+
+    queue_ordered = False  # Sleep states are not modelled per core
+
+    def __init__(self, sleep_power: float = 0.05, sleep_threshold: float = 2.0,
+                 wakeup_latency: float = 0.5, wakeup_energy: float = 0.2, **kwargs):
+        super().__init__(**kwargs)
+        self.sleep_power = sleep_power
+        self.sleep_threshold = sleep_threshold
+        self.wakeup_latency = wakeup_latency
+        self.wakeup_energy = wakeup_energy
+        self.sleep_transitions = 0
+        self._idle_since: Optional[float] = None
+
+    def idle_energy(self, start_time: float, end_time: float) -> float:
+        if self._idle_since is None:
+            self._idle_since = start_time
+        sleep_at = self._idle_since + self.sleep_threshold
+        awake = max(0.0, min(end_time, sleep_at) - start_time)
+        asleep = (end_time - start_time) - awake
+        return awake * self.idle_power + asleep * self.sleep_power
+
+    def dispatch_overhead(self, process: Process) -> float:
+        overhead = super().dispatch_overhead(process)
+        if self._idle_since is not None:
+            if self.current_time - self._idle_since >= self.sleep_threshold:
+                overhead += self.wakeup_latency
+                self.total_energy_consumption += self.wakeup_energy
+                self.sleep_transitions += 1
+            self._idle_since = None
+        return overhead
+
+    def reset(self):
+        super().reset()
+        self.sleep_transitions = 0
+        self._idle_since = None
+
+class EASJF(DVFS):
+    """Energy-Aware SJF: shortest job first, with DVFS following the backlog"""
+
+    def create_ready_queue(self):
+        return PriorityReadyQueue(key=lambda p: (p.remaining_time, p.arrival_time))
+
+class GRR(DVFS):
+    """Green Round Robin.
+
+    Round robin whose quantum follows the mean remaining work of the ready
+    processes, so long jobs are switched less often, combined with DVFS.
+    """
+
+    queue_ordered = False  # The quantum depends on the whole ready queue
+
+    def __init__(self, min_quantum: float = 1.0, max_quantum: float = 8.0, **kwargs):
+        super().__init__(**kwargs)
+        if min_quantum <= 0 or max_quantum < min_quantum:
+            raise ValueError("quanta must satisfy 0 < min_quantum <= max_quantum")
+        self.min_quantum = min_quantum
+        self.max_quantum = max_quantum
+        self._ready_work = 0.0  # Remaining work of the processes in the ready queue
+
+    def on_arrival(self, process: Process):
+        super().on_arrival(process)
+        self._ready_work += process.remaining_time
+
+    def requeue(self, process: Process):
+        super().requeue(process)
+        self._ready_work += process.remaining_time
+
+    def next_process(self) -> Optional[Process]:
+        process = super().next_process()
+        if process is not None:
+            self._ready_work = max(0.0, self._ready_work - process.remaining_time)
+        return process
+
+    def time_slice(self, process: Process) -> Optional[float]:
+        mean_work = (self._ready_work + process.remaining_time) / (len(self.ready_queue) + 1)
+        return min(self.max_quantum, max(self.min_quantum, mean_work / process.frequency))
+
+    def reset(self):
+        super().reset()
+        self._ready_work = 0.0
+
+class EAEDF(DVFS):
+    """Energy-Aware Earliest Deadline First (preemptive).
+
+    Processes without a deadline are served after every process that has one.
+    """
+
+    preemptive = True
+
+    def create_ready_queue(self):
+        return PriorityReadyQueue(key=lambda p: (self._deadline(p), p.arrival_time))
+
+    @staticmethod
+    def _deadline(process: Process) -> float:
+        return process.deadline if process.deadline is not None else float('inf')
+
+    def should_preempt(self) -> bool:
+        """Preempt when a newly arrived process has an earlier deadline"""
+        key = self.ready_queue.peek_key()
+        return key is not None and key[0] < self._deadline(self.current_process)
+
+class YDS(EAEDF):
+    """Minimum-energy DVFS (Yao-Demers-Shenker) executed under preemptive EDF.
+
+    The speed of every process with a deadline is planned offline and
+    rounded up to an operating point. Processes added to the scheduler are
+    planned together; sources are read ahead and planned one group of
+    overlapping [arrival, deadline] windows at a time (see
+    algorithms.planner.PlannedSource), which gives the same plan. Processes
+    without a deadline run at the online DVFS choice.
+    """
+
+    queue_ordered = False  # The plan assumes a single processor
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.plan: Optional[Dict[int, Tuple[float, float]]] = None  # pid -> (voltage, frequency)
+        self.source_plan: Dict[int, Tuple[float, float]] = {}  # Same, for processes fed from sources
+
+    def add_process(self, process: Process):
+        super().add_process(process)
+        self.plan = None
+
+    def add_processes(self, processes: List[Process]):
+        super().add_processes(processes)
+        self.plan = None
+
+    def _pull(self, source, previous: Optional[Process]):
+        from algorithms.planner import PlannedSource
+        if not isinstance(source, PlannedSource):
+            source = PlannedSource(source, self.source_plan, self.operating_points)
+        super()._pull(source, previous)
+
+    def next_process(self) -> Optional[Process]:
+        if self.plan is None:
+            from algorithms.planner import plan_operating_points
+            self.plan = plan_operating_points(self.processes, self.operating_points)
+        process = self.ready_queue.pop()
+        if process is not None:
+            point = self.plan.get(process.pid) or self.source_plan.get(process.pid)
+            if point is None:
+                point = select_operating_point(self.required_speed(process), self.operating_points)
+            process.set_dvfs_parameters(*point)
+        return process
+
+    def _record_completion(self, process: Process):
+        super()._record_completion(process)
+        self.source_plan.pop(process.pid, None)
+
+    def reset(self):
+        super().reset()
+        self.plan = None
+        self.source_plan = {}
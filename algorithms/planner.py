@@ -0,0 +1,169 @@
+"""
+Offline minimum-energy speed planning (Yao, Demers and Shenker, 1995).
+
+Given processes with arrival times, deadlines and work (burst time at
+frequency 1.0), yds_speeds() returns the speed each process should run at
+so that every deadline is met under EDF with the least energy for any
+convex power function. The algorithm repeatedly finds the critical
+interval, the window [a, b] whose contained work per unit of time is
+largest, fixes that density as the speed of the processes inside it, and
+removes the window from the timeline.
+
+Processes whose [arrival, deadline] windows do not overlap are planned
+separately. Within a group of k overlapping processes each critical
+interval is found with a vectorized sweep over candidate start times in
+O(k^2), so a plan costs O(k^3) in the worst case and far less when
+critical intervals hold many processes. No O(n log n) algorithm
+is known for general release times and deadlines; the best known bound is
+O(n^2 log n) (Li, Yao and Yao, 2006).
+
+Planned speeds are rounded up to the next discrete operating point, which
+keeps every deadline the continuous plan meets. Energy per unit of work is
+V^2 in this model, so the slowest sufficient point is also the cheapest.
+
+The same independence lets PlannedSource plan a stream sorted by arrival
+time one group at a time: a group is complete once the next process
+arrives after every deadline in it, so only one group is held in memory.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+from models.process import Process
+from algorithms.energy_efficient import select_operating_point
+
+class CriticalInterval(NamedTuple):
+    speed: float
+    pids: List[int]
+
+def critical_intervals(processes: Iterable[Process]) -> List[CriticalInterval]:
+    """Return the critical intervals of the processes that have deadlines, densest first.
+
+    Processes whose deadline is not after their arrival cannot be planned
+    and are returned first with an infinite speed.
+    """
+    jobs = [p for p in processes if p.deadline is not None and p.remaining_time > 0]
+    intervals = []
+    infeasible = [p.pid for p in jobs if p.deadline <= p.arrival_time]
+    if infeasible:
+        intervals.append(CriticalInterval(float('inf'), infeasible))
+    jobs = [p for p in jobs if p.deadline > p.arrival_time]
+    if not jobs:
+        return intervals
+
+    pids = np.array([p.pid for p in jobs])
+    release = np.array([p.arrival_time for p in jobs], dtype=float)
+    deadline = np.array([p.deadline for p in jobs], dtype=float)
+    work = np.array([p.remaining_time for p in jobs], dtype=float)
+
+    # A window spanning a gap in which no process may run is never the
+    # densest, so each group of overlapping [arrival, deadline] windows is
+    # planned on its own
+    order = np.argsort(release, kind="stable")
+    reach = np.maximum.accumulate(deadline[order])
+    boundaries = np.flatnonzero(release[order][1:] >= reach[:-1]) + 1
+    for group in np.split(order, boundaries):
+        intervals.extend(_plan_group(pids[group], release[group], deadline[group], work[group]))
+    intervals.sort(key=lambda interval: -interval.speed)
+    return intervals
+
+def _plan_group(pids: np.ndarray, release: np.ndarray, deadline: np.ndarray,
+                work: np.ndarray) -> List[CriticalInterval]:
+    """Peel critical intervals off one group of overlapping processes"""
+    intervals = []
+    while len(pids):
+        order = np.argsort(deadline, kind="stable")
+        pids, release, deadline, work = pids[order], release[order], deadline[order], work[order]
+
+        best_speed, best_start, best_end = -1.0, 0.0, 0.0
+        for start in np.unique(release):
+            inside = release >= start
+            # Work of the processes released at or after start, up to each deadline
+            cumulative = np.cumsum(np.where(inside, work, 0.0))
+            candidates = np.flatnonzero(inside & (deadline > start))
+            if len(candidates) == 0:
+                continue
+            density = cumulative[candidates] / (deadline[candidates] - start)
+            k = int(np.argmax(density))
+            if density[k] > best_speed:
+                best_speed, best_start, best_end = float(density[k]), float(start), float(deadline[candidates[k]])
+
+        chosen = (release >= best_start) & (deadline <= best_end)
+        intervals.append(CriticalInterval(best_speed, pids[chosen].tolist()))
+
+        # Cut [best_start, best_end] out of the timeline of the remaining processes
+        keep = ~chosen
+        pids, release, deadline, work = pids[keep], release[keep], deadline[keep], work[keep]
+        length = best_end - best_start
+        for times in (release, deadline):
+            times[:] = np.where(times >= best_end, times - length,
+                                np.where(times > best_start, best_start, times))
+    return intervals
+
+def yds_speeds(processes: Iterable[Process]) -> Dict[int, float]:
+    """Return the minimum-energy speed of every process with a deadline, by pid"""
+    return {pid: interval.speed for interval in critical_intervals(processes) for pid in interval.pids}
+
+def plan_operating_points(processes: Iterable[Process],
+                          operating_points: List[Tuple[float, float]]) -> Dict[int, Tuple[float, float]]:
+    """Return the (voltage, frequency) of every process with a deadline, by pid"""
+    points = sorted(operating_points, key=lambda point: point[1])
+    return {pid: select_operating_point(speed, points) for pid, speed in yds_speeds(processes).items()}
+
+def plan_energy(processes: Iterable[Process], plan: Dict[int, Tuple[float, float]],
+                default: Optional[Tuple[float, float]] = None) -> float:
+    """Return the energy V^2 * f * (work / f) of running every process at its planned point"""
+    total = 0.0
+    for process in processes:
+        voltage, _ = plan.get(process.pid, default or (process.voltage, process.frequency))
+        total += voltage ** 2 * process.burst_time
+    return total
+
+class PlannedSource:
+    """Iterator over a process source sorted by arrival time that plans each
+    group of overlapping processes before yielding it.
+
+    Planned points are stored by pid in `plan`. The source is read ahead up
+    to the first process of the next group; the iterator pickles whenever
+    the source does.
+    """
+
+    def __init__(self, source: Iterator[Process], plan: Dict[int, Tuple[float, float]],
+                 operating_points: List[Tuple[float, float]]):
+        self.source = source
+        self.plan = plan
+        self.operating_points = operating_points
+        self._group: deque = deque()  # Planned processes not yet yielded
+        self._next: Optional[Process] = None  # First process of the next group
+        self._exhausted = False  # The source has ended and is not read again
+
+    def __iter__(self) -> "PlannedSource":
+        return self
+
+    def __next__(self) -> Process:
+        if not self._group:
+            self._read_group()
+            if not self._group:
+                raise StopIteration
+        return self._group.popleft()
+
+    def _read_group(self):
+        """Read and plan the processes up to the next gap in the [arrival, deadline] windows"""
+        group = []
+        reach = float('-inf')  # Latest deadline in the group
+        process = self._next if self._next is not None else self._read()
+        while process is not None and (not group or process.arrival_time < reach):
+            group.append(process)
+            if process.deadline is not None:
+                reach = max(reach, process.deadline)
+            process = self._read()
+        self._next = process
+        self.plan.update(plan_operating_points(group, self.operating_points))
+        self._group.extend(group)
+
+    def _read(self) -> Optional[Process]:
+        """Return the next process of the source, or None once it has ended"""
+        if self._exhausted:
+            return None
+        process = next(self.source, None)
+        self._exhausted = process is None
+        return process
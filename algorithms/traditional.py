@@ -1,62 +1,77 @@
 from typing import Optional
 from models.scheduler import Scheduler
 from models.process import Process
+from models.ready_queue import PriorityReadyQueue
 
 class FCFS(Scheduler):
-    def __init__(self):
-        super().__init__()
-        self.ready_queue = []
+    queue_ordered = True
 
     def next_process(self) -> Optional[Process]:
         """Select the next process to execute using FCFS algorithm"""
-        # If there's a current process and it's not completed, continue executing it
-        if self.current_process and not self.current_process.is_completed:
-            return self.current_process
-
-        # Add arrived processes to ready queue
-        for process in self.processes:
-            if (not process.is_completed and 
-                process.arrival_time <= self.current_time and 
-                process not in self.ready_queue):
-                self.ready_queue.append(process)
-
-        # Sort ready queue by arrival time
-        self.ready_queue.sort(key=lambda x: x.arrival_time)
-
-        # If ready queue is empty, return None
-        if not self.ready_queue:
-            return None
-
-        # Get the next process from the ready queue
-        next_process = self.ready_queue.pop(0)
-        
-        # If this is the first time the process is being executed
-        if next_process.start_time is None:
-            next_process.start_time = self.current_time
-            self.update_gantt_chart(next_process, self.current_time, 
-                                  self.current_time + next_process.remaining_time)
-
-        return next_process
-
-    def step(self, time_interval: float = 1.0) -> bool:
-        """Execute one step of the scheduling algorithm"""
-        # Update current time
-        self.current_time += time_interval
-
-        # Get next process to execute
-        self.current_process = self.next_process()
-
-        # If no process is available, return False
-        if self.current_process is None:
+        # The ready queue is FIFO and admission happens in arrival order
+        return self.ready_queue.pop()
+
+class SJF(Scheduler):
+    """Non-preemptive Shortest Job First"""
+
+    queue_ordered = True
+
+    def create_ready_queue(self):
+        return PriorityReadyQueue(key=lambda p: (p.remaining_time, p.arrival_time))
+
+    def next_process(self) -> Optional[Process]:
+        """Select the ready process with the shortest remaining burst"""
+        return self.ready_queue.pop()
+
+class SRTF(SJF):
+    """Preemptive SJF (Shortest Remaining Time First)"""
+
+    preemptive = True
+
+    def should_preempt(self) -> bool:
+        """Preempt when a newly arrived process needs less time than the current one"""
+        key = self.ready_queue.peek_key()
+        return key is not None and key[0] < self.current_process.remaining_time
+
+class Priority(Scheduler):
+    """Priority scheduling, where a lower number means a higher priority"""
+
+    queue_ordered = True
+
+    def __init__(self, preemptive: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.preemptive = preemptive
+
+    def create_ready_queue(self):
+        return PriorityReadyQueue(key=lambda p: (p.priority, p.arrival_time))
+
+    def next_process(self) -> Optional[Process]:
+        """Select the ready process with the highest priority"""
+        return self.ready_queue.pop()
+
+    def should_preempt(self) -> bool:
+        """Preempt when a newly arrived process has a higher priority"""
+        if not self.preemptive:
             return False
+        key = self.ready_queue.peek_key()
+        return key is not None and key[0] < self.current_process.priority
+
+class PreemptivePriority(Priority):
+    def __init__(self, preemptive: bool = True, **kwargs):
+        super().__init__(preemptive=preemptive, **kwargs)
 
-        # Execute the current process
-        completed = self.execute_process(time_interval)
+class RoundRobin(Scheduler):
+    queue_ordered = True
 
-        # Update Gantt chart if process is completed
-        if completed:
-            self.update_gantt_chart(self.current_process, 
-                                  self.current_process.start_time,
-                                  self.current_process.completion_time)
+    def __init__(self, time_quantum: float = 2.0, **kwargs):
+        super().__init__(**kwargs)
+        if time_quantum <= 0:
+            raise ValueError("time_quantum must be positive")
+        self.time_quantum = time_quantum
+
+    def next_process(self) -> Optional[Process]:
+        """Select the process at the head of the FIFO ready queue"""
+        return self.ready_queue.pop()
 
-        return True 
\ No newline at end of file
+    def time_slice(self, process: Process) -> Optional[float]:
+        return self.time_quantum
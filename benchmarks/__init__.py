@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Energy-Efficient CPU Scheduling Simulator.
+"""
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Benchmark suite for scheduler throughput, memory and scaling.
+
+    python -m benchmarks.suite run --sizes 1000 10000 100000 --out bench.json
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 0.15
+
+Each case runs one algorithm over a synthetic workload in a fresh child
+process, so peak RSS is measured per case. "run" cases drive the event loop
+with Scheduler.run(); "step" cases mimic the GUI, calling step() and
+get_metrics() once per time unit. "table" cases feed the workload from a
+ProcessTable with add_table(), "process" cases as Process objects with
+add_processes(), which also counts their memory. Results are written as JSON together with
+a fitted scaling exponent (time ~ n^k) per algorithm and distribution.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from algorithms import algorithm_names, create_scheduler
+from models.process_table import ProcessTable
+from utils.generator import PRESETS, WorkloadSpec, generate_table, preset
+
+DISTRIBUTIONS = ("poisson", "uniform", "bursty")
+DEFAULT_ALGORITHMS = ("FCFS", "SJF", "SJF (Preemptive)", "Round Robin", "EA-EDF")
+STORAGES = ("table", "process")
+
+def synthetic_table(size: int, distribution: str, seed: int = 0, load: float = 0.9) -> ProcessTable:
+    """Build a workload of `size` processes at the given CPU load.
+
+    distribution is one of DISTRIBUTIONS, the arrival processes of
+    utils.generator with exponential bursts, eight equally likely
+    priorities and a deadline on every process, or a utils.generator preset.
+    """
+    if distribution in PRESETS:
+        return generate_table(preset(distribution, size, seed, load=load))
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}; "
+                         f"choose from {', '.join(DISTRIBUTIONS + tuple(PRESETS))}")
+    return generate_table(WorkloadSpec(size, seed, arrivals=distribution, load=load, priorities=(1.0,) * 8))
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(algorithm: str, distribution: str, size: int, mode: str = "run", seed: int = 0,
+             storage: str = "table") -> dict:
+    """Time one benchmark case in the current process"""
+    table = synthetic_table(size, distribution, seed)
+    rss_before = _peak_rss_mb()
+    scheduler = create_scheduler(algorithm, keep_completed=False)
+    if storage == "table":
+        scheduler.add_table(table)
+    elif storage == "process":
+        scheduler.add_processes(table.to_processes())
+        del table
+    else:
+        raise ValueError(f"Unknown storage {storage!r}; choose from {', '.join(STORAGES)}")
+
+    started = time.perf_counter()
+    if mode == "run":
+        scheduler.run()
+    else:
+        while not scheduler.is_complete():
+            scheduler.step(1.0)
+            scheduler.get_metrics()
+    wall_time = time.perf_counter() - started
+
+    # The engine's events: arrivals, completions and preemptions. Dispatches
+    # are not queued; they follow from these
+    events = size + scheduler.metrics.count + scheduler.preemptions
+    return {
+        "algorithm": algorithm,
+        "distribution": distribution,
+        "size": size,
+        "mode": mode,
+        "storage": storage,
+        "wall_time": wall_time,
+        "events": events,
+        "events_per_sec": events / wall_time if wall_time > 0 else float("inf"),
+        "processes_per_sec": size / wall_time if wall_time > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+    }
+
+def _child(connection, *args):
+    try:
+        connection.send(run_case(*args))
+    except Exception as exc:  # Report failures instead of hanging the parent
+        connection.send({"error": repr(exc)})
+    finally:
+        connection.close()
+
+def run_isolated(*args) -> dict:
+    """Run a case in a fresh child process so its peak RSS is its own"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_child, args=(sender, *args))
+    child.start()
+    sender.close()
+    result = receiver.recv()
+    child.join()
+    if "error" in result:
+        raise RuntimeError(f"Benchmark case {args} failed: {result['error']}")
+    return result
+
+def scaling_exponents(results: List[dict]) -> Dict[str, float]:
+    """Least-squares slope of log(wall_time) against log(size) per series"""
+    series: Dict[str, List[tuple]] = {}
+    for r in results:
+        key = f"{r['algorithm']}/{r['distribution']}/{r['mode']}/{r.get('storage', 'table')}"
+        series.setdefault(key, []).append((math.log(r["size"]), math.log(max(r["wall_time"], 1e-9))))
+    exponents = {}
+    for key, points in series.items():
+        if len({x for x, _ in points}) < 2:
+            continue
+        slope, _ = np.polyfit([x for x, _ in points], [y for _, y in points], 1)
+        exponents[key] = float(slope)
+    return exponents
+
+def run_suite(algorithms: Iterable[str], distributions: Iterable[str], sizes: Iterable[int],
+              modes: Iterable[str] = ("run",), step_max_size: int = 10000,
+              isolate: bool = True, seed: int = 0, storages: Iterable[str] = STORAGES) -> dict:
+    """Run every case and return the JSON-ready report"""
+    results = []
+    for mode in modes:
+        for algorithm in algorithms:
+            for distribution in distributions:
+                for size in sizes:
+                    if mode == "step" and size > step_max_size:
+                        continue
+                    for storage in storages:
+                        args = (algorithm, distribution, size, mode, seed, storage)
+                        result = run_isolated(*args) if isolate else run_case(*args)
+                        print(f"{mode:4s} {storage:7s} {algorithm:22s} {distribution:8s} n={size:<9d} "
+                              f"{result['wall_time']:8.3f}s {result['events_per_sec']:12.0f} ev/s "
+                              f"{result['peak_rss_mb']:8.1f} MB", file=sys.stderr)
+                        results.append(result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+        },
+        "results": results,
+        "scaling": scaling_exponents(results),
+    }
+
+def compare(baseline: dict, current: dict, threshold: float = 0.15, metric: str = "wall_time") -> List[dict]:
+    """Return the cases whose metric grew by more than `threshold` (relative)"""
+    def key(r):
+        return r["algorithm"], r["distribution"], r["size"], r["mode"], r.get("storage", "table")
+
+    reference = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get(key(result))
+        if base is None or base[metric] <= 0:
+            continue
+        ratio = result[metric] / base[metric]
+        if ratio > 1 + threshold:
+            regressions.append({"case": key(result), "baseline": base[metric],
+                                "current": result[metric], "ratio": ratio})
+    return regressions
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a JSON report")
+    run_parser.add_argument("--algorithms", nargs="+", default=list(DEFAULT_ALGORITHMS),
+                            help=f"algorithms to run ({', '.join(algorithm_names())})")
+    run_parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS + tuple(PRESETS))
+    run_parser.add_argument("--sizes", nargs="+", type=lambda s: int(float(s)), default=[1000, 10000, 100000],
+                            help="process counts, e.g. 1e3 1e4 1e7")
+    run_parser.add_argument("--modes", nargs="+", choices=("run", "step"), default=["run"])
+    run_parser.add_argument("--storage", nargs="+", choices=STORAGES, default=list(STORAGES),
+                            help="feed workloads from a ProcessTable, as Process objects, or both")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--no-isolate", action="store_true", help="run cases in this process")
+    run_parser.add_argument("--out", required=True, help="JSON report path")
+
+    compare_parser = commands.add_parser("compare", help="flag slowdowns against a baseline report")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown")
+    compare_parser.add_argument("--metric", default="wall_time", choices=("wall_time", "peak_rss_mb"))
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_suite(args.algorithms, args.distributions, args.sizes, args.modes,
+                           isolate=not args.no_isolate, seed=args.seed, storages=args.storage)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold, args.metric)
+    for r in regressions:
+        print(f"REGRESSION {'/'.join(map(str, r['case']))}: {r['baseline']:.4g} -> "
+              f"{r['current']:.4g} ({r['ratio']:.2f}x)")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
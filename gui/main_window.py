@@ -1,12 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from typing import List, Dict
-import numpy as np
+from typing import List, Dict, Optional
 from models.process import Process
-from algorithms.traditional import FCFS
+from algorithms import algorithm_names, create_scheduler
+from .runner import SimulationRunner
+from .visualization import SimulationView
 
 class MainWindow:
     def __init__(self, root):
@@ -19,9 +19,12 @@ class MainWindow:
         self.root.columnconfigure(0, weight=1)
         
         # Initialize scheduler
-        self.scheduler = FCFS()
+        self.scheduler = create_scheduler("FCFS")
         self.processes: List[Process] = []
         self.current_pid = 1
+        self.runner: Optional[SimulationRunner] = None  # Created on first use
+        self._poll_id = None
+        self._complete_shown = False
         
         self.setup_gui()
         
@@ -136,9 +139,8 @@ class MainWindow:
         self.canvas = FigureCanvasTkAgg(self.fig, master=viz_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # Create subplots
-        self.gantt_ax = self.fig.add_subplot(211)
-        self.energy_ax = self.fig.add_subplot(212)
+        # Gantt chart and energy plot, drawn incrementally
+        self.view = SimulationView(self.fig, self.canvas)
         
     def setup_control_panel(self):
         """Setup the control panel with simulation controls"""
@@ -148,9 +150,8 @@ class MainWindow:
         # Algorithm selection
         ttk.Label(control_frame, text="Algorithm:").grid(row=0, column=0, padx=5)
         self.algorithm_var = tk.StringVar(value="FCFS")
-        algorithms = ["FCFS", "SJF", "Priority", "Round Robin", "DVFS"]
         self.algorithm_combo = ttk.Combobox(control_frame, textvariable=self.algorithm_var, 
-                                          values=algorithms)
+                                          values=algorithm_names(), state="readonly")
         self.algorithm_combo.grid(row=0, column=1, padx=5)
         
         # Simulation controls
@@ -160,6 +161,24 @@ class MainWindow:
                   command=self.step_simulation).grid(row=0, column=3, padx=5)
         ttk.Button(control_frame, text="Reset", 
                   command=self.reset_simulation).grid(row=0, column=4, padx=5)
+        ttk.Button(control_frame, text="Run", 
+                  command=self.run_simulation).grid(row=0, column=5, padx=5)
+        self.pause_button = ttk.Button(control_frame, text="Pause", 
+                                       command=self.toggle_pause)
+        self.pause_button.grid(row=0, column=6, padx=5)
+        
+        # Simulated time per second ("Max" runs unthrottled) and redraw rate cap
+        ttk.Label(control_frame, text="Speed:").grid(row=0, column=7, padx=5)
+        self.speed_var = tk.StringVar(value="10")
+        speed_combo = ttk.Combobox(control_frame, textvariable=self.speed_var, width=6,
+                                   values=["1", "10", "100", "1000", "Max"], state="readonly")
+        speed_combo.grid(row=0, column=8, padx=5)
+        speed_combo.bind("<<ComboboxSelected>>", lambda event: self.apply_run_settings())
+        
+        ttk.Label(control_frame, text="FPS:").grid(row=0, column=9, padx=5)
+        self.fps_var = tk.StringVar(value="30")
+        ttk.Spinbox(control_frame, from_=1, to=60, textvariable=self.fps_var, width=4,
+                    command=self.apply_run_settings).grid(row=0, column=10, padx=5)
         
     def setup_metrics_panel(self):
         """Setup the metrics panel to display performance metrics"""
@@ -185,7 +204,11 @@ class MainWindow:
             
             process = Process(self.current_pid, at, bt, priority)
             self.processes.append(process)
-            self.scheduler.add_process(process)
+            if self.runner is not None:
+                self.runner.add_process(process)
+                self._complete_shown = False
+            else:
+                self.scheduler.add_process(process)
             
             # Add to process list
             self.process_list.insert("", "end", values=(self.current_pid, at, bt, priority))
@@ -201,37 +224,63 @@ class MainWindow:
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numeric values!")
             
-    def update_visualization(self):
-        """Update the Gantt chart and energy consumption graph"""
-        # Clear previous plots
-        self.gantt_ax.clear()
-        self.energy_ax.clear()
-        
-        # Plot Gantt chart
-        if self.scheduler.gantt_chart:
-            for pid, start, end in self.scheduler.gantt_chart:
-                self.gantt_ax.broken_barh([(start, end-start)], (0, 1), 
-                                        facecolors=f'C{pid % 10}')
-                self.gantt_ax.text((start + end) / 2, 0.5, f'P{pid}', 
-                                 ha='center', va='center')
-        
-        self.gantt_ax.set_title("Gantt Chart")
-        self.gantt_ax.set_xlabel("Time")
-        self.gantt_ax.set_ylim(0, 1)
-        
-        # Plot energy consumption
-        if self.processes:
-            energy_data = [p.energy_consumption for p in self.processes]
-            self.energy_ax.bar(range(len(energy_data)), energy_data)
-            self.energy_ax.set_title("Energy Consumption per Process")
-            self.energy_ax.set_xlabel("Process ID")
-            self.energy_ax.set_ylabel("Energy Consumption")
+    def _speed(self) -> Optional[float]:
+        return None if self.speed_var.get() == "Max" else float(self.speed_var.get())
+        
+    def _fps(self) -> float:
+        try:
+            return min(60.0, max(1.0, float(self.fps_var.get())))
+        except ValueError:
+            return 30.0
+            
+    def apply_run_settings(self):
+        """Pass the speed and frame-rate settings to the running simulation"""
+        if self.runner is not None:
+            self.runner.set_speed(self._speed())
+            self.runner.set_fps(self._fps())
             
-        self.canvas.draw()
+    def ensure_runner(self) -> SimulationRunner:
+        """Create the background runner for the current scheduler if needed"""
+        if self.runner is None:
+            self.runner = SimulationRunner(self.scheduler, self._speed(), self._fps())
+            self._complete_shown = False
+            self.poll_snapshots()
+        return self.runner
+        
+    def stop_runner(self):
+        """Stop the background runner and its polling"""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self.runner is not None:
+            self.runner.stop()
+            self.runner = None
+        self.pause_button.config(text="Pause")
+            
+    def poll_snapshots(self):
+        """Render the snapshots posted by the runner, at most fps times per second"""
+        self.show_snapshots(self.runner.drain())
+        self._poll_id = self.root.after(int(1000 / self._fps()), self.poll_snapshots)
+        
+    def show_snapshots(self, snapshots):
+        """Draw the changes carried by the snapshots and show the latest metrics"""
+        if not snapshots:
+            return
+        for snapshot in snapshots:
+            self.view.set_energy(snapshot.energies)
+        latest = snapshots[-1]
+        with self.runner.lock:
+            self.view.sync_gantt(self.runner.scheduler.gantt_chart, latest.current_time)
+        self.view.render(latest.current_time)
+        self.update_metrics(latest.metrics)
+        if latest.complete and not self._complete_shown:
+            self._complete_shown = True
+            messagebox.showinfo("Complete", "Simulation completed!")
         
-    def update_metrics(self):
+    def update_metrics(self, metrics: Optional[dict] = None):
         """Update the performance metrics display"""
-        metrics = self.scheduler.get_metrics()
+        if metrics is None:
+            metrics = self.scheduler.get_metrics()
         
         self.metrics_labels["Average Waiting Time"].config(
             text=f"{metrics['avg_waiting_time']:.2f}")
@@ -248,23 +297,52 @@ class MainWindow:
             messagebox.showerror("Error", "No processes to simulate!")
             return
             
-        self.scheduler.reset()
-        self.scheduler.add_processes(self.processes)
+        # Run the selected algorithm on fresh copies of the entered processes
+        self.stop_runner()
+        self.scheduler = create_scheduler(self.algorithm_var.get())
+        self.scheduler.add_processes([
+            Process(p.pid, p.arrival_time, p.burst_time, p.priority, p.deadline)
+            for p in self.processes
+        ])
+        self.view.clear()
         self.step_simulation()
         
     def step_simulation(self):
         """Execute one step of the simulation"""
-        if self.scheduler.is_complete():
+        runner = self.ensure_runner()
+        if self._complete_shown:
             messagebox.showinfo("Complete", "Simulation completed!")
             return
             
-        self.scheduler.step()
-        self.update_visualization()
-        self.update_metrics()
+        runner.pause()
+        self.pause_button.config(text="Resume")
+        runner.step()
+        self.show_snapshots(runner.drain())
+        
+    def run_simulation(self):
+        """Run the simulation in the background until it completes or is paused"""
+        runner = self.ensure_runner()
+        if self._complete_shown:
+            messagebox.showinfo("Complete", "Simulation completed!")
+            return
+        self.apply_run_settings()
+        runner.resume()
+        self.pause_button.config(text="Pause")
+        
+    def toggle_pause(self):
+        """Pause or resume the background simulation"""
+        if self.runner is None:
+            return
+        if self.runner.paused:
+            self.run_simulation()
+        else:
+            self.runner.pause()
+            self.pause_button.config(text="Resume")
         
     def reset_simulation(self):
         """Reset the simulation"""
+        self.stop_runner()
         self.scheduler.reset()
-        self.update_visualization()
+        self.view.clear()
         self.update_metrics()
         messagebox.showinfo("Reset", "Simulation reset successfully!") 
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Background simulation runner for the GUI.
+
+The scheduler is advanced on a worker thread, which posts a Snapshot to a
+queue at most `fps` times per second. The Tk loop drains the queue on a
+timer and renders once per drain, so how fast the simulation runs does not
+depend on how fast it is drawn. Snapshots carry only what changed: the
+energy of the processes that ran since the previous snapshot, plus the O(1)
+running metrics. The Gantt chart is not copied; the view reads the part it
+shows from the scheduler while holding `lock`.
+
+The worker only touches the scheduler while holding `lock`; step() takes
+the same lock to advance by hand on the calling thread, for a Step button.
+This module does not import tkinter.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+@dataclass
+class Snapshot:
+    current_time: float
+    energies: Dict[int, float]  # pid -> energy, for processes that ran since the last snapshot
+    metrics: dict = field(default_factory=dict)
+    complete: bool = False
+
+class SimulationRunner:
+    """Run a scheduler on a worker thread, paced by speed and capped at fps.
+
+    speed is simulated time per wall-clock second; None runs as fast as
+    possible. The runner starts paused.
+    """
+
+    def __init__(self, scheduler, speed: Optional[float] = 10.0, fps: float = 30.0):
+        self.scheduler = scheduler
+        self.snapshots: "queue.Queue[Snapshot]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.set_speed(speed)
+        self.set_fps(fps)
+        self._processes = {p.pid: p for p in scheduler.processes}
+        self._sent_segments = 0  # Gantt segments already looked at
+        self._first = True
+        self._chunk = 1.0  # Simulated time per step in unpaced mode, adapted to the frame time
+        self._running = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def set_speed(self, speed: Optional[float]):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive, or None for unlimited")
+        self.speed = speed
+
+    def set_fps(self, fps: float):
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.fps = fps
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def resume(self):
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def stop(self):
+        """Stop the worker thread; the runner cannot be resumed afterwards"""
+        self._stop.set()
+        self._running.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    def add_process(self, process):
+        """Add a process to the scheduler while the runner exists"""
+        with self.lock:
+            self.scheduler.add_process(process)
+            self._processes[process.pid] = process
+
+    def step(self, time_interval: float = 1.0) -> Snapshot:
+        """Advance by one interval on the calling thread and post the snapshot"""
+        with self.lock:
+            self.scheduler.step(time_interval)
+            snapshot = self._snapshot()
+        self.snapshots.put(snapshot)
+        return snapshot
+
+    def drain(self) -> List[Snapshot]:
+        """Return every snapshot posted since the last call, oldest first"""
+        snapshots = []
+        while True:
+            try:
+                snapshots.append(self.snapshots.get_nowait())
+            except queue.Empty:
+                return snapshots
+
+    def _snapshot(self) -> Snapshot:
+        """Collect what changed since the previous snapshot (caller holds the lock)"""
+        scheduler = self.scheduler
+        chart = scheduler.gantt_chart
+        # The last segment seen is read again: it grows while its process keeps running
+        pids, _, _ = chart.columns(max(self._sent_segments - 1, 0))
+        self._sent_segments = len(chart)
+        if self._first:
+            # The first snapshot lists every process, which fixes the order of the energy bars
+            self._first = False
+            energies = {pid: p.energy_consumption for pid, p in self._processes.items()}
+        else:
+            energies = {}
+        for pid in set(pids.tolist()):
+            process = self._processes.get(pid)
+            if process is not None:
+                energies[pid] = process.energy_consumption
+        return Snapshot(scheduler.current_time, energies, scheduler.get_metrics(), scheduler.is_complete())
+
+    def _advance_frame(self, deadline: float):
+        scheduler = self.scheduler
+        if self.speed is not None:
+            scheduler.step(self.speed / self.fps)
+            return
+        # Unpaced: step until the frame time is used up, sizing steps to fill it
+        while not scheduler.is_complete():
+            started = time.monotonic()
+            scheduler.step(self._chunk)
+            now = time.monotonic()
+            elapsed = now - started
+            if elapsed < (deadline - started) / 8:
+                self._chunk *= 2
+            elif elapsed > 1 / self.fps and self._chunk > 1e-3:
+                self._chunk /= 2
+            if now >= deadline:
+                return
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._running.wait(timeout=0.1) or self._stop.is_set():
+                continue
+            deadline = time.monotonic() + 1 / self.fps
+            with self.lock:
+                self._advance_frame(deadline)
+                snapshot = self._snapshot()
+            self.snapshots.put(snapshot)
+            if snapshot.complete:
+                self.pause()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                self._stop.wait(remaining)
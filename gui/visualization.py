@@ -0,0 +1,238 @@
+"""
+Incremental Gantt chart and energy plot for the simulator window.
+
+The Gantt chart is read from the scheduler's GanttChart rather than copied:
+each sync takes only the segments in view, through between(), and when
+there are more of them than pixel columns it samples the chart at the
+centre of each column instead, so the view holds O(width) segments however
+long the run. All bars are drawn as a single PolyCollection coloured per
+process, frames are blitted over a cached background, and labels are
+skipped on bars too narrow to hold them. Axis limits grow geometrically,
+so the full (non-blitted) redraw needed when they change happens O(log T)
+times over a run.
+"""
+from typing import Dict
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+from models.gantt import GanttChart
+
+def _rectangles(starts: np.ndarray, ends: np.ndarray, bottom: float, top: float) -> np.ndarray:
+    """Return (n, 4, 2) rectangle vertices for the given x extents"""
+    verts = np.empty((len(starts), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = starts
+    verts[:, 2, 0] = verts[:, 3, 0] = ends
+    verts[:, 0, 1] = verts[:, 3, 1] = bottom
+    verts[:, 1, 1] = verts[:, 2, 1] = top
+    return verts
+
+def _runs(values: np.ndarray) -> np.ndarray:
+    """Return the start indices of runs of equal consecutive values"""
+    if len(values) == 0:
+        return np.empty(0, dtype=np.intp)
+    return np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+
+class _GrowingArray:
+    """Append-only NumPy array with amortized O(1) appends"""
+
+    def __init__(self, dtype):
+        self._data = np.empty(1024, dtype=dtype)
+        self.size = 0
+
+    def resize(self, size: int):
+        if size > len(self._data):
+            data = np.empty(max(size, 2 * len(self._data)), dtype=self._data.dtype)
+            data[:self.size] = self._data[:self.size]
+            self._data = data
+        self.size = size
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[:self.size]
+
+class SimulationView:
+    """Gantt chart and per-process energy bars drawn incrementally on a figure"""
+
+    def __init__(self, figure, canvas, min_label_width: float = 28.0, growth: float = 1.5):
+        self.figure = figure
+        self.canvas = canvas
+        self.min_label_width = min_label_width  # Pixels a bar needs to carry its label
+        self.growth = growth  # Factor axis limits grow by when the data outgrows them
+        self.gantt_ax = figure.add_subplot(211)
+        self.energy_ax = figure.add_subplot(212)
+        self._blit = getattr(canvas, "supports_blit", False)
+        self._backgrounds = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+        self.clear()
+
+    def clear(self):
+        """Forget every segment and redraw empty axes"""
+        # Gantt bars to draw, as of the last sync
+        self._starts = np.empty(0)
+        self._ends = np.empty(0)
+        self._pids = np.empty(0, dtype=np.int64)
+        self._end_time = 0.0  # End of the last Gantt segment
+        self._synced_segments = 0  # Length of the Gantt chart at the last sync
+        self._energy = _GrowingArray(np.float64)
+        self._pid_index: Dict[int, int] = {}  # pid -> position in the energy bars
+        self._labels = []  # Reusable Text artists
+        self._time_limit = 10.0
+        self._energy_limit = 1.0
+        self._process_limit = 10
+        self._limits_changed = False  # Limits grew during a sync, since the last render
+
+        for ax in (self.gantt_ax, self.energy_ax):
+            ax.clear()
+        self.gantt_ax.set_title("Gantt Chart")
+        self.gantt_ax.set_xlabel("Time")
+        self.gantt_ax.set_ylim(0, 1)
+        self.gantt_ax.set_yticks([])
+        self.energy_ax.set_title("Energy Consumption per Process")
+        self.energy_ax.set_xlabel("Process ID")
+        self.energy_ax.set_ylabel("Energy Consumption")
+        # Process pid is drawn in colour C{pid % 10}, as before
+        self._palette = to_rgba_array([f"C{i}" for i in range(10)])
+        self._gantt_bars = PolyCollection([], animated=self._blit)
+        self.gantt_ax.add_collection(self._gantt_bars)
+        self._energy_bars = PolyCollection([], facecolors="C0", animated=self._blit)
+        self.energy_ax.add_collection(self._energy_bars)
+        self._apply_limits()
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+    # Data ingestion
+
+    def sync_gantt(self, gantt_chart: GanttChart, current_time: float = 0.0):
+        """Read the Gantt segments in view from the scheduler's chart.
+
+        The caller holds whatever lock guards the chart; render() then draws
+        without touching it.
+        """
+        size = len(gantt_chart)
+        if size:
+            # The last segment already seen is read again: it grows while its process runs
+            _, _, ends = gantt_chart.columns(max(self._synced_segments - 1, 0))
+            self._end_time = float(ends[-1])
+        self._synced_segments = size
+        self._limits_changed |= self._grow_limits(current_time)
+
+        x0, x1 = self.gantt_ax.get_xlim()
+        columns = max(int(self.gantt_ax.bbox.width), 1)
+        first, last = gantt_chart.index_range(x0, x1)
+        if last - first <= columns:
+            segments = gantt_chart.between(x0, x1)
+            pids, starts, ends = zip(*segments) if segments else ((), (), ())
+            self._pids = np.array(pids, dtype=np.int64)
+            self._starts = np.array(starts, dtype=np.float64)
+            self._ends = np.array(ends, dtype=np.float64)
+            return
+
+        # Level of detail: show the process running at the centre of each pixel column
+        edges = np.linspace(x0, x1, columns + 1)
+        centres = (edges[:-1] + edges[1:]) / 2
+        column_pids = np.array(gantt_chart.pids_at(centres.tolist()), dtype=np.int64)
+        first = _runs(column_pids)
+        last = np.append(first[1:], columns)
+        keep = column_pids[first] != -1
+        self._starts, self._ends, self._pids = edges[first[keep]], edges[last[keep]], column_pids[first[keep]]
+
+    def set_energy(self, energies: Dict[int, float]):
+        """Set the energy of processes by pid, adding bars for new pids"""
+        for pid, value in energies.items():
+            index = self._pid_index.get(pid)
+            if index is None:
+                index = self._pid_index[pid] = self._energy.size
+                self._energy.resize(index + 1)
+            self._energy.values[index] = value
+
+    # Drawing
+
+    def _apply_limits(self):
+        self.gantt_ax.set_xlim(0, self._time_limit)
+        self.energy_ax.set_xlim(-0.5, self._process_limit - 0.5)
+        self.energy_ax.set_ylim(0, self._energy_limit)
+
+    def _grow_limits(self, current_time: float) -> bool:
+        """Grow axis limits geometrically to fit the data; returns True if any changed"""
+        grew = False
+        end = max(current_time, self._end_time)
+        if end > self._time_limit:
+            self._time_limit = max(end, self._time_limit) * self.growth
+            grew = True
+        if self._energy.size > self._process_limit:
+            self._process_limit = int(self._energy.size * self.growth) + 1
+            grew = True
+        peak = float(self._energy.values.max()) if self._energy.size else 0.0
+        if peak > self._energy_limit:
+            self._energy_limit = peak * self.growth
+            grew = True
+        if grew:
+            self._apply_limits()
+        return grew
+
+    def _on_draw(self, event=None):
+        """Cache the static background after every full draw and paint the data on it"""
+        if not self._blit:
+            return
+        self._backgrounds = [self.canvas.copy_from_bbox(ax.bbox) for ax in (self.gantt_ax, self.energy_ax)]
+        self._draw_artists()
+
+    def render(self, current_time: float = 0.0):
+        """Redraw the data, blitting unless the axis limits had to change"""
+        grew = self._grow_limits(current_time) or self._limits_changed
+        self._limits_changed = False
+        self._update_gantt_artists()
+        self._update_energy_artists()
+        if not self._blit:
+            self.canvas.draw_idle()
+            return
+        if grew or self._backgrounds is None:
+            # The tick labels changed: draw everything, which re-caches the backgrounds
+            self.canvas.draw()
+            return
+        for background in self._backgrounds:
+            self.canvas.restore_region(background)
+        self._draw_artists()
+        self.canvas.blit(self.gantt_ax.bbox)
+        self.canvas.blit(self.energy_ax.bbox)
+        self.canvas.flush_events()
+
+    def _draw_artists(self):
+        self.gantt_ax.draw_artist(self._gantt_bars)
+        for label in self._labels:
+            if label.get_visible():
+                self.gantt_ax.draw_artist(label)
+        self.energy_ax.draw_artist(self._energy_bars)
+
+    def _update_gantt_artists(self):
+        starts, ends, pids = self._starts, self._ends, self._pids
+        self._gantt_bars.set_verts(_rectangles(starts, ends, 0, 1))
+        self._gantt_bars.set_facecolor(self._palette[pids % len(self._palette)])
+        self._update_labels(starts, ends, pids)
+
+    def _update_labels(self, starts: np.ndarray, ends: np.ndarray, pids: np.ndarray):
+        x0, x1 = self.gantt_ax.get_xlim()
+        pixels_per_unit = self.gantt_ax.bbox.width / (x1 - x0) if x1 > x0 else 0.0
+        wide = np.flatnonzero((ends - starts) * pixels_per_unit >= self.min_label_width)
+        while len(self._labels) < len(wide):
+            self._labels.append(self.gantt_ax.text(0, 0.5, "", ha="center", va="center",
+                                                   animated=self._blit))
+        for label, i in zip(self._labels, wide):
+            label.set_position(((starts[i] + ends[i]) / 2, 0.5))
+            label.set_text(f"P{pids[i]}")
+            label.set_visible(True)
+        for label in self._labels[len(wide):]:
+            label.set_visible(False)
+
+    def _update_energy_artists(self):
+        energy = self._energy.values
+        columns = max(int(self.energy_ax.bbox.width), 1)
+        if len(energy) <= columns:
+            left = np.arange(len(energy)) - 0.4
+            self._energy_bars.set_verts(_rectangles(left, left + 0.8, 0, energy))
+            return
+        # Level of detail: one bar per pixel column, as tall as the largest process in it
+        edges = np.linspace(0, len(energy), columns + 1).astype(np.intp)
+        edges = np.unique(edges)
+        heights = np.maximum.reduceat(energy, edges[:-1])
+        self._energy_bars.set_verts(_rectangles(edges[:-1] - 0.5, edges[1:] - 0.5, 0, heights))
@@ -1,10 +1,16 @@
-import tkinter as tk
-from gui.main_window import MainWindow
+import sys
 
 def main():
+    # Any arguments select the headless runner, so servers never import tkinter
+    if len(sys.argv) > 1:
+        from utils.cli import main as cli_main
+        return cli_main(sys.argv[1:])
+
+    import tkinter as tk
+    from gui.main_window import MainWindow
     root = tk.Tk()
     app = MainWindow(root)
     root.mainloop()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
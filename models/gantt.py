@@ -0,0 +1,339 @@
+"""
+Gantt chart storage.
+
+A GanttChart holds (pid, start_time, end_time) segments in three typed
+arrays, 24 bytes per segment instead of a tuple and three boxed numbers.
+A segment that continues the previous one (same process, no gap) extends
+it instead of adding a new one, so a process that keeps the CPU across
+several dispatches takes one segment.
+
+With memory_limit set, every time more than that many segments are held
+in memory all but the last are written to an immutable spill file, so
+memory stays bounded on arbitrarily long runs. Copies share spill files,
+which makes forking a scheduler cheap. A pickled chart carries the data of
+its spill files and spills it again when unpickled; SpillArchive instead
+keeps the spill files next to a checkpoint, so that saving a long run again
+only writes the segments spilled since the last save.
+
+Segments are appended in time order and never overlap, so starts and ends
+are both sorted: between() finds the segments in a time window with two
+binary searches, in O(log n + k). The chart still behaves like the list of
+tuples it replaces: len(), indexing, slicing and iteration yield tuples.
+"""
+import os
+import shutil
+import tempfile
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+PID, START, END = 0, 1, 2  # Column order, also the order of a spill file
+_ITEM_SIZE = 8
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _link(source: str, target: str):
+    """Make target a hard link to source, or a copy where links are not supported"""
+    partial = target + ".part"
+    _remove_file(partial)
+    try:
+        os.link(source, partial)
+    except OSError:
+        shutil.copyfile(source, partial)
+    os.replace(partial, target)
+
+class _Chunk:
+    """Immutable block of segments, held in memory or in a spill file"""
+
+    def __init__(self, pids: array, starts: array, ends: array, spill_dir: Optional[str] = None):
+        self.size = len(pids)
+        self.last_start = starts[-1]
+        self.last_end = ends[-1]
+        if spill_dir is None:
+            self.path = None
+            self._columns = (pids, starts, ends)
+            self._owned = False
+            return
+        fd, self.path = tempfile.mkstemp(suffix=".gantt", dir=spill_dir)
+        with os.fdopen(fd, "wb") as f:
+            for column in (pids, starts, ends):
+                column.tofile(f)
+        self._columns = None
+        self._owned = True
+        weakref.finalize(self, _remove_file, self.path)
+
+    @classmethod
+    def borrow(cls, path: str, size: int, last_start: float, last_end: float) -> "_Chunk":
+        """Chunk reading a spill file it does not own, until spilled() links it"""
+        chunk = cls.__new__(cls)
+        chunk.size, chunk.last_start, chunk.last_end = size, last_start, last_end
+        chunk.path = path
+        chunk._columns = None
+        chunk._owned = False
+        return chunk
+
+    def spilled(self, spill_dir: str) -> "_Chunk":
+        """Return this chunk backed by a spill file of its own in spill_dir"""
+        if self._columns is not None:
+            return _Chunk(*self._columns, spill_dir)
+        if self._owned:
+            return self
+        fd, path = tempfile.mkstemp(suffix=".gantt", dir=spill_dir)
+        os.close(fd)
+        _link(self.path, path)
+        chunk = _Chunk.borrow(path, self.size, self.last_start, self.last_end)
+        chunk._owned = True
+        weakref.finalize(chunk, _remove_file, path)
+        return chunk
+
+    def read(self, lo: int, hi: int) -> Tuple[array, array, array]:
+        """Return copies of the columns for rows lo to hi"""
+        if self._columns is not None:
+            pids, starts, ends = self._columns
+            return pids[lo:hi], starts[lo:hi], ends[lo:hi]
+        columns = (array("q"), array("d"), array("d"))
+        with open(self.path, "rb") as f:
+            for index, column in enumerate(columns):
+                f.seek((index * self.size + lo) * _ITEM_SIZE)
+                column.fromfile(f, hi - lo)
+        return columns
+
+    def bisect(self, column: int, value: float, right: bool) -> int:
+        """Binary search a sorted time column, reading O(log n) values"""
+        if self._columns is not None:
+            search = bisect_right if right else bisect_left
+            return search(self._columns[column], value)
+        lo, hi = 0, self.size
+        with open(self.path, "rb") as f:
+            base = column * self.size * _ITEM_SIZE
+            while lo < hi:
+                middle = (lo + hi) // 2
+                f.seek(base + middle * _ITEM_SIZE)
+                item = array("d")
+                item.fromfile(f, 1)
+                if item[0] < value or (right and item[0] == value):
+                    lo = middle + 1
+                else:
+                    hi = middle
+        return lo
+
+    def __reduce__(self):
+        # Pickled with its data, so a snapshot does not depend on the spill file
+        return _Chunk, self.read(0, self.size)
+
+class SpillArchive:
+    """Directory holding the spill files of the Gantt charts in a checkpoint.
+
+    A pickler's persistent_id() and an unpickler's persistent_load() hand
+    spilled chunks to the archive. Each chunk is then pickled as a reference
+    to a file hard-linked (or copied) into the directory, once per chunk, so
+    the checkpoint itself only holds the in-memory segments.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.names: Set[str] = set()  # Files referenced by the last checkpoint written
+
+    def persistent_id(self, obj):
+        if type(obj) is not _Chunk or obj.path is None:
+            return None
+        name = os.path.basename(obj.path)
+        target = os.path.join(self.directory, name)
+        if not os.path.exists(target):
+            os.makedirs(self.directory, exist_ok=True)
+            _link(obj.path, target)
+        self.names.add(name)
+        return "gantt", name, obj.size, obj.last_start, obj.last_end
+
+    def persistent_load(self, pid) -> _Chunk:
+        kind, name, size, last_start, last_end = pid
+        if kind != "gantt":
+            raise ValueError(f"Unknown persistent reference {kind!r}")
+        return _Chunk.borrow(os.path.join(self.directory, name), size, last_start, last_end)
+
+    def prune(self):
+        """Remove the files no longer referenced, once the checkpoint is in place"""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name not in self.names:
+                _remove_file(os.path.join(self.directory, name))
+        if not self.names:
+            os.rmdir(self.directory)
+
+class GanttChart:
+    """Append-only, run-length merged store of (pid, start_time, end_time) segments"""
+
+    def __init__(self, memory_limit: Optional[int] = None, spill_dir: Optional[str] = None):
+        if memory_limit is not None and memory_limit < 2:
+            raise ValueError("memory_limit must be at least 2 segments")
+        self.memory_limit = memory_limit  # Segments kept in memory before older ones spill
+        self.spill_dir = spill_dir  # Directory for spill files (default: the temp directory)
+        self.clear()
+
+    def clear(self):
+        """Remove every segment"""
+        self._chunks: List[_Chunk] = []
+        self._offsets: List[int] = []  # Index of the first segment of each chunk
+        self._last_starts: List[float] = []
+        self._last_ends: List[float] = []
+        self._spilled = 0  # Segments in chunks
+        self._pids = array("q")
+        self._starts = array("d")
+        self._ends = array("d")
+
+    def add(self, pid: int, start_time: float, end_time: float):
+        """Append a segment, extending the last one if it continues it"""
+        ends = self._ends
+        if ends and ends[-1] == start_time and self._pids[-1] == pid:
+            ends[-1] = end_time
+            return
+        self._pids.append(pid)
+        self._starts.append(start_time)
+        ends.append(end_time)
+        if self.memory_limit is not None and len(ends) > self.memory_limit:
+            self._spill()
+
+    def append(self, segment: tuple):
+        """Append a (pid, start_time, end_time) tuple, like list.append"""
+        self.add(*segment)
+
+    def _spill(self):
+        """Move every in-memory segment but the last, which may still grow, to a chunk"""
+        count = len(self._ends) - 1
+        chunk = _Chunk(self._pids[:count], self._starts[:count], self._ends[:count],
+                       self.spill_dir or tempfile.gettempdir())
+        self._chunks.append(chunk)
+        self._offsets.append(self._spilled)
+        self._last_starts.append(chunk.last_start)
+        self._last_ends.append(chunk.last_end)
+        self._spilled += count
+        for column in (self._pids, self._starts, self._ends):
+            del column[:count]
+
+    # Sequence interface
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._ends)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.segments(start, stop)
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Gantt chart index out of range")
+        return self.segments(index, index + 1)[0]
+
+    def __iter__(self) -> Iterator[tuple]:
+        for chunk in self._chunks:
+            yield from zip(*chunk.read(0, chunk.size))
+        yield from zip(self._pids, self._starts, self._ends)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (GanttChart, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"GanttChart({len(self)} segments, {self._spilled} spilled)"
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self.memory_limit is not None:
+            # Unpickled chunks hold their data in memory or borrow archived
+            # files; give each a spill file of its own so memory stays bounded
+            spill_dir = self.spill_dir or tempfile.gettempdir()
+            self._chunks = [chunk.spilled(spill_dir) for chunk in self._chunks]
+
+    def __copy__(self) -> "GanttChart":
+        # Chunks never change, so the copy shares them; only the in-memory tail is copied
+        chart = GanttChart.__new__(GanttChart)
+        chart.__dict__.update(self.__dict__)
+        for name in ("_chunks", "_offsets", "_last_starts", "_last_ends"):
+            setattr(chart, name, list(getattr(self, name)))
+        for name in ("_pids", "_starts", "_ends"):
+            setattr(chart, name, getattr(self, name)[:])
+        return chart
+
+    @property
+    def spilled(self) -> int:
+        """Number of segments held in spill files"""
+        return self._spilled
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the in-memory segments"""
+        return sum(column.itemsize * len(column) for column in (self._pids, self._starts, self._ends))
+
+    # Range access
+
+    def _pieces(self, start: int, stop: int) -> Iterator[Tuple[array, array, array]]:
+        """Yield the columns of segments start to stop, one chunk at a time"""
+        if start < self._spilled:
+            index = bisect_right(self._offsets, start) - 1
+            while index < len(self._chunks) and self._offsets[index] < stop:
+                base = self._offsets[index]
+                chunk = self._chunks[index]
+                yield chunk.read(max(start - base, 0), min(stop - base, chunk.size))
+                index += 1
+        lo = max(start - self._spilled, 0)
+        hi = stop - self._spilled
+        if hi > lo:
+            yield self._pids[lo:hi], self._starts[lo:hi], self._ends[lo:hi]
+
+    def segments(self, start: int = 0, stop: Optional[int] = None) -> List[tuple]:
+        """Return segments start to stop as (pid, start_time, end_time) tuples"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        result = []
+        for pids, starts, ends in self._pieces(start, stop):
+            result.extend(zip(pids, starts, ends))
+        return result
+
+    def columns(self, start: int = 0, stop: Optional[int] = None):
+        """Return segments start to stop as NumPy arrays (pids, starts, ends)"""
+        import numpy as np
+        stop = len(self) if stop is None else min(stop, len(self))
+        pieces = list(self._pieces(start, stop)) or [(array("q"), array("d"), array("d"))]
+        return tuple(np.concatenate([np.frombuffer(piece[column], dtype=dtype) for piece in pieces])
+                     for column, dtype in ((PID, np.int64), (START, np.float64), (END, np.float64)))
+
+    def _search(self, column: int, value: float, right: bool) -> int:
+        """Index of the first segment whose time in column is > value (right) or >= value"""
+        bounds = self._last_ends if column == END else self._last_starts
+        index = (bisect_right if right else bisect_left)(bounds, value)
+        if index < len(self._chunks):
+            return self._offsets[index] + self._chunks[index].bisect(column, value, right)
+        tail = self._ends if column == END else self._starts
+        return self._spilled + (bisect_right if right else bisect_left)(tail, value)
+
+    def index_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """Return the index range of the segments that overlap [start_time, end_time)"""
+        first = self._search(END, start_time, right=True)
+        last = self._search(START, end_time, right=False)
+        return first, max(first, last)
+
+    def between(self, start_time: float, end_time: float) -> List[tuple]:
+        """Return the segments that overlap [start_time, end_time), in O(log n + k)"""
+        return self.segments(*self.index_range(start_time, end_time))
+
+    def pids_at(self, times: Iterable[float]) -> List[int]:
+        """Return the pid running at each time, or -1 where none is, in O(log n) per time"""
+        result = []
+        for time in times:
+            index = self._search(START, time, right=True) - 1
+            if index < 0:
+                result.append(-1)
+                continue
+            pid, _, end = self[index]
+            result.append(pid if end > time else -1)
+        return result
@@ -0,0 +1,530 @@
+"""
+Multi-core scheduling: symmetric (SMP) and heterogeneous (big.LITTLE) CPUs.
+
+Every core has its own ready queue, built by the policy, and its own clock
+of dispatches, so scheduling a core never scans the other cores' queues.
+Which core an arrival goes to, and which core an idle one steals from, is
+read from two lazily updated heaps of core loads in O(log cores).
+
+A core runs processes at one of its (voltage, frequency) operating points.
+Its capacity scales the work done per cycle, so a LITTLE core with capacity
+0.5 needs twice as long as a big one at the same frequency. Power follows
+the core's own curve: power_scale * V^2 * f + static_power while busy and
+idle_power while idle.
+"""
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Sequence, Tuple
+from .gantt import GanttChart
+from .process import Process
+from .scheduler import COMPLETION, IDLE_POWER, PREEMPTION, Scheduler
+
+BALANCE = 3  # Periodic load balancing event
+
+class Core:
+    """One CPU core with its own run queue, DVFS state and power curve"""
+
+    def __init__(self, index: int = 0, operating_points: Sequence[Tuple[float, float]] = ((1.0, 1.0),),
+                 capacity: float = 1.0, power_scale: float = 1.0, static_power: float = 0.0,
+                 idle_power: float = IDLE_POWER, kind: str = "cpu"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not operating_points:
+            raise ValueError("a core needs at least one operating point")
+        self.index = index
+        self.kind = kind
+        self.operating_points = sorted(operating_points, key=lambda point: point[1])
+        self.capacity = capacity  # Work per cycle relative to a nominal core
+        self.power_scale = power_scale
+        self.static_power = static_power  # Leakage while busy
+        self.idle_power = idle_power
+        self.voltage, self.frequency = self.operating_points[-1]
+        self.ready_queue = None
+        self.reset()
+
+    def reset(self):
+        self.current_process: Optional[Process] = None
+        self.gantt_chart = GanttChart()  # Segments of (process_id, start_time, end_time)
+        self.busy_time = 0.0
+        self.energy = 0.0
+        self.idle_energy = 0.0
+        self.completed = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.migrations = 0  # Processes that arrived here after running elsewhere
+        self._last_process: Optional[Process] = None
+        self._exec_start = 0.0
+        self._completion_at = float('inf')
+        self._dispatch_token = 0
+        self._idle_since: Optional[float] = 0.0
+        if self.ready_queue is not None:
+            self.ready_queue.clear()
+
+    @property
+    def busy_power(self) -> float:
+        """Power drawn while executing at the current operating point"""
+        return self.power_scale * self.voltage ** 2 * self.frequency + self.static_power
+
+    @property
+    def max_frequency(self) -> float:
+        return self.operating_points[-1][1]
+
+    def select_operating_point(self, speed: float):
+        """Switch to the slowest operating point running at least at the given frequency"""
+        for voltage, frequency in self.operating_points:
+            if frequency >= speed:
+                break
+        self.voltage, self.frequency = voltage, frequency
+
+    def load(self) -> float:
+        """Processes queued or running, relative to the core's capacity"""
+        return (len(self.ready_queue) + (self.current_process is not None)) / self.capacity
+
+    def update_gantt_chart(self, process: Process, start_time: float, end_time: float):
+        self.gantt_chart.add(process.pid, start_time, end_time)
+
+def smp(cores: int, **kwargs) -> List[Core]:
+    """Return identical cores; keyword arguments are passed to each Core"""
+    return [Core(index, **kwargs) for index in range(cores)]
+
+# Illustrative big.LITTLE curves: LITTLE cores do half the work per cycle at
+# a fraction of the power, and both clusters scale voltage with frequency.
+BIG_OPERATING_POINTS = [(0.8, 0.6), (0.9, 0.8), (1.0, 1.0), (1.1, 1.2)]
+LITTLE_OPERATING_POINTS = [(0.6, 0.4), (0.7, 0.6), (0.8, 0.8), (0.9, 1.0)]
+
+def big_little(big: int, little: int) -> List[Core]:
+    """Return a heterogeneous CPU with the big cores first"""
+    cores = [Core(index, BIG_OPERATING_POINTS, capacity=1.0, power_scale=1.0,
+                  static_power=0.1, idle_power=0.05, kind="big") for index in range(big)]
+    cores += [Core(big + index, LITTLE_OPERATING_POINTS, capacity=0.5, power_scale=0.3,
+                   static_power=0.02, idle_power=0.01, kind="little") for index in range(little)]
+    return cores
+
+class MultiCoreScheduler(Scheduler):
+    """Event-driven scheduler for several cores with per-core run queues.
+
+    policy is a single-core scheduler class or instance (e.g. SJF or
+    EAEDF); it supplies the ordering of the per-core ready queues, whether
+    arrivals preempt and its time_quantum. Only queue_ordered policies are
+    accepted, since any other behaviour would be lost. Arrivals go to the least loaded core, an idle
+    core steals from the longest queue (steal=True), and every
+    balance_interval the queues are evened out. A process dispatched on a
+    different core than it last ran on pays migration_cost. With dvfs=True
+    each core picks its operating point per dispatch from its backlog and
+    the process's deadline, like the single-core DVFS policy.
+    """
+
+    def __init__(self, cores=4, policy=None, time_quantum: Optional[float] = None,
+                 steal: bool = True, balance_interval: Optional[float] = None,
+                 migration_cost: float = 0.0, dvfs: bool = True, high_load: int = 4, **kwargs):
+        if isinstance(policy, type):
+            policy = policy()
+        self._check_policy(policy)
+        self.policy = policy
+        self.cores: List[Core] = smp(cores) if isinstance(cores, int) else list(cores)
+        if not self.cores:
+            raise ValueError("at least one core is required")
+        if time_quantum is None:
+            time_quantum = getattr(policy, "time_quantum", None)
+        if time_quantum is not None and time_quantum <= 0:
+            raise ValueError("time_quantum must be positive")
+        if balance_interval is not None and balance_interval <= 0:
+            raise ValueError("balance_interval must be positive")
+        self.time_quantum = time_quantum
+        self.preemptive = getattr(policy, "preemptive", False)
+        self.steal = steal
+        self.balance_interval = balance_interval
+        self.migration_cost = migration_cost
+        self.dvfs = dvfs
+        self.high_load = high_load
+        super().__init__(**kwargs)
+        self._reset_cores()
+
+    @staticmethod
+    def _check_policy(policy):
+        if policy is not None and not policy.queue_ordered:
+            raise ValueError(f"{type(policy).__name__} cannot run per core: it schedules by more "
+                             "than queue ordering, preemption, a fixed quantum and DVFS")
+
+    def create_ready_queue(self):
+        if self.policy is not None:
+            return self.policy.create_ready_queue()
+        return super().create_ready_queue()
+
+    def _reset_cores(self):
+        for index, core in enumerate(self.cores):
+            core.index = index
+            core.ready_queue = self.create_ready_queue()
+            core.reset()
+            core.gantt_chart = GanttChart(self.gantt_limit)
+        self.migrations = 0
+        self.steals = 0
+        self._active = 0  # Admitted processes that have not completed
+        self._last_core: Dict[int, int] = {}  # id(process) -> core it last ran on
+        self._dispatchable: List[Core] = []  # Idle cores that may have work
+        self._arrived_on: List[Core] = []  # Busy cores that received arrivals this instant
+        self._balance_armed = False
+        # Lazy load indexes; entries are checked against the core when read
+        self._least: List[tuple] = [(core.load(), core.index) for core in self.cores]
+        self._most: List[tuple] = []
+        self._compact_at = 4 * len(self.cores) + 64
+
+    def reset(self):
+        super().reset()
+        self._reset_cores()
+
+    # Load indexes
+
+    def _touch(self, core: Core):
+        """Record a change in the core's load"""
+        heapq.heappush(self._least, (core.load(), core.index))
+        queued = len(core.ready_queue)
+        if queued:
+            heapq.heappush(self._most, (-queued, core.index))
+        if len(self._least) > self._compact_at or len(self._most) > self._compact_at:
+            self._least = [(c.load(), c.index) for c in self.cores]
+            self._most = [(-len(c.ready_queue), c.index) for c in self.cores if c.ready_queue]
+            heapq.heapify(self._least)
+            heapq.heapify(self._most)
+
+    def _least_loaded(self) -> Core:
+        least = self._least
+        while True:
+            load, index = least[0]
+            core = self.cores[index]
+            if load == core.load():
+                return core
+            heapq.heappop(least)
+            if not least:
+                self._touch(core)
+
+    def _most_queued(self) -> Optional[Core]:
+        most = self._most
+        while most:
+            queued, index = most[0]
+            core = self.cores[index]
+            if -queued == len(core.ready_queue):
+                return core
+            heapq.heappop(most)
+        return None
+
+    # Policy hooks
+
+    def on_arrival(self, process: Process):
+        core = self._least_loaded()
+        core.ready_queue.push(process)
+        self._active += 1
+        self._touch(core)
+        if core.current_process is None:
+            self._dispatchable.append(core)
+        elif self.preemptive:
+            self._arrived_on.append(core)
+        if self.balance_interval is not None and not self._balance_armed:
+            self._balance_armed = True
+            self._push_event(self.current_time + self.balance_interval, BALANCE, -1, None)
+
+    def requeue(self, process: Process):
+        core = self.cores[self._last_core[id(process)]]
+        core.ready_queue.push(process)
+
+    def next_process(self, core: Optional[Core] = None) -> Optional[Process]:
+        """Take the next process from the core's queue, or steal one"""
+        core = core or self.cores[0]
+        process = core.ready_queue.pop()
+        if process is None and self.steal:
+            victim = self._most_queued()
+            if victim is not None and victim is not core:
+                process = victim.ready_queue.pop()
+                self.steals += 1
+                self._touch(victim)
+        return process
+
+    def should_preempt(self, core: Optional[Core] = None) -> bool:
+        """Preempt when the head of a priority-ordered queue outranks the running process"""
+        core = core or self.cores[0]
+        key = getattr(core.ready_queue, "key", None)
+        if key is None or core.current_process is None:
+            return False
+        head = core.ready_queue.peek_key()
+        return head is not None and head < key(core.current_process)
+
+    def time_slice(self, process: Process) -> Optional[float]:
+        return self.time_quantum
+
+    def required_speed(self, core: Core, process: Process) -> float:
+        """Return the frequency the core should at least run the process at"""
+        speed = core.max_frequency * min(1.0, len(core.ready_queue) / self.high_load)
+        if process.deadline is not None:
+            slack = process.deadline - self.current_time
+            needed = process.remaining_time / (core.capacity * slack) if slack > 0 else core.max_frequency
+            speed = max(speed, needed)
+        return speed
+
+    # Event loop
+
+    def run_until(self, until: float) -> bool:
+        executed = False
+        while True:
+            self._dispatch_idle()
+            time = self._next_event_time()
+            if time is None or time > until:
+                break
+            if time > self.current_time:
+                self.current_time = time
+            executed |= self._handle_core_events(time)
+
+        if until != float('inf') and until > self.current_time and not self.is_complete():
+            self.current_time = until
+        for core in self.cores:
+            if core.current_process is not None:
+                executed |= self._sync_core(core)
+            elif core._idle_since is not None:
+                self._charge_idle(core)
+                core._idle_since = self.current_time
+        return executed
+
+    def _push_event(self, time: float, kind: int, core_index: int, token):
+        heapq.heappush(self._events, (time, next(self._event_seq), kind, core_index, token))
+
+    def _next_event_time(self) -> Optional[float]:
+        events = self._events
+        cores = self.cores
+        while events and events[0][2] != BALANCE and events[0][4] != cores[events[0][3]]._dispatch_token:
+            heapq.heappop(events)
+        time = events[0][0] if events else None
+        if self._pending and (time is None or self._pending[0][0] < time):
+            time = self._pending[0][0]
+        return time
+
+    def _handle_core_events(self, time: float) -> bool:
+        """Handle everything due at the given time in the order of Scheduler:
+        completions, then arrivals, then expired quanta and balancing"""
+        executed = False
+        events = self._events
+        due = []
+        while events and events[0][0] <= time:
+            event = heapq.heappop(events)
+            if event[2] == COMPLETION:
+                core = self.cores[event[3]]
+                if event[4] == core._dispatch_token:
+                    executed |= self._sync_core(core)
+            else:
+                due.append(event)
+
+        self.admit_arrivals()
+        for _, _, kind, index, token in due:
+            if kind == BALANCE:
+                self._balance_armed = False
+                self.rebalance()
+                if self._active and self.balance_interval is not None:
+                    self._balance_armed = True
+                    self._push_event(time + self.balance_interval, BALANCE, -1, None)
+            elif token == self.cores[index]._dispatch_token:
+                executed |= self._preempt_core(self.cores[index])
+
+        arrived_on, self._arrived_on = self._arrived_on, []
+        for core in arrived_on:
+            if core.current_process is None:
+                continue
+            executed |= self._sync_core(core)
+            if core.current_process is not None and self.should_preempt(core):
+                self._preempt_core(core)
+        return executed
+
+    def _dispatch_idle(self):
+        """Dispatch every idle core that was handed work or freed"""
+        while self._dispatchable:
+            core = self._dispatchable.pop()
+            if core.current_process is None:
+                self._dispatch_core(core)
+
+    def _dispatch_core(self, core: Core):
+        process = self.next_process(core)
+        if process is None:
+            return
+        now = self.current_time
+        overhead = 0.0
+        if core._last_process is not None and core._last_process is not process:
+            overhead += self.context_switch_time
+            self.context_switches += 1
+            core.context_switches += 1
+        last_core = self._last_core.get(id(process))
+        if last_core is not None and last_core != core.index:
+            overhead += self.migration_cost
+            self.migrations += 1
+            core.migrations += 1
+        self._last_core[id(process)] = core.index
+        core._last_process = process
+        core.current_process = process
+        if core._idle_since is not None:
+            self._charge_idle(core)
+            core._idle_since = None
+
+        if self.dvfs:
+            core.select_operating_point(self.required_speed(core, process))
+        else:
+            core.voltage, core.frequency = core.operating_points[-1]
+        # The process progresses at the core's effective speed
+        process.set_dvfs_parameters(core.voltage, core.capacity * core.frequency)
+
+        core._exec_start = now + overhead
+        if process.start_time is None:
+            process.start_time = core._exec_start
+        core._dispatch_token += 1
+        core._completion_at = core._exec_start + process.time_to_completion()
+        self._push_event(core._completion_at, COMPLETION, core.index, core._dispatch_token)
+        quantum = self.time_slice(process)
+        if quantum is not None and core._exec_start + quantum < core._completion_at:
+            self._push_event(core._exec_start + quantum, PREEMPTION, core.index, core._dispatch_token)
+        self._touch(core)
+
+    def _charge_idle(self, core: Core):
+        energy = core.idle_power * (self.current_time - core._idle_since)
+        core.idle_energy += energy
+        core.energy += energy
+        self.total_energy_consumption += energy
+
+    def _sync_core(self, core: Core) -> bool:
+        """Execute the core's process for the time elapsed since it was last accounted"""
+        process = core.current_process
+        start = core._exec_start
+        end = self.current_time
+        # A process with no work left is due at its start and completes there
+        if process is None or (end <= start and end < core._completion_at):
+            return False
+
+        interval = process.time_to_completion() if end >= core._completion_at else end - start
+        core._exec_start = end
+        if end > start:
+            core.busy_time += end - start
+            core.update_gantt_chart(process, start, end)
+        energy_before = process.energy_consumption
+        completed = process.execute(interval)
+        # Charge the core's power curve rather than the process's nominal V^2 * f
+        energy = core.busy_power * interval
+        process.energy_consumption = energy_before + energy
+        core.energy += energy
+        self.total_energy_consumption += energy
+
+        if completed:
+            self._record_completion(process)
+            self._last_core.pop(id(process), None)
+            self._active -= 1
+            core.completed += 1
+            self._release(core)
+        return True
+
+    def _preempt_core(self, core: Core) -> bool:
+        executed = self._sync_core(core)
+        process = core.current_process
+        if process is None:
+            return executed
+        self.preemptions += 1
+        core.preemptions += 1
+        self.requeue(process)
+        self._release(core)
+        return executed
+
+    def _release(self, core: Core):
+        """Mark the core idle so it dispatches again"""
+        core.current_process = None
+        core._dispatch_token += 1
+        core._idle_since = self.current_time
+        self._touch(core)
+        self._dispatchable.append(core)
+
+    def rebalance(self) -> int:
+        """Move queued processes from the busiest queues to the least loaded cores.
+
+        Returns the number of processes moved.
+        """
+        moved = 0
+        while True:
+            source = self._most_queued()
+            target = self._least_loaded()
+            if source is None or source is target:
+                break
+            if target.load() + 1 / target.capacity >= source.load():
+                break
+            process = source.ready_queue.pop()
+            target.ready_queue.push(process)
+            self._touch(source)
+            self._touch(target)
+            if target.current_process is None:
+                self._dispatchable.append(target)
+            moved += 1
+        return moved
+
+    # Snapshots
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        # Processes are keyed by id(), which does not survive pickling
+        live = [core.current_process for core in self.cores if core.current_process is not None]
+        for core in self.cores:
+            live.extend(core.ready_queue.ordered())
+        state["_last_core"] = [(p, self._last_core[id(p)]) for p in live if id(p) in self._last_core]
+        return state
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        self._last_core = {id(process): index for process, index in state["_last_core"]}
+        for core in self.cores:
+            core.ready_queue = self._rebuild_queue(core.ready_queue)
+
+    def _fork_shared_lists(self) -> list:
+        return super()._fork_shared_lists() + [core.gantt_chart for core in self.cores]
+
+    def fork(self, policy=None, **kwargs) -> "MultiCoreScheduler":
+        """Return an independent copy; a policy class or instance replaces the
+        queue ordering from now on, while running processes keep their cores"""
+        copy = super().fork()
+        if policy is None:
+            return copy
+        if isinstance(policy, type):
+            policy = policy(**kwargs)
+        self._check_policy(policy)
+        copy.policy = policy
+        copy.preemptive = getattr(policy, "preemptive", False)
+        for core in copy.cores:
+            core.ready_queue = copy._rebuild_queue(core.ready_queue)
+        copy.ready_queue = copy.create_ready_queue()
+        return copy
+
+    # Reporting
+
+    def is_complete(self) -> bool:
+        return not self._pending and self._active == 0
+
+    def core_metrics(self) -> List[dict]:
+        """Return utilization, energy and counters for every core"""
+        elapsed = self.current_time
+        return [{
+            "core": core.index,
+            "kind": core.kind,
+            "utilization": core.busy_time / elapsed * 100 if elapsed > 0 else 0,
+            "busy_time": core.busy_time,
+            "energy": core.energy,
+            "idle_energy": core.idle_energy,
+            "completed": core.completed,
+            "context_switches": core.context_switches,
+            "preemptions": core.preemptions,
+            "migrations": core.migrations,
+            "voltage": core.voltage,
+            "frequency": core.frequency,
+        } for core in self.cores]
+
+    def get_metrics(self) -> dict:
+        """Return the Scheduler metrics, with cpu_utilization relative to the
+        capacity of every core, plus the multi-core counters"""
+        metrics = super().get_metrics()
+        elapsed = self.current_time
+        busy = sum(core.busy_time for core in self.cores)
+        metrics["cpu_utilization"] /= sum(core.capacity for core in self.cores)
+        metrics.update({
+            "cores": len(self.cores),
+            "migrations": self.migrations,
+            "steals": self.steals,
+            "avg_core_utilization": busy / (elapsed * len(self.cores)) * 100 if elapsed > 0 else 0,
+        })
+        return metrics
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Process:
     pid: int
     arrival_time: float
@@ -30,19 +30,25 @@ class Process:
         power = (self.voltage ** 2) * self.frequency
         self.energy_consumption += power * time_interval
 
+    def time_to_completion(self) -> float:
+        """Time needed to finish the remaining work at the current frequency"""
+        return self.remaining_time / self.frequency
+
     def execute(self, time_interval: float) -> bool:
         """Execute the process for the given time interval"""
-        if self.remaining_time is None or self.remaining_time <= 0:
+        if self.remaining_time is None or self.is_completed:
             return False
 
-        self.remaining_time -= time_interval
         self.update_energy_consumption(time_interval)
 
-        if self.remaining_time <= 0:
+        # Work is measured at frequency 1.0, so lower frequencies progress slower;
+        # a process with no work left completes on its first execution
+        if time_interval >= self.time_to_completion():
             self.remaining_time = 0
             self.is_completed = True
             return True
 
+        self.remaining_time -= time_interval * self.frequency
         return False
 
     def calculate_metrics(self):
@@ -0,0 +1,361 @@
+"""
+Struct-of-arrays storage for large process sets.
+
+A ProcessTable keeps one NumPy column per Process field, about 115 bytes
+per process. ProcessView is a two-slot handle onto one row that offers the
+Process API by reading and writing the columns.
+
+Schedulers do not run on views: reading a NumPy scalar per attribute would
+make the hot loop several times slower than with Process objects. Instead
+iter_arrival_order() loads rows in blocks into TableProcess objects, which
+are Processes with plain attributes, only as they arrive. Each one is
+written back to its row when it completes, so only the processes being
+scheduled are ever held as objects.
+
+A forked scheduler gets a copy-on-write table: both tables share the
+columns, and each copies a column before it first writes to it.
+"""
+from typing import Dict, Iterator, List, Optional, Set
+import numpy as np
+from .process import Process
+
+# (name, dtype, default) for every column, in Process field order.
+# Optional fields store NaN for None.
+_COLUMNS = (
+    ("pid", np.int64, 0),
+    ("arrival_time", np.float64, 0.0),
+    ("burst_time", np.float64, 0.0),
+    ("priority", np.int64, 0),
+    ("deadline", np.float64, np.nan),
+    ("energy_consumption", np.float64, 0.0),
+    ("remaining_time", np.float64, np.nan),
+    ("start_time", np.float64, np.nan),
+    ("completion_time", np.float64, np.nan),
+    ("waiting_time", np.float64, np.nan),
+    ("turnaround_time", np.float64, np.nan),
+    ("response_time", np.float64, np.nan),
+    ("is_completed", np.bool_, False),
+    ("voltage", np.float64, 1.0),
+    ("frequency", np.float64, 1.0),
+)
+
+_OPTIONAL = {"deadline", "remaining_time", "start_time", "completion_time",
+             "waiting_time", "turnaround_time", "response_time"}
+_NAMES = tuple(name for name, _, _ in _COLUMNS)
+_STATE = _NAMES[5:]  # Fields that change while a process is scheduled
+_BLOCK = 4096  # Rows loaded, or completed rows written back, at a time
+
+class ProcessTable:
+    """Column-oriented table of processes"""
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.full(max(capacity, 1), default, dtype=dtype)
+            for name, dtype, default in _COLUMNS
+        }
+        self._live: Dict[int, "TableProcess"] = {}  # Row -> process being scheduled
+        self._completed: List["TableProcess"] = []  # Completed processes not yet written back
+        self._shared: Set[str] = set()  # Columns shared with a fork's table, copied before writing
+
+    @classmethod
+    def from_arrays(cls, arrival_time, burst_time, priority=0, deadline=np.nan,
+                    voltage=1.0, frequency=1.0, pid=None) -> "ProcessTable":
+        """Build a table from per-field arrays, broadcasting scalars"""
+        arrival_time = np.asarray(arrival_time, dtype=np.float64)
+        table = cls(capacity=len(arrival_time))
+        table.extend(arrival_time, burst_time, priority, deadline, voltage, frequency, pid)
+        return table
+
+    @classmethod
+    def from_workload(cls, workload: np.ndarray) -> "ProcessTable":
+        """Build a table from a 1-D models.batch workload array"""
+        return cls.from_arrays(workload["arrival_time"], workload["burst_time"],
+                               workload["priority"], workload["deadline"],
+                               workload["voltage"], workload["frequency"], workload["pid"])
+
+    @classmethod
+    def from_processes(cls, processes: List[Process]) -> "ProcessTable":
+        """Build a table holding the current state of Process objects"""
+        table = cls(capacity=len(processes))
+        table._reserve(len(processes))
+        for name, _, default in _COLUMNS:
+            values = [getattr(p, name) for p in processes]
+            if name in _OPTIONAL:
+                values = [default if v is None else v for v in values]
+            table.columns[name][:len(processes)] = values
+        table._size = len(processes)
+        return table
+
+    def _reserve(self, capacity: int):
+        current = len(self.columns["pid"])
+        if capacity <= current:
+            return
+        capacity = max(capacity, 2 * current)
+        for name, dtype, default in _COLUMNS:
+            column = np.full(capacity, default, dtype=dtype)
+            column[:self._size] = self.columns[name][:self._size]
+            self.columns[name] = column
+        self._shared.clear()
+
+    def _writable(self, name: str) -> np.ndarray:
+        """Return a column to write to, copying it first if a fork's table shares it"""
+        if name in self._shared:
+            self.columns[name] = self.columns[name].copy()
+            self._shared.discard(name)
+        return self.columns[name]
+
+    def append(self, pid: int, arrival_time: float, burst_time: float, priority: int = 0,
+               deadline: Optional[float] = None, voltage: float = 1.0, frequency: float = 1.0) -> int:
+        """Add one process and return its row index"""
+        index = self._size
+        self._reserve(index + 1)
+        column = self._writable
+        column("pid")[index] = pid
+        column("arrival_time")[index] = arrival_time
+        column("burst_time")[index] = burst_time
+        column("remaining_time")[index] = burst_time
+        column("priority")[index] = priority
+        column("deadline")[index] = np.nan if deadline is None else deadline
+        column("voltage")[index] = voltage
+        column("frequency")[index] = frequency
+        self._size += 1
+        return index
+
+    def extend(self, arrival_time, burst_time, priority=0, deadline=np.nan,
+               voltage=1.0, frequency=1.0, pid=None):
+        """Add many processes at once from per-field arrays"""
+        arrival_time = np.asarray(arrival_time, dtype=np.float64)
+        start, count = self._size, len(arrival_time)
+        self._reserve(start + count)
+        rows = slice(start, start + count)
+        column = self._writable
+        if pid is None:
+            pid = np.arange(start + 1, start + count + 1)
+        column("pid")[rows] = pid
+        column("arrival_time")[rows] = arrival_time
+        column("burst_time")[rows] = burst_time
+        column("remaining_time")[rows] = self.columns["burst_time"][rows]
+        column("priority")[rows] = priority
+        column("deadline")[rows] = deadline
+        column("voltage")[rows] = voltage
+        column("frequency")[rows] = frequency
+        self._size += count
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int):
+        """Return the row's process while it is being scheduled, else a view of the row"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("process index out of range")
+        return self._live.get(index) or ProcessView(self, index)
+
+    def __iter__(self) -> Iterator:
+        return (self[i] for i in range(self._size))
+
+    def iter_arrival_order(self) -> Iterator["TableProcess"]:
+        """Yield a TableProcess per row, ordered by arrival time then row index"""
+        order = np.argsort(self.columns["arrival_time"][:self._size], kind="stable")
+        return _ArrivalOrder(self, order)
+
+    def sync(self):
+        """Write the current state of the processes being scheduled to their rows"""
+        self._write_completed()
+        for process in self._live.values():
+            process.write_back()
+
+    def _complete(self, process: "TableProcess"):
+        del self._live[process.index]
+        self._completed.append(process)
+        if len(self._completed) >= _BLOCK:
+            self._write_completed()
+
+    def _write_completed(self):
+        """Write the state of completed processes to their rows, one column at a time"""
+        completed = self._completed
+        if not completed:
+            return
+        rows = [process.index for process in completed]
+        for name in _STATE:
+            values = [getattr(process, name) for process in completed]
+            if name in _OPTIONAL:
+                values = [np.nan if value is None else value for value in values]
+            self._writable(name)[rows] = values
+        self._completed = []
+
+    def _fork_copy(self) -> "ProcessTable":
+        """Return the table of a forked scheduler, sharing the columns copy-on-write.
+
+        Its live processes register themselves as the fork unpickles them.
+        """
+        table = ProcessTable.__new__(ProcessTable)
+        table.__dict__.update(self.__dict__)
+        table.columns = dict(self.columns)
+        table._live = {}
+        table._completed = list(self._completed)
+        table._shared = set(self.columns)
+        self._shared = set(self.columns)
+        return table
+
+    def __getstate__(self) -> dict:
+        # Live processes register themselves when unpickled (TableProcess.__setstate__)
+        state = self.__dict__.copy()
+        del state["_live"]
+        state["_shared"] = set()
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_live", {})
+        self.__dict__.setdefault("_shared", set())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the filled part of the columns"""
+        return sum(column[:self._size].nbytes for column in self.columns.values())
+
+    def to_numpy(self) -> Dict[str, np.ndarray]:
+        """Return the columns as NumPy arrays that share the table's memory"""
+        self.sync()
+        return {name: column[:self._size] for name, column in self.columns.items()}
+
+    def to_pandas(self):
+        """Return the table as a pandas DataFrame without copying the columns"""
+        import pandas as pd
+        return pd.DataFrame(self.to_numpy(), copy=False)
+
+    def to_workload(self) -> np.ndarray:
+        """Return a models.batch workload array with the table's inputs"""
+        from .batch import WORKLOAD_DTYPE
+        self.sync()
+        workload = np.empty(self._size, dtype=WORKLOAD_DTYPE)
+        for name in WORKLOAD_DTYPE.names:
+            workload[name] = self.columns[name][:self._size]
+        return workload
+
+    def to_processes(self) -> List[Process]:
+        """Materialize every row as a standalone Process object"""
+        self.sync()
+        return [ProcessView(self, i).to_process() for i in range(self._size)]
+
+class TableProcess(Process):
+    """Process loaded from a ProcessTable row, written back when it completes"""
+    __slots__ = ("table", "index")
+
+    def __post_init__(self):
+        pass  # Every field, the remaining time included, comes from the row
+
+    def write_back(self):
+        """Store the process's current state in its row"""
+        for name in _STATE:
+            value = getattr(self, name)
+            self.table._writable(name)[self.index] = np.nan if value is None else value
+
+    def __setstate__(self, state: tuple):
+        _, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+        if not self.is_completed:
+            # The table may not have its own state yet while it is unpickled
+            self.table.__dict__.setdefault("_live", {})[self.index] = self
+
+    def calculate_metrics(self):
+        Process.calculate_metrics(self)
+        if self.is_completed and self.index in self.table._live:
+            self.table._complete(self)
+
+class _ArrivalOrder:
+    """Picklable iterator of TableProcesses in a precomputed row order"""
+
+    def __init__(self, table: ProcessTable, order: np.ndarray):
+        self.table = table
+        self.order = order
+        self.position = 0
+        self._rows: List[tuple] = []  # Loaded rows from position onwards, reversed
+
+    def __iter__(self) -> "_ArrivalOrder":
+        return self
+
+    def _load(self):
+        """Read the next block of rows as Python values in one pass per column"""
+        rows = self.order[self.position:self.position + _BLOCK]
+        columns = self.table.columns
+        values = []
+        for name in _NAMES:
+            column = columns[name][rows].tolist()
+            if name in _OPTIONAL:
+                column = [None if value != value else value for value in column]
+            values.append(column)
+        self._rows = list(zip(rows.tolist(), *values))
+        self._rows.reverse()
+
+    def __next__(self) -> TableProcess:
+        if not self._rows:
+            if self.position >= len(self.order):
+                raise StopIteration
+            self._load()
+        index, *values = self._rows.pop()
+        self.position += 1
+        process = TableProcess(*values)
+        process.table = self.table
+        process.index = index
+        self.table._live[index] = process
+        return process
+
+    def __getstate__(self) -> dict:
+        # Rows are reloaded from the table, which also holds written-back state
+        state = self.__dict__.copy()
+        state["_rows"] = []
+        return state
+
+class ProcessView:
+    """Handle onto one ProcessTable row with the same API as Process"""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: ProcessTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def table(self) -> ProcessTable:
+        return self._table
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def to_process(self) -> Process:
+        """Copy the row into a standalone Process object"""
+        process = Process(self.pid, self.arrival_time, self.burst_time, self.priority, self.deadline)
+        for name, _, _ in _COLUMNS[4:]:
+            setattr(process, name, getattr(self, name))
+        return process
+
+    # The behaviour only touches fields, so Process's methods work unchanged
+    time_to_completion = Process.time_to_completion
+    update_energy_consumption = Process.update_energy_consumption
+    execute = Process.execute
+    calculate_metrics = Process.calculate_metrics
+    set_dvfs_parameters = Process.set_dvfs_parameters
+    __str__ = Process.__str__
+
+    def __repr__(self) -> str:
+        return f"ProcessView(index={self._index}, pid={self.pid})"
+
+def _column_property(name: str, optional: bool) -> property:
+    def getter(self):
+        value = self._table.columns[name][self._index].item()
+        if optional and value != value:  # NaN stands for None
+            return None
+        return value
+
+    def setter(self, value):
+        self._table._writable(name)[self._index] = np.nan if value is None else value
+
+    return property(getter, setter)
+
+for _name, _, _ in _COLUMNS:
+    setattr(ProcessView, _name, _column_property(_name, _name in _OPTIONAL))
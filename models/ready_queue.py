@@ -0,0 +1,141 @@
+"""
+Ready queues for the scheduling policies.
+
+Both queues pickle as a plain list of their processes in the order they
+would be popped, because priority keys are often lambdas. The owning
+scheduler rebuilds the queue from that list when it is restored.
+"""
+import heapq
+from collections import deque
+from itertools import count
+from typing import Callable, Iterator, List, Optional
+from .process import Process
+
+class FIFOReadyQueue:
+    """Ready queue that hands out processes in the order they were queued"""
+
+    def __init__(self):
+        self._queue = deque()  # Deque of (seq, process)
+        self._seq = count()
+        self._members = {}  # id(process) -> seq of its live queue entry
+
+    def push(self, process: Process):
+        """Queue a process unless it is already waiting"""
+        if id(process) in self._members:
+            return
+        seq = next(self._seq)
+        self._members[id(process)] = seq
+        self._queue.append((seq, process))
+
+    def _discard_stale(self):
+        queue = self._queue
+        while queue and self._members.get(id(queue[0][1])) != queue[0][0]:
+            queue.popleft()
+
+    def pop(self) -> Optional[Process]:
+        """Remove and return the oldest queued process"""
+        self._discard_stale()
+        if not self._queue:
+            return None
+        _, process = self._queue.popleft()
+        del self._members[id(process)]
+        return process
+
+    def peek(self) -> Optional[Process]:
+        """Return the oldest queued process without removing it"""
+        self._discard_stale()
+        return self._queue[0][1] if self._queue else None
+
+    def remove(self, process: Process):
+        """Drop a process from the queue (lazily, in O(1))"""
+        self._members.pop(id(process), None)
+
+    def clear(self):
+        self._queue.clear()
+        self._members.clear()
+
+    def __contains__(self, process: Process) -> bool:
+        return id(process) in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Process]:
+        return (p for seq, p in self._queue if self._members.get(id(p)) == seq)
+
+    def ordered(self) -> List[Process]:
+        """Return the queued processes in the order they would be popped"""
+        return list(self)
+
+    def __reduce__(self):
+        return list, (self.ordered(),)
+
+class PriorityReadyQueue:
+    """Ready queue that hands out the process with the smallest key first.
+
+    Ties are broken by queueing order. The key is evaluated once, when the
+    process is pushed.
+    """
+
+    def __init__(self, key: Callable[[Process], object]):
+        self.key = key
+        self._heap = []  # Heap of (key, seq, process)
+        self._seq = count()
+        self._members = {}  # id(process) -> seq of its live heap entry
+
+    def push(self, process: Process):
+        """Queue a process unless it is already waiting"""
+        if id(process) in self._members:
+            return
+        seq = next(self._seq)
+        self._members[id(process)] = seq
+        heapq.heappush(self._heap, (self.key(process), seq, process))
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap and self._members.get(id(heap[0][2])) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def pop(self) -> Optional[Process]:
+        """Remove and return the process with the smallest key"""
+        self._discard_stale()
+        if not self._heap:
+            return None
+        _, _, process = heapq.heappop(self._heap)
+        del self._members[id(process)]
+        return process
+
+    def peek(self) -> Optional[Process]:
+        """Return the process with the smallest key without removing it"""
+        self._discard_stale()
+        return self._heap[0][2] if self._heap else None
+
+    def peek_key(self):
+        """Return the smallest key, or None if the queue is empty"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def remove(self, process: Process):
+        """Drop a process from the queue (lazily, in O(1))"""
+        self._members.pop(id(process), None)
+
+    def clear(self):
+        self._heap.clear()
+        self._members.clear()
+
+    def __contains__(self, process: Process) -> bool:
+        return id(process) in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[Process]:
+        return (p for _, seq, p in self._heap if self._members.get(id(p)) == seq)
+
+    def ordered(self) -> List[Process]:
+        """Return the queued processes in the order they would be popped"""
+        live = [entry for entry in self._heap if self._members.get(id(entry[2])) == entry[1]]
+        return [p for _, _, p in sorted(live, key=lambda entry: entry[:2])]
+
+    def __reduce__(self):
+        return list, (self.ordered(),)
@@ -1,79 +1,318 @@
+import copy
+import heapq
+import io
+import os
+import pickle
+import zlib
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Optional
+from .gantt import GanttChart, SpillArchive
 from .process import Process
+from .ready_queue import FIFOReadyQueue
+from utils.metrics import MetricsAccumulator
+
+# Event kinds. Arrivals are not events: they are read from the pending index
+COMPLETION = 1
+PREEMPTION = 2
+
+# Power drawn by an idle CPU, relative to 1.0 for a busy one at nominal
+# voltage and frequency. Shared by every policy so their energy compares
+IDLE_POWER = 0.3
 
 class Scheduler(ABC):
-    def __init__(self):
+    preemptive = False  # Whether arrivals may preempt the running process
+    # Whether the policy is fully described by its ready queue ordering,
+    # preemptive, a fixed time_quantum and optional DVFS, which is all that
+    # MultiCoreScheduler reproduces on every core
+    queue_ordered = False
+
+    def __init__(self, context_switch_time: float = 0.0, idle_power: float = IDLE_POWER,
+                 keep_completed: bool = True, gantt_limit: Optional[int] = None):
+        self.context_switch_time = context_switch_time  # CPU time lost when switching processes
+        self.idle_power = idle_power  # Power drawn while no process is running
+        self.keep_completed = keep_completed  # Disable to bound memory on long traces
+        self.gantt_limit = gantt_limit  # Gantt segments kept in memory before older ones spill to disk
         self.processes: List[Process] = []
         self.current_process: Optional[Process] = None
         self.current_time: float = 0.0
         self.total_energy_consumption: float = 0.0
         self.completed_processes: List[Process] = []
-        self.gantt_chart: List[tuple] = []  # List of (process_id, start_time, end_time)
+        self.metrics = MetricsAccumulator()
+        self.gantt_chart = GanttChart(gantt_limit)  # Segments of (process_id, start_time, end_time)
+        self.ready_queue = self.create_ready_queue()
+        self.context_switches = 0
+        self.preemptions = 0
+        self.deadline_misses = 0
+        self._last_process: Optional[Process] = None
+        self._pending: List[tuple] = []  # Heap of (arrival_time, seq, process, source) not yet admitted
+        self._pending_seq = count()
+        # Pending processes shared with a fork: id -> index in self.processes (-1 if absent)
+        self._copy_on_admit: Dict[int, int] = {}
+        self._events: List[tuple] = []  # Heap of (time, seq, kind, payload)
+        self._event_seq = count()
+        self._dispatch_token = 0  # Invalidates events of earlier dispatches
+        self._completion_at = float('inf')
+        self._exec_start = 0.0  # Time the current process has been executed up to
 
     def add_process(self, process: Process):
         """Add a process to the scheduler"""
         self.processes.append(process)
+        heapq.heappush(self._pending, (process.arrival_time, next(self._pending_seq), process, None))
 
     def add_processes(self, processes: List[Process]):
         """Add multiple processes to the scheduler"""
         self.processes.extend(processes)
+        self._pending.extend((p.arrival_time, next(self._pending_seq), p, None) for p in processes)
+        heapq.heapify(self._pending)
+
+    def add_source(self, processes: Iterable[Process]):
+        """Feed processes lazily from an iterable sorted by arrival time.
+
+        Only the next process of each source is held until it arrives, and
+        processes from sources are not kept in self.processes.
+        """
+        self._pull(iter(processes), None)
+
+    def add_table(self, table):
+        """Schedule every row of a ProcessTable through lightweight views"""
+        self.add_source(table.iter_arrival_order())
+
+    def _pull(self, source: Iterator[Process], previous: Optional[Process]):
+        """Queue the next process of a source as pending"""
+        process = next(source, None)
+        if process is None:
+            return
+        if previous is not None and process.arrival_time < previous.arrival_time:
+            raise ValueError(f"Process source is not sorted by arrival time (PID {process.pid})")
+        heapq.heappush(self._pending, (process.arrival_time, next(self._pending_seq), process, source))
+
+    def create_ready_queue(self):
+        """Build the ready queue structure used by the policy"""
+        return FIFOReadyQueue()
 
     @abstractmethod
     def next_process(self) -> Optional[Process]:
         """Select the next process to execute"""
         pass
 
+    def on_arrival(self, process: Process):
+        """Called when a process arrives at the current time"""
+        self.ready_queue.push(process)
+
+    def requeue(self, process: Process):
+        """Return a preempted process to the ready set"""
+        self.ready_queue.push(process)
+
+    def admit_arrivals(self) -> bool:
+        """Move every pending process that has arrived into the ready queue"""
+        pending = self._pending
+        shared = self._copy_on_admit
+        arrived = False
+        while pending and pending[0][0] <= self.current_time:
+            _, _, process, source = heapq.heappop(pending)
+            if source is not None:
+                self._pull(source, process)
+            elif shared:
+                process = self._own(process)
+            if not process.is_completed:
+                self.on_arrival(process)
+                arrived = True
+        return arrived
+
+    def _own(self, process: Process) -> Process:
+        """Return a private copy of a pending process shared with a fork"""
+        index = self._copy_on_admit.pop(id(process), None)
+        if index is None:
+            return process
+        process = copy.copy(process)
+        if index >= 0:
+            self.processes[index] = process
+        return process
+
+    def should_preempt(self) -> bool:
+        """Decide whether newly arrived processes preempt the current one"""
+        return False
+
+    def time_slice(self, process: Process) -> Optional[float]:
+        """Return the quantum for a dispatch of the process, or None to run it to completion"""
+        return None
+
+    def dispatch_overhead(self, process: Process) -> float:
+        """Return the time spent before a dispatched process starts executing"""
+        if self._last_process is not None and self._last_process is not process:
+            return self.context_switch_time
+        return 0.0
+
+    def idle_energy(self, start_time: float, end_time: float) -> float:
+        """Return the energy drawn while the CPU is idle between the given times"""
+        return self.idle_power * (end_time - start_time)
+
     def execute_process(self, time_interval: float) -> bool:
         """Execute the current process for the given time interval"""
         if self.current_process is None:
             return False
 
+        energy_before = self.current_process.energy_consumption
         completed = self.current_process.execute(time_interval)
-        self.total_energy_consumption += self.current_process.energy_consumption
+        self.total_energy_consumption += self.current_process.energy_consumption - energy_before
 
         if completed:
-            self.current_process.completion_time = self.current_time
-            self.current_process.calculate_metrics()
-            self.completed_processes.append(self.current_process)
+            self._record_completion(self.current_process)
             self.current_process = None
 
         return completed
 
+    def _record_completion(self, process: Process):
+        """Record the metrics of a process that completed at the current time"""
+        process.completion_time = self.current_time
+        process.calculate_metrics()
+        if process.deadline is not None and self.current_time > process.deadline:
+            self.deadline_misses += 1
+        self.metrics.add(process)
+        if self.keep_completed:
+            self.completed_processes.append(process)
+
     def update_gantt_chart(self, process: Process, start_time: float, end_time: float):
         """Update the Gantt chart with process execution information"""
-        self.gantt_chart.append((process.pid, start_time, end_time))
+        self.gantt_chart.add(process.pid, start_time, end_time)
+
+    def preempt(self):
+        """Take the CPU away from the current process and requeue it"""
+        process = self.current_process
+        if process is None:
+            return
+        self._sync()
+        if self.current_process is None:
+            return
+        self.current_process = None
+        self._dispatch_token += 1
+        self.preemptions += 1
+        self.requeue(process)
+
+    def step(self, time_interval: float = 1.0) -> bool:
+        """Advance the simulation by a fixed interval"""
+        return self.run_until(self.current_time + time_interval)
+
+    def run(self) -> dict:
+        """Run the simulation until every process has completed"""
+        self.run_until(float('inf'))
+        return self.get_metrics()
+
+    def run_until(self, until: float) -> bool:
+        """Advance the simulation to the given time, jumping from event to event.
+
+        Returns True if any process executed during the call. A finished
+        simulation keeps its clock at the last completion, so running it in
+        several calls ends at the same time as running it in one.
+        """
+        executed = False
+        while True:
+            if self.current_process is None:
+                self._dispatch()
+            time = self._next_event_time()
+            if time is None or time > until:
+                break
+            self._advance(time)
+            if time >= self._completion_at:
+                executed |= self._sync()
+            self._handle_events(time)
+
+        if until != float('inf') and not self.is_complete():
+            self._advance(until)
+            executed |= self._sync()
+        return executed
+
+    def _push_event(self, time: float, kind: int, payload):
+        heapq.heappush(self._events, (time, next(self._event_seq), kind, payload))
+
+    def _next_event_time(self) -> Optional[float]:
+        """Return the time of the next arrival or live event, discarding stale ones"""
+        events = self._events
+        while events and events[0][3] != self._dispatch_token:
+            heapq.heappop(events)
+        time = events[0][0] if events else None
+        if self._pending and (time is None or self._pending[0][0] < time):
+            time = self._pending[0][0]
+        return time
+
+    def _dispatch(self):
+        """Hand the CPU to the process chosen by the policy"""
+        process = self.next_process()
+        if process is None:
+            return
+        overhead = self.dispatch_overhead(process)
+        if self._last_process is not None and self._last_process is not process:
+            self.context_switches += 1
+        self._last_process = process
+        self.current_process = process
+        self._exec_start = self.current_time + overhead
+        if process.start_time is None:
+            process.start_time = self._exec_start
+
+        self._dispatch_token += 1
+        self._completion_at = self._exec_start + process.time_to_completion()
+        self._push_event(self._completion_at, COMPLETION, self._dispatch_token)
+
+        quantum = self.time_slice(process)
+        if quantum is not None and self._exec_start + quantum < self._completion_at:
+            self._push_event(self._exec_start + quantum, PREEMPTION, self._dispatch_token)
+
+    def _advance(self, time: float):
+        """Move the clock forward. A running process is accounted lazily by _sync"""
+        if time <= self.current_time:
+            return
+        if self.current_process is None:
+            self.total_energy_consumption += self.idle_energy(self.current_time, time)
+        self.current_time = time
+
+    def _sync(self) -> bool:
+        """Execute the current process for the time elapsed since it was last accounted.
+
+        Non-preemptive dispatches are therefore executed in one piece at
+        completion, however many arrivals happen meanwhile.
+        """
+        process = self.current_process
+        start = self._exec_start
+        end = self.current_time
+        # A process with no work left is due at its start and completes there
+        if process is None or (end <= start and end < self._completion_at):
+            return False
+
+        interval = process.time_to_completion() if end >= self._completion_at else end - start
+        self._exec_start = end
+        if end > start:
+            self.update_gantt_chart(process, start, end)
+        if self.execute_process(interval):
+            self._dispatch_token += 1
+        return True
+
+    def _handle_events(self, time: float):
+        """Process every arrival and event scheduled at or before the given time"""
+        arrived = self.admit_arrivals()
+        events = self._events
+        while events and events[0][0] <= time:
+            _, _, kind, payload = heapq.heappop(events)
+            if kind == PREEMPTION and payload == self._dispatch_token:
+                self.preempt()
+            # Completions are recorded by _sync; the event only wakes the loop
+
+        if arrived and self.preemptive and self.current_process is not None:
+            # Bring the running process up to date so the policy sees its remaining time
+            self._sync()
+            if self.current_process is not None and self.should_preempt():
+                self.preempt()
 
     def get_metrics(self) -> dict:
-        """Calculate and return performance metrics"""
-        if not self.completed_processes:
-            return {
-                "avg_waiting_time": 0,
-                "avg_turnaround_time": 0,
-                "avg_response_time": 0,
-                "throughput": 0,
-                "cpu_utilization": 0,
-                "total_energy_consumption": 0
-            }
-
-        total_waiting_time = sum(p.waiting_time for p in self.completed_processes)
-        total_turnaround_time = sum(p.turnaround_time for p in self.completed_processes)
-        total_response_time = sum(p.response_time for p in self.completed_processes)
-        n_processes = len(self.completed_processes)
-
-        # Calculate CPU utilization
-        total_execution_time = max(p.completion_time for p in self.completed_processes)
-        total_burst_time = sum(p.burst_time for p in self.completed_processes)
-        cpu_utilization = (total_burst_time / total_execution_time) * 100 if total_execution_time > 0 else 0
-
-        return {
-            "avg_waiting_time": total_waiting_time / n_processes,
-            "avg_turnaround_time": total_turnaround_time / n_processes,
-            "avg_response_time": total_response_time / n_processes,
-            "throughput": n_processes / total_execution_time if total_execution_time > 0 else 0,
-            "cpu_utilization": cpu_utilization,
-            "total_energy_consumption": self.total_energy_consumption
-        }
+        """Return performance metrics from the running accumulators, in O(1)"""
+        metrics = self.metrics.summary()
+        metrics.update({
+            "total_energy_consumption": self.total_energy_consumption,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "deadline_misses": self.deadline_misses
+        })
+        return metrics
 
     def reset(self):
         """Reset the scheduler to its initial state"""
@@ -82,8 +321,229 @@ class Scheduler(ABC):
         self.current_time = 0.0
         self.total_energy_consumption = 0.0
         self.completed_processes = []
-        self.gantt_chart = []
+        self.metrics = MetricsAccumulator()
+        self.gantt_chart = GanttChart(self.gantt_limit)
+        self.ready_queue = self.create_ready_queue()
+        self.context_switches = 0
+        self.preemptions = 0
+        self.deadline_misses = 0
+        self._last_process = None
+        self._pending = []
+        self._copy_on_admit = {}
+        self._events = []
+        self._dispatch_token = 0
+        self._completion_at = float('inf')
+        self._exec_start = 0.0
 
     def is_complete(self) -> bool:
         """Check if all processes have been completed"""
-        return all(p.is_completed for p in self.processes) 
\ No newline at end of file
+        return not self._pending and not self.ready_queue and self.current_process is None
+
+    # Snapshots
+
+    # Engine state carried over when a run continues under another policy
+    _ENGINE_STATE = (
+        "processes", "current_process", "current_time", "total_energy_consumption",
+        "completed_processes", "metrics", "gantt_chart", "context_switches", "preemptions",
+        "deadline_misses", "_last_process", "_pending", "_pending_seq", "_copy_on_admit",
+        "_events", "_event_seq", "_dispatch_token", "_completion_at", "_exec_start",
+    )
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        profiler = state.pop("profiler", None)
+        if profiler is not None:
+            # Profiling wrappers belong to this instance, not to the simulation
+            for name in profiler.wrapped:
+                state.pop(name, None)
+        # Keep the next value of each counter rather than the iterator itself
+        for name in ("_pending_seq", "_event_seq"):
+            value = next(getattr(self, name))
+            setattr(self, name, count(value))
+            state[name] = value
+        # Object ids mean nothing once unpickled, and the copy owns its processes
+        state["_copy_on_admit"] = {}
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_copy_on_admit", {})
+        self._pending_seq = count(state["_pending_seq"])
+        self._event_seq = count(state["_event_seq"])
+        self.ready_queue = self._rebuild_queue(state["ready_queue"])
+
+    def _rebuild_queue(self, processes):
+        """Build a fresh ready queue holding the processes, which arrive in pop order"""
+        if hasattr(processes, "ordered"):
+            processes = processes.ordered()
+        queue = self.create_ready_queue()
+        for process in processes:
+            queue.push(process)
+        return queue
+
+    def snapshot(self, level: int = 6, archive: Optional[SpillArchive] = None) -> bytes:
+        """Return the complete simulation state as compressed bytes.
+
+        Process sources are saved with their position, so they must be
+        picklable: utils.workload readers and ProcessTable iterators are,
+        plain generators are not. Spilled Gantt segments are included unless
+        an archive is given to keep them in.
+        """
+        buffer = io.BytesIO()
+        # A persistent_id hook costs a call per object, so only archives use one
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL) if archive is None \
+            else _ArchivePickler(buffer, archive)
+        try:
+            pickler.dump(self)
+        except (TypeError, AttributeError, pickle.PicklingError) as exc:
+            raise TypeError(f"Cannot snapshot the scheduler ({exc}); "
+                            "process sources must be picklable iterators") from exc
+        return zlib.compress(buffer.getvalue(), level)
+
+    @staticmethod
+    def restore(data: bytes, archive: Optional[SpillArchive] = None) -> "Scheduler":
+        """Rebuild a scheduler from snapshot() bytes, and the archive they were taken with"""
+        scheduler = _ArchiveUnpickler(io.BytesIO(zlib.decompress(data)), archive).load()
+        if not isinstance(scheduler, Scheduler):
+            raise TypeError("Data is not a scheduler snapshot")
+        return scheduler
+
+    def save(self, path: str):
+        """Write a snapshot to a file, atomically, so a crashed run can resume from it.
+
+        Spilled Gantt segments go to the directory path + ".gantt", where
+        each spill file is linked once, so saving again only adds new ones.
+        """
+        archive = SpillArchive(f"{path}.gantt")
+        partial = f"{path}.part"
+        with open(partial, "wb") as f:
+            f.write(self.snapshot(archive=archive))
+        os.replace(partial, path)
+        archive.prune()
+
+    @staticmethod
+    def load(path: str) -> "Scheduler":
+        """Read a scheduler saved with save()"""
+        with open(path, "rb") as f:
+            return Scheduler.restore(f.read(), SpillArchive(f"{path}.gantt"))
+
+    def _fork_shared_lists(self) -> list:
+        """Append-only containers whose items a fork can share with this scheduler"""
+        return [self.gantt_chart, self.completed_processes]
+
+    def fork(self, policy: Optional[type] = None, **kwargs) -> "Scheduler":
+        """Return an independent scheduler that continues from the current state.
+
+        Completed processes and Gantt segments never change again, so the
+        fork shares them instead of copying them. Processes that have not
+        arrived are shared too, and copied by each scheduler as it admits
+        them, so from then on neither updates the Process objects that were
+        added: read them from `processes`. Source tables are shared
+        copy-on-write. Only the running and ready processes are copied up
+        front. Given a policy class, the fork continues under that policy:
+        the running process goes back to the ready queue, and kwargs go to
+        the policy's constructor (the engine settings carry over by default).
+        """
+        pending = self._pending
+        # Source heads are copied with their source; added processes are shared
+        sourced = [index for index, entry in enumerate(pending) if entry[3] is not None]
+        shared = dict.fromkeys((id(entry[2]) for entry in pending if entry[3] is None), -1)
+        live = []
+        for index, process in enumerate(self.processes):
+            if id(process) in shared:
+                shared[id(process)] = index
+            elif not process.is_completed:
+                live.append(index)
+
+        buffer = io.BytesIO()
+        pickler = _ForkPickler(buffer, self._fork_shared_lists() + [pending, self.processes], shared)
+        pickler.dump((self, [pending[index] for index in sourced], [self.processes[index] for index in live]))
+        buffer.seek(0)
+        forked, entries, processes = _ForkUnpickler(buffer, pickler.shared).load()
+        # The pending heap and process list were shallow-copied; swap in the fork's own objects
+        for index, entry in zip(sourced, entries):
+            forked._pending[index] = entry
+        for index, process in zip(live, processes):
+            forked.processes[index] = process
+        self._copy_on_admit = shared
+        forked._copy_on_admit = dict(shared)
+        if policy is None:
+            return forked
+
+        settings = {"context_switch_time": self.context_switch_time, "idle_power": self.idle_power,
+                    "keep_completed": self.keep_completed, "gantt_limit": self.gantt_limit}
+        settings.update(kwargs)
+        successor = policy(**settings)
+        forked._sync()
+        running = forked.current_process
+        for name in self._ENGINE_STATE:
+            setattr(successor, name, getattr(forked, name))
+        # Events of the old policy's dispatch no longer apply
+        successor.current_process = None
+        successor._dispatch_token += 1
+        successor._completion_at = float('inf')
+        for process in forked.ready_queue.ordered():
+            successor.requeue(process)
+        if running is not None:
+            successor.requeue(running)
+        return successor
+
+class _ArchivePickler(pickle.Pickler):
+    """Pickler that keeps spilled Gantt segments in a SpillArchive"""
+
+    def __init__(self, file, archive: SpillArchive):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.archive = archive
+
+    def persistent_id(self, obj):
+        return self.archive.persistent_id(obj)
+
+class _ArchiveUnpickler(pickle.Unpickler):
+    def __init__(self, file, archive: Optional[SpillArchive]):
+        super().__init__(file)
+        self.archive = archive
+
+    def persistent_load(self, pid):
+        if self.archive is None:
+            raise pickle.UnpicklingError("Snapshot refers to spilled Gantt segments; pass its archive")
+        return self.archive.persistent_load(pid)
+
+class _ForkPickler(pickle.Pickler):
+    """Pickler that passes immutable or copy-on-write state to the fork by reference"""
+
+    def __init__(self, file, shared_lists: list, shared_processes: Dict[int, int]):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.shared = {}  # id -> object handed over without pickling
+        self._lists = {id(items) for items in shared_lists}
+        self._processes = shared_processes  # Pending processes, copied on admission
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Process):
+            if obj.is_completed or id(obj) in self._processes:
+                self.shared[id(obj)] = obj
+                return "same", id(obj)
+            return None
+        if id(obj) in self._lists:
+            self.shared[id(obj)] = obj
+            return "copy", id(obj)
+        if hasattr(type(obj), "_fork_copy"):
+            # Objects that copy themselves cheaply for a fork, such as ProcessTables
+            self.shared[id(obj)] = obj
+            return "fork", id(obj)
+        return None
+
+class _ForkUnpickler(pickle.Unpickler):
+    def __init__(self, file, shared: dict):
+        super().__init__(file)
+        self.shared = shared
+        self._copies = {}  # id -> the fork's copy, made once however often it is referenced
+
+    def persistent_load(self, pid):
+        kind, key = pid
+        obj = self.shared[key]
+        if kind == "same":
+            return obj
+        if key not in self._copies:
+            # Shared containers get a shallow copy, so both schedulers can append to their own
+            self._copies[key] = copy.copy(obj) if kind == "copy" else obj._fork_copy()
+        return self._copies[key]
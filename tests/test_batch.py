@@ -0,0 +1,54 @@
+import numpy as np
+from algorithms import create_scheduler
+from models.batch import batch_metrics, make_workload, simulate_batch, workload_to_processes
+
+POLICIES = ("FCFS", "SJF", "Priority")
+
+def random_workload(rng, n, shape=()):
+    size = shape + (n,)
+    arrival = np.sort(np.round(rng.random(size) * n * 3, 3), axis=-1)
+    return make_workload(arrival, np.round(rng.random(size) * 7, 2), rng.integers(0, 4, size),
+                         deadline=np.where(rng.random(size) < 0.5, np.nan, rng.random(size) * 100),
+                         voltage=rng.choice([0.8, 1.0], size), frequency=rng.choice([0.6, 1.0], size))
+
+def scheduler_metrics(policy, workload, keys):
+    scheduler = create_scheduler(policy)
+    scheduler.add_processes(workload_to_processes(workload))
+    metrics = scheduler.run()
+    return {key: metrics[key] for key in keys}
+
+def test_batch_matches_scheduler_exactly():
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        workload = random_workload(rng, int(rng.integers(0, 25)))
+        for policy in POLICIES:
+            expected = batch_metrics(workload, simulate_batch(workload, policy))
+            assert scheduler_metrics(policy, workload, expected) == expected, policy
+
+def test_batch_rows_match_single_workloads():
+    rng = np.random.default_rng(1)
+    workloads = random_workload(rng, 15, shape=(8,))
+    for policy in POLICIES:
+        metrics = batch_metrics(workloads, simulate_batch(workloads, policy))
+        for row in range(len(workloads)):
+            expected = {key: values[row].item() for key, values in metrics.items()}
+            assert scheduler_metrics(policy, workloads[row], expected) == expected, policy
+
+def test_batch_completes_zero_work_processes_like_scheduler():
+    workload = make_workload([0.0, 0.0, 5.0], [0.0, 2.0, 0.0])
+    for policy in POLICIES:
+        result = simulate_batch(workload, policy)
+        assert result["completion_time"].tolist() == [0.0, 2.0, 5.0]
+        expected = batch_metrics(workload, result)
+        assert scheduler_metrics(policy, workload, expected) == expected, policy
+
+def test_long_workloads_match_scheduler_exactly():
+    # Long enough to be ordered by the heap merge, with many equal keys and arrivals
+    rng = np.random.default_rng(2)
+    workloads = random_workload(rng, 300, shape=(3,))
+    workloads["arrival_time"] = np.round(workloads["arrival_time"] / 20) * 20
+    for policy in POLICIES:
+        metrics = batch_metrics(workloads, simulate_batch(workloads, policy))
+        for row in range(len(workloads)):
+            expected = {key: values[row].item() for key, values in metrics.items()}
+            assert scheduler_metrics(policy, workloads[row], expected) == expected, policy
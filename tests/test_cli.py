@@ -0,0 +1,32 @@
+import json
+import pytest
+from algorithms import algorithm_names
+from utils.cli import CSVProcessReader, main
+
+TRACE = """pid,arrival_time,burst_time,priority,deadline
+1,0,3,2,10
+2,1,2,1,6
+3,2,4,3,
+4,4,1,0,8
+"""
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text(TRACE)
+    return str(path)
+
+@pytest.mark.parametrize("algorithm", algorithm_names())
+def test_every_algorithm_runs_a_csv_trace(algorithm, trace, tmp_path, capsys):
+    gantt = str(tmp_path / "gantt.csv")
+    assert main(["run", algorithm, trace, "--gantt", gantt]) == 0
+    row = json.loads(capsys.readouterr().out)
+    assert row["algorithm"] == algorithm
+    assert row["completed"] == 4
+
+def test_reader_stays_exhausted(trace):
+    reader = CSVProcessReader(trace)
+    assert [process.pid for process in reader] == [1, 2, 3, 4]
+    for _ in range(2):
+        with pytest.raises(StopIteration):
+            next(reader)
@@ -0,0 +1,55 @@
+import os
+import pickle
+from algorithms import RoundRobin
+from models.gantt import GanttChart
+from models.scheduler import Scheduler
+from utils.generator import WorkloadSpec, generate_table
+
+def make(gantt_limit=None):
+    scheduler = RoundRobin(time_quantum=1, gantt_limit=gantt_limit)
+    scheduler.add_table(generate_table(WorkloadSpec(3000, seed=1, priorities=(1.0,) * 8)))
+    return scheduler
+
+def chart(segments, memory_limit=4):
+    gantt = GanttChart(memory_limit)
+    for pid in range(segments):
+        gantt.add(pid, 2.0 * pid, 2.0 * pid + 1)
+    return gantt
+
+def test_spilled_chart_reads_like_a_list():
+    gantt = chart(50)
+    segments = [(pid, 2.0 * pid, 2.0 * pid + 1) for pid in range(50)]
+    assert gantt.spilled > 0
+    assert gantt == segments
+    assert gantt.between(10.5, 20) == segments[5:10]
+    assert gantt.pids_at([-1.0, 0.5, 1.5, 40.0, 99.0, 100.0]) == [-1, 0, -1, 20, -1, -1]
+
+def test_unpickled_chart_spills_again():
+    gantt = pickle.loads(pickle.dumps(chart(50)))
+    assert gantt == chart(50)
+    assert gantt.nbytes <= 4 * 24
+    assert all(chunk.path is not None for chunk in gantt._chunks)
+
+def test_saved_runs_keep_spill_files_beside_the_checkpoint(tmp_path):
+    expected = make()
+    metrics = expected.run()
+
+    scheduler = make(gantt_limit=100)
+    path = str(tmp_path / "run.ckpt")
+    archive = path + ".gantt"
+    scheduler.run_until(expected.current_time / 2)
+    scheduler.save(path)
+    first = set(os.listdir(archive))
+    scheduler.run_until(expected.current_time * 3 / 4)
+    scheduler.save(path)
+    # Chunks archived by the first save are kept, not written again
+    assert first < set(os.listdir(archive))
+
+    restored = Scheduler.load(path)
+    assert restored.gantt_chart.nbytes <= 100 * 24
+    assert restored.run() == metrics
+    assert list(restored.gantt_chart) == list(expected.gantt_chart)
+
+    scheduler.reset()
+    scheduler.save(path)
+    assert not os.path.exists(archive)
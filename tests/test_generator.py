@@ -0,0 +1,58 @@
+import pickle
+import numpy as np
+import pytest
+from utils.generator import ARRIVALS, PRESETS, SyntheticWorkload, WorkloadSpec, generate, generate_table, preset, write_workload
+from utils.workload import load_workload
+
+def rows(spec, chunk_size, start=0):
+    return np.concatenate(list(generate(spec, chunk_size, start=start)))
+
+@pytest.mark.parametrize("name", sorted(PRESETS))
+def test_rows_do_not_depend_on_chunk_size_or_start(name):
+    spec = preset(name, 20000, seed=3)
+    expected = rows(spec, 1000)
+    assert len(expected) == 20000
+    assert rows(spec, 7001).tobytes() == expected.tobytes()
+    assert rows(spec, 65536, start=12345).tobytes() == expected[12345:].tobytes()
+    assert np.all(np.diff(expected["arrival_time"]) >= 0)
+
+@pytest.mark.parametrize("arrivals", ARRIVALS)
+def test_arrivals_follow_the_requested_rate(arrivals):
+    spec = WorkloadSpec(100000, seed=4, arrivals=arrivals, period=100.0)
+    arrival = rows(spec, 65536)["arrival_time"]
+    assert np.all(np.diff(arrival) >= 0)
+    assert len(arrival) / arrival[-1] == pytest.approx(spec.rate, rel=0.05)
+
+def test_seed_changes_the_rows():
+    assert rows(preset("web", 1000, seed=1), 256).tobytes() != rows(preset("web", 1000, seed=2), 256).tobytes()
+
+def test_resumed_source_continues_the_same_stream():
+    source = SyntheticWorkload(preset("web", 1000, seed=2), chunk_size=100)
+    first = [next(source).arrival_time for _ in range(250)]
+    rest = [process.arrival_time for process in pickle.loads(pickle.dumps(source))]
+    assert first + rest == generate_table(preset("web", 1000, seed=2)).to_workload()["arrival_time"].tolist()
+
+def test_written_traces_match_the_generator(tmp_path):
+    spec = preset("batch", 3000, seed=5)
+    path = str(tmp_path / "batch.bin")
+    assert write_workload(path, spec, chunk_size=512) == 3000
+    assert np.concatenate(list(load_workload(path).iter_chunks())).tobytes() == rows(spec, 4096).tobytes()
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_written_tabular_traces_match_the_generator(tmp_path, extension):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    spec = preset("web", 3000, seed=6)
+    path = str(tmp_path / f"web{extension}")
+    assert write_workload(path, spec, chunk_size=512) == 3000
+    expected = rows(spec, 4096)
+    written = np.concatenate(list(load_workload(path).iter_chunks()))
+    for name in expected.dtype.names:
+        np.testing.assert_array_equal(written[name], expected[name], err_msg=name)
+
+@pytest.mark.parametrize("name", ["trace.txt", "trace.pq", "trace"])
+def test_unknown_trace_formats_are_rejected(tmp_path, name):
+    path = tmp_path / name
+    with pytest.raises(ValueError, match="Unsupported trace format"):
+        write_workload(str(path), preset("web", 10))
+    assert not path.exists()
@@ -0,0 +1,78 @@
+import math
+import random
+import statistics
+import pytest
+from utils.metrics import QuantileSketch, RunningStats
+
+QUANTILES = (0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 1)
+
+def sample(seed, size=20000):
+    rng = random.Random(seed)
+    # Heavy-tailed, spanning several orders of magnitude, with some exact zeros
+    return [0.0 if rng.random() < 0.05 else rng.lognormvariate(0, 2) for _ in range(size)]
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_sketch_quantiles_are_within_the_relative_accuracy(accuracy):
+    values = sample(1)
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+    assert sketch.count == len(values)
+    for q, estimate in zip(QUANTILES, sketch.quantiles(QUANTILES)):
+        exact = exact_quantile(values, q)
+        assert abs(estimate - exact) <= accuracy * exact, q
+        assert sketch.quantile(q) == estimate  # Cached and uncached reads agree
+
+def test_empty_sketch_and_invalid_quantiles():
+    sketch = QuantileSketch()
+    assert sketch.quantiles([0, 0.5, 1]) == [0.0, 0.0, 0.0]
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        QuantileSketch(relative_accuracy=1)
+
+def test_merged_sketches_match_one_sketch_of_everything():
+    shards = [sample(seed, 5000) for seed in range(4)]
+    whole = QuantileSketch()
+    merged = QuantileSketch()
+    for values in shards:
+        part = QuantileSketch()
+        for value in values:
+            whole.add(value)
+            part.add(value)
+        merged.quantile(0.5)  # A stale cache must not survive the merge
+        merged.merge(part)
+    assert merged.count == whole.count and merged.zero_count == whole.zero_count
+    assert merged.buckets == whole.buckets
+    assert merged.quantiles(QUANTILES) == whole.quantiles(QUANTILES)
+    with pytest.raises(ValueError, match="different parameters"):
+        merged.merge(QuantileSketch(relative_accuracy=0.02))
+
+def test_running_stats_match_statistics():
+    values = [1e6 + x for x in sample(2, 5000)]  # A large offset defeats naive sum-of-squares
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(statistics.fmean(values), rel=1e-12)
+    assert stats.variance == pytest.approx(statistics.pvariance(values), rel=1e-9)
+    assert stats.std == pytest.approx(statistics.pstdev(values), rel=1e-9)
+
+def test_merged_running_stats_match_one_pass():
+    values = sample(3, 3000)
+    whole, merged = RunningStats(), RunningStats()
+    for value in values:
+        whole.add(value)
+    for start, end in ((0, 1000), (1000, 1001), (1001, 1001), (1001, 3000)):
+        part = RunningStats()
+        for value in values[start:end]:
+            part.add(value)
+        merged.merge(part)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert merged.variance == pytest.approx(whole.variance, rel=1e-9)
+    assert RunningStats().variance == 0.0
@@ -0,0 +1,46 @@
+import random
+import pytest
+from algorithms import create_scheduler, get_algorithm
+from algorithms.energy_efficient import OPERATING_POINTS
+from models.multicore import Core, MultiCoreScheduler, big_little
+from models.process import Process
+
+DVFS_POLICIES = ("DVFS", "EA-SJF", "EA-EDF")
+
+def processes(n, seed):
+    """Integer times, so arrivals often coincide with quanta and completions"""
+    rng = random.Random(seed)
+    time, result = 0, []
+    for pid in range(1, n + 1):
+        time += rng.choice([0, 1, 2, 3])
+        deadline = time + rng.randint(1, 30) if rng.random() < 0.7 else None
+        result.append(Process(pid, time, rng.choice([0, 1, 2, 3, 4, 5.5]), rng.randint(0, 3), deadline))
+    return result
+
+@pytest.mark.parametrize("name", ["FCFS", "SJF", "SJF (Preemptive)", "Priority", "Priority (Preemptive)",
+                                  "Round Robin", *DVFS_POLICIES])
+def test_one_core_reproduces_single_core_policy(name):
+    for seed in range(10):
+        single = create_scheduler(name, context_switch_time=0.5)
+        single.add_processes(processes(60, seed))
+        expected = single.run()
+        multi = MultiCoreScheduler([Core(0, OPERATING_POINTS)], get_algorithm(name),
+                                   context_switch_time=0.5, dvfs=name in DVFS_POLICIES)
+        multi.add_processes(processes(60, seed))
+        metrics = multi.run()
+        assert {key: metrics[key] for key in expected} == expected
+        assert list(multi.cores[0].gantt_chart) == list(single.gantt_chart)
+
+@pytest.mark.parametrize("name", ["GRR", "YDS", "DPM"])
+def test_policies_beyond_queue_ordering_are_rejected(name):
+    with pytest.raises(ValueError):
+        MultiCoreScheduler(2, get_algorithm(name))
+    with pytest.raises(ValueError):
+        MultiCoreScheduler(2, get_algorithm("FCFS")).fork(get_algorithm(name))
+
+def test_utilization_is_relative_to_all_cores():
+    scheduler = MultiCoreScheduler(big_little(2, 4), get_algorithm("SJF"))
+    scheduler.add_processes(processes(2000, 1))
+    metrics = scheduler.run()
+    assert scheduler.is_complete()
+    assert 0 < metrics["cpu_utilization"] <= 100
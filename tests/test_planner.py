@@ -0,0 +1,69 @@
+import random
+from algorithms import EAEDF, YDS
+from models.process import Process
+from models.process_table import ProcessTable
+from models.scheduler import Scheduler
+
+def deadline_workload(seed: int, size: int = 200):
+    rng = random.Random(seed)
+    processes, time = [], 0.0
+    for pid in range(1, size + 1):
+        time += rng.expovariate(0.5)
+        burst = rng.uniform(0.5, 4.0)
+        deadline = None if rng.random() < 0.2 else round(time + burst * rng.uniform(1.2, 6.0), 2)
+        processes.append(Process(pid, round(time, 2), round(burst, 2), deadline=deadline))
+    return processes
+
+def test_yds_plans_sources_like_added_processes():
+    for seed in range(5):
+        added = YDS()
+        added.add_processes(deadline_workload(seed))
+        fed = YDS()
+        fed.add_source(iter(deadline_workload(seed)))
+        assert fed.run() == added.run()
+        assert list(fed.gantt_chart) == list(added.gantt_chart)
+        assert not fed.source_plan
+
+class _StrictSource:
+    """Iterator that fails if it is read again after it has ended"""
+
+    def __init__(self, processes):
+        self.processes = iter(processes)
+        self.ended = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        assert not self.ended, "source read after StopIteration"
+        try:
+            return next(self.processes)
+        except StopIteration:
+            self.ended = True
+            raise
+
+def test_yds_stops_reading_an_ended_source():
+    added = YDS()
+    added.add_processes(deadline_workload(2, 50))
+    fed = YDS()
+    fed.add_source(_StrictSource(deadline_workload(2, 50)))
+    assert fed.run() == added.run()
+
+def test_yds_from_a_source_is_not_ea_edf():
+    yds = YDS()
+    yds.add_source(iter(deadline_workload(0)))
+    edf = EAEDF()
+    edf.add_source(iter(deadline_workload(0)))
+    assert yds.run()["total_energy_consumption"] < edf.run()["total_energy_consumption"]
+
+def test_yds_source_plan_survives_a_snapshot():
+    expected = YDS()
+    expected.add_table(ProcessTable.from_processes(deadline_workload(1)))
+    metrics = expected.run()
+
+    scheduler = YDS()
+    scheduler.add_table(ProcessTable.from_processes(deadline_workload(1)))
+    scheduler.run_until(100)
+    restored = Scheduler.restore(scheduler.snapshot())
+    assert restored.run() == metrics
+    assert list(restored.gantt_chart) == list(expected.gantt_chart)
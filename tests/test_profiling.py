@@ -0,0 +1,91 @@
+import json
+import re
+import pytest
+from algorithms import RoundRobin
+from models.process import Process
+from utils.profiling import PHASES, Profiler
+
+def make():
+    # Round Robin with quantum 4 over the classic four-process exercise: 8 segments, 4 preemptions
+    scheduler = RoundRobin(time_quantum=4)
+    scheduler.add_processes([Process(1, 0, 8), Process(2, 1, 4), Process(3, 2, 9), Process(4, 3, 5)])
+    return scheduler
+
+def test_profiler_counts_phases_and_events():
+    scheduler = make()
+    preempted = []
+    profiler = Profiler(scheduler)
+    profiler.on("preempt", lambda event, time, process: preempted.append((time, process.pid)))
+    with profiler:
+        scheduler.run()
+    report = profiler.report()
+    phases = report["phases"]
+    assert phases["run_until"]["calls"] == 1
+    assert phases["on_arrival"]["calls"] == 4
+    assert phases["_record_completion"]["calls"] == 4
+    assert phases["update_gantt_chart"]["calls"] == len(scheduler.gantt_chart) == 8
+    assert phases["preempt"]["calls"] == 4
+    expected = dict(arrivals=4, dispatches=8, requeues=4, preemptions=4, completions=4, context_switches=7)
+    assert {name: report["counters"][name] for name in expected} == expected
+    assert preempted == [(4, 1), (12, 3), (16, 4), (24, 3)]
+    for row in phases.values():
+        assert 0 <= row["self_time"] <= row["total_time"]
+    # Nested phases are included in run_until's time
+    assert phases["run_until"]["total_time"] >= sum(row["self_time"] for row in phases.values()) * 0.999
+
+def test_detach_restores_the_scheduler():
+    scheduler = make()
+    profiler = Profiler(scheduler).attach()
+    assert scheduler.profiler is profiler
+    assert set(profiler.wrapped) <= set(PHASES) and "next_process" in profiler.wrapped
+    with pytest.raises(RuntimeError):
+        Profiler(scheduler).attach()
+    scheduler.run_until(10)
+    profiler.detach()
+
+    assert not profiler.attached
+    assert not hasattr(scheduler, "profiler")
+    for name in profiler.wrapped + ["next_process", "_dispatch", "run_until"]:
+        assert name not in vars(scheduler)
+        assert getattr(scheduler, name).__func__ is getattr(RoundRobin, name)
+    calls = profiler.report()["phases"]["run_until"]["calls"]
+    scheduler.run()  # No longer recorded
+    assert profiler.report()["phases"]["run_until"]["calls"] == calls
+    assert scheduler.get_metrics() == make().run()
+
+def test_chrome_trace_and_folded_stacks_are_well_formed(tmp_path):
+    scheduler = make()
+    profiler = Profiler(scheduler, trace=True)
+    with profiler:
+        scheduler.run()
+
+    path = tmp_path / "run.json"
+    profiler.write_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert {event["ph"] for event in events} == {"M", "X", "C"}
+    spans = [event for event in events if event["ph"] == "X" and event["pid"] == 1]
+    schedule = [event for event in events if event["ph"] == "X" and event["pid"] == 2]
+    assert len(spans) == sum(row["calls"] for row in profiler.report()["phases"].values())
+    assert all(event["dur"] >= 0 and event["name"] in PHASES for event in spans)
+    assert [(event["args"]["pid"], event["ts"] / 1e6, (event["ts"] + event["dur"]) / 1e6)
+            for event in schedule] == list(scheduler.gantt_chart)
+    assert len([event for event in events if event["ph"] == "C"]) == 8
+
+    path = tmp_path / "run.folded"
+    profiler.write_folded(str(path))
+    lines = path.read_text().splitlines()
+    assert lines
+    for line in lines:
+        match = re.fullmatch(r"([\w;]+) (\d+)", line)
+        assert match, line
+        stack = match.group(1).split(";")
+        assert stack[0] == "run_until" and set(stack) <= set(PHASES)
+        assert int(match.group(2)) > 0
+
+def test_trace_events_are_capped():
+    scheduler = make()
+    profiler = Profiler(scheduler, trace=True, max_trace_events=10)
+    with profiler:
+        scheduler.run()
+    assert len(profiler.spans) == 10
+    assert profiler.dropped_spans == sum(row["calls"] for row in profiler.report()["phases"].values()) - 10
@@ -0,0 +1,82 @@
+import pickle
+import pytest
+from models.process import Process
+from models.ready_queue import FIFOReadyQueue, PriorityReadyQueue
+
+def by_burst():
+    return PriorityReadyQueue(key=lambda p: p.burst_time)
+
+def drain(queue):
+    return [p.pid for p in iter(queue.pop, None)]
+
+def test_fifo_queue_pops_in_push_order():
+    queue = FIFOReadyQueue()
+    for pid in (3, 1, 2):
+        queue.push(Process(pid, 0, 1))
+    assert queue.peek().pid == 3
+    assert len(queue) == 3
+    assert drain(queue) == [3, 1, 2]
+    assert queue.pop() is None and queue.peek() is None
+
+def test_priority_queue_pops_smallest_key_and_breaks_ties_in_push_order():
+    queue = by_burst()
+    for pid, burst in ((1, 5), (2, 3), (3, 5), (4, 3), (5, 1)):
+        queue.push(Process(pid, 0, burst))
+    assert queue.peek_key() == 1
+    assert [p.pid for p in queue.ordered()] == [5, 2, 4, 1, 3]
+    assert drain(queue) == [5, 2, 4, 1, 3]
+    assert queue.peek_key() is None
+
+@pytest.mark.parametrize("make", [FIFOReadyQueue, by_burst])
+def test_membership_is_by_identity(make):
+    queue = make()
+    process, twin = Process(1, 0, 2), Process(1, 0, 2)
+    assert process == twin  # Dataclass equality must not merge distinct processes
+    queue.push(process)
+    queue.push(process)
+    queue.push(twin)
+    assert len(queue) == 2
+    assert process in queue and twin in queue
+    assert [queue.pop(), queue.pop(), queue.pop()] == [process, twin, None]
+
+@pytest.mark.parametrize("make", [FIFOReadyQueue, by_burst])
+def test_removal_is_lazy_and_requeueing_moves_to_the_back(make):
+    queue = make()
+    processes = [Process(pid, 0, 1) for pid in range(1, 5)]
+    for process in processes:
+        queue.push(process)
+    queue.remove(processes[0])
+    queue.remove(processes[2])
+    queue.remove(Process(9, 0, 1))  # Not queued: ignored
+    assert len(queue) == 2
+    assert processes[0] not in queue
+    assert [p.pid for p in queue] == [2, 4]
+    # The stale entry of a removed process must not resurface once it is pushed again
+    queue.push(processes[0])
+    assert [p.pid for p in queue.ordered()] == [2, 4, 1]
+    assert queue.peek().pid == 2
+    assert drain(queue) == [2, 4, 1]
+    assert len(queue) == 0
+
+def test_peek_key_skips_removed_processes():
+    queue = by_burst()
+    short, medium, long = Process(1, 0, 1), Process(2, 0, 2), Process(3, 0, 3)
+    for process in (long, short, medium):
+        queue.push(process)
+    queue.remove(short)
+    assert queue.peek_key() == 2
+    queue.remove(medium)
+    assert queue.peek_key() == 3
+    assert queue.peek() is long
+    queue.remove(long)
+    assert queue.peek_key() is None and queue.peek() is None
+
+@pytest.mark.parametrize("make", [FIFOReadyQueue, by_burst])
+def test_queues_pickle_as_their_pop_order(make):
+    queue = make()
+    processes = [Process(pid, 0, burst) for pid, burst in ((1, 3), (2, 1), (3, 2))]
+    for process in processes:
+        queue.push(process)
+    queue.remove(processes[2])
+    expected = [p.pid for p in queue.ordered()]
+    assert [p.pid for p in pickle.loads(pickle.dumps(queue))] == expected
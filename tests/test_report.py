@@ -0,0 +1,62 @@
+import os
+import pytest
+from utils.report import build_report
+
+def make_runs():
+    return [
+        {"algorithm": algorithm, "workload": workload, "voltage": 1.0, "frequency": 1.0, "quantum": float("nan"),
+         "total_energy_consumption": 100.0 + index, "avg_waiting_time": 5.0 * (index + 1),
+         "avg_turnaround_time": 9.0 + index, "avg_response_time": 3.0, "deadline_misses": index,
+         "context_switches": 10 * index, "wall_time": 0.1}
+        for index, (workload, algorithm) in enumerate(
+            (workload, algorithm) for workload in ("alpha", "beta") for algorithm in ("FCFS", "SJF"))
+    ]
+
+def figures(out_dir):
+    """Figure file name -> modification time"""
+    directory = os.path.join(out_dir, "figures")
+    return {name: os.stat(os.path.join(directory, name)).st_mtime_ns for name in os.listdir(directory)}
+
+def build(runs, out_dir):
+    return build_report(runs, out_dir, pdf=False, max_workers=1)
+
+def test_unchanged_runs_render_no_figures(tmp_path):
+    out_dir = str(tmp_path / "report")
+    first = build(make_runs(), out_dir)
+    # An overview, then metric bars and a trade-off plot per workload
+    assert first["rendered"] == len(first["figures"]) == 5
+    before = figures(out_dir)
+    assert len(before) == 5
+
+    runs = make_runs()
+    for run in runs:
+        run["wall_time"] = 9.9  # Timings vary between identical runs and are ignored
+    second = build(runs, out_dir)
+    assert second["rendered"] == 0
+    assert second["figures"] == first["figures"]
+    assert figures(out_dir) == before
+
+def test_changed_run_renders_only_the_figures_that_show_it(tmp_path):
+    out_dir = str(tmp_path / "report")
+    build(make_runs(), out_dir)
+    before = figures(out_dir)
+
+    runs = make_runs()
+    runs[3]["avg_waiting_time"] += 1.0  # SJF on workload beta
+    result = build(runs, out_dir)
+    after = figures(out_dir)
+    assert result["rendered"] == 3  # The overview and both figures of beta
+    kept = set(before) & set(after)
+    assert {name.split("-")[0] for name in set(after) - kept} == {"overview", "metrics", "tradeoff"}
+    assert {name.split("-")[0] for name in kept} == {"metrics", "tradeoff"}
+    # Figures of alpha are reused untouched; stale ones are removed
+    assert all(after[name] == before[name] for name in kept)
+    assert len(after) == 5
+
+def test_report_pdf_is_written(tmp_path):
+    pytest.importorskip("reportlab")
+    out_dir = str(tmp_path / "report")
+    result = build_report(make_runs(), out_dir, formats=("csv",), max_workers=1)
+    with open(result["pdf"], "rb") as f:
+        assert f.read(5) == b"%PDF-"
+    assert [os.path.basename(path) for path in result["tables"]] == ["runs.csv", "summary.csv"]
@@ -0,0 +1,124 @@
+import pytest
+from algorithms import ALGORITHMS, FCFS, RoundRobin
+from models.process import Process
+
+def zero_work_processes():
+    return [Process(1, 0, 0), Process(2, 0, 2), Process(3, 5, 0)]
+
+def test_zero_work_processes_complete():
+    scheduler = FCFS()
+    scheduler.add_processes(zero_work_processes())
+    metrics = scheduler.run()
+    assert scheduler.is_complete()
+    assert [p.pid for p in scheduler.completed_processes] == [1, 2, 3]
+    assert [p.completion_time for p in scheduler.completed_processes] == [0, 2, 5]
+    assert list(scheduler.gantt_chart) == [(2, 0.0, 2.0)]
+    assert metrics["avg_waiting_time"] == 0
+
+def test_zero_work_processes_complete_under_every_policy():
+    for name, policy in ALGORITHMS.items():
+        scheduler = policy()
+        scheduler.add_processes(zero_work_processes())
+        scheduler.run()
+        assert scheduler.is_complete(), name
+        assert len(scheduler.completed_processes) == 3, name
+
+def test_step_finishes_zero_work_processes():
+    scheduler = RoundRobin(time_quantum=1)
+    scheduler.add_processes(zero_work_processes())
+    for _ in range(100):
+        if scheduler.is_complete():
+            break
+        scheduler.step(1.0)
+    assert scheduler.is_complete()
+    assert scheduler.current_time == 5
+
+def textbook_processes():
+    # (pid, arrival, burst, priority): the classic four-process exercise
+    return [Process(1, 0, 8, 3), Process(2, 1, 4, 4), Process(3, 2, 9, 1), Process(4, 3, 5, 2)]
+
+def simulate(name, processes, **kwargs):
+    scheduler = ALGORITHMS[name](**kwargs)
+    scheduler.add_processes(processes)
+    metrics = scheduler.run()
+    gantt = [(pid, round(start, 9), round(end, 9)) for pid, start, end in scheduler.gantt_chart]
+    return scheduler, gantt, metrics
+
+def check_metrics(metrics, **expected):
+    for name, value in expected.items():
+        assert metrics[name] == pytest.approx(value), name
+
+TEXTBOOK_CASES = {
+    "FCFS": ({}, [(1, 0, 8), (2, 8, 12), (3, 12, 21), (4, 21, 26)],
+             dict(avg_waiting_time=35 / 4, avg_turnaround_time=61 / 4, avg_response_time=35 / 4,
+                  context_switches=3, preemptions=0)),
+    "SJF": ({}, [(1, 0, 8), (2, 8, 12), (4, 12, 17), (3, 17, 26)],
+            dict(avg_waiting_time=31 / 4, avg_turnaround_time=57 / 4, avg_response_time=31 / 4,
+                 context_switches=3, preemptions=0)),
+    "SJF (Preemptive)": ({}, [(1, 0, 1), (2, 1, 5), (4, 5, 10), (1, 10, 17), (3, 17, 26)],
+                         dict(avg_waiting_time=26 / 4, avg_turnaround_time=52 / 4, avg_response_time=17 / 4,
+                              context_switches=4, preemptions=1)),
+    "Priority": ({}, [(1, 0, 8), (3, 8, 17), (4, 17, 22), (2, 22, 26)],
+                 dict(avg_waiting_time=41 / 4, avg_turnaround_time=67 / 4, avg_response_time=41 / 4,
+                      context_switches=3, preemptions=0)),
+    "Priority (Preemptive)": ({}, [(1, 0, 2), (3, 2, 11), (4, 11, 16), (1, 16, 22), (2, 22, 26)],
+                              dict(avg_waiting_time=43 / 4, avg_turnaround_time=69 / 4, avg_response_time=29 / 4,
+                                   context_switches=4, preemptions=1)),
+    "Round Robin": ({"time_quantum": 4},
+                    [(1, 0, 4), (2, 4, 8), (3, 8, 12), (4, 12, 16), (1, 16, 20), (3, 20, 24), (4, 24, 25), (3, 25, 26)],
+                    dict(avg_waiting_time=47 / 4, avg_turnaround_time=73 / 4, avg_response_time=18 / 4,
+                         context_switches=7, preemptions=4)),
+}
+
+@pytest.mark.parametrize("name", TEXTBOOK_CASES)
+def test_textbook_example(name):
+    kwargs, expected_gantt, expected_metrics = TEXTBOOK_CASES[name]
+    scheduler, gantt, metrics = simulate(name, textbook_processes(), **kwargs)
+    assert gantt == expected_gantt
+    # Every process runs at nominal speed and the CPU is never idle
+    check_metrics(metrics, total_energy_consumption=26, throughput=4 / 26, cpu_utilization=100,
+                  deadline_misses=0, **expected_metrics)
+
+def test_dvfs_follows_the_backlog_and_the_deadline():
+    processes = [Process(1, 0, 1.2), Process(2, 0, 0.8), Process(3, 0, 1.6, deadline=6)]
+    scheduler, gantt, metrics = simulate("DVFS", processes)
+    # Two, then one process waiting call for 0.5 and 0.25 of full speed;
+    # the last one runs just fast enough for its deadline
+    assert gantt == [(1, 0, 2), (2, 2, 4), (3, 4, 6)]
+    assert [(p.voltage, p.frequency) for p in processes] == [(0.8, 0.6), (0.7, 0.4), (0.9, 0.8)]
+    check_metrics(metrics, total_energy_consumption=0.64 * 0.6 * 2 + 0.49 * 0.4 * 2 + 0.81 * 0.8 * 2,
+                  avg_waiting_time=8.4 / 3, avg_response_time=2, cpu_utilization=60, deadline_misses=0)
+
+def test_dpm_sleeps_after_the_threshold_and_pays_to_wake_up():
+    processes = [Process(1, 0, 2), Process(2, 5, 1), Process(3, 7.5, 1)]
+    scheduler, gantt, metrics = simulate("DPM", processes)
+    # Idle 2-4 awake, 4-5 asleep, wake-up latency 5-5.5; idle 6.5-7.5 is below the threshold
+    assert gantt == [(1, 0, 2), (2, 5.5, 6.5), (3, 7.5, 8.5)]
+    assert scheduler.sleep_transitions == 1
+    check_metrics(metrics, total_energy_consumption=4 + 2 * 0.3 + 1 * 0.05 + 0.2 + 1 * 0.3,
+                  avg_waiting_time=0.5 / 3, avg_response_time=0.5 / 3, context_switches=2)
+
+def test_grr_quantum_follows_the_mean_remaining_work():
+    processes = [Process(1, 0, 6), Process(2, 0, 2)]
+    scheduler, gantt, metrics = simulate("GRR", processes)
+    # Both run at 0.4: quanta of min(8, 4 / 0.4), 2.4 / 0.4 and 2.8 / 0.4
+    assert gantt == [(1, 0, 8), (2, 8, 13), (1, 13, 20)]
+    check_metrics(metrics, total_energy_consumption=0.49 * 0.4 * 20, avg_waiting_time=25 / 2,
+                  avg_response_time=4, context_switches=2, preemptions=1)
+
+def test_ea_edf_preempts_for_earlier_deadlines():
+    processes = [Process(1, 0, 4, deadline=20), Process(2, 1, 1, deadline=4), Process(3, 2, 2)]
+    scheduler, gantt, metrics = simulate("EA-EDF", processes)
+    # P2's deadline preempts P1; P3 has none and runs last. Slack allows 0.4 throughout
+    assert gantt == [(1, 0, 1), (2, 1, 3.5), (1, 3.5, 12.5), (3, 12.5, 17.5)]
+    check_metrics(metrics, total_energy_consumption=0.49 * 0.4 * 17.5, avg_waiting_time=23.5 / 3,
+                  avg_response_time=10.5 / 3, preemptions=1, context_switches=3, deadline_misses=0)
+
+def test_yds_runs_the_critical_interval_at_its_density():
+    processes = [Process(1, 0, 4, deadline=10), Process(2, 2, 3, deadline=5)]
+    scheduler, gantt, metrics = simulate("YDS", processes)
+    # [2, 5] is critical at speed 1; P1 then has 4 units of work in 7 and runs at 0.6
+    assert scheduler.plan == {1: (0.8, 0.6), 2: (1.0, 1.0)}
+    assert gantt == [(1, 0, 2), (2, 2, 5), (1, 5, round(5 + 2.8 / 0.6, 9))]
+    check_metrics(metrics, total_energy_consumption=0.64 * 0.6 * 4 / 0.6 + 3, avg_waiting_time=(5 + 2.8 / 0.6 - 4) / 2,
+                  avg_response_time=0, preemptions=1, context_switches=2, deadline_misses=0)
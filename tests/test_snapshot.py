@@ -0,0 +1,67 @@
+import time
+import pytest
+from algorithms import ALGORITHMS, get_algorithm
+from models.multicore import MultiCoreScheduler, big_little
+from models.process import Process
+from models.scheduler import Scheduler
+from utils.generator import WorkloadSpec, generate_table
+
+def make(name):
+    if name == "multicore":
+        scheduler = MultiCoreScheduler(big_little(2, 2), get_algorithm("SJF (Preemptive)"))
+    else:
+        scheduler = ALGORITHMS[name](context_switch_time=0.1)
+    scheduler.add_table(generate_table(WorkloadSpec(2000, seed=1, priorities=(1.0,) * 8)))
+    return scheduler
+
+@pytest.mark.parametrize("name", [*ALGORITHMS, "multicore"])
+def test_snapshot_and_fork_continue_like_an_uninterrupted_run(name, tmp_path):
+    uninterrupted = make(name)
+    expected = uninterrupted.run()
+
+    scheduler = make(name)
+    scheduler.run_until(uninterrupted.current_time / 3)
+    path = str(tmp_path / "run.ckpt")
+    scheduler.save(path)
+    resumed = [Scheduler.restore(scheduler.snapshot()), Scheduler.load(path), scheduler.fork(), scheduler]
+    for run in resumed:
+        assert run.run() == expected
+        assert list(run.gantt_chart) == list(uninterrupted.gantt_chart)
+        assert run.current_time == uninterrupted.current_time
+
+def test_fork_does_not_disturb_its_parent():
+    expected = make("Round Robin").run()
+    scheduler = make("Round Robin")
+    scheduler.run_until(300)
+    fork = scheduler.fork(get_algorithm("SJF"))
+    fork.run()
+    assert fork.is_complete()
+    assert scheduler.run() == expected
+
+def test_snapshot_rejects_unpicklable_sources():
+    scheduler = ALGORITHMS["FCFS"]()
+    scheduler.add_source(process for process in [Process(1, 0, 1)])
+    with pytest.raises(TypeError, match="picklable"):
+        scheduler.snapshot()
+
+@pytest.mark.parametrize("feed", ["processes", "table"])
+def test_fork_is_cheaper_than_replaying_the_prefix(feed):
+    table = generate_table(WorkloadSpec(30000, seed=1))
+    processes = table.to_processes()
+    scheduler = ALGORITHMS["SJF"]()
+    if feed == "table":
+        scheduler.add_table(table)
+    else:
+        scheduler.add_processes(processes)
+    start = time.perf_counter()
+    scheduler.run_until(processes[len(processes) // 2].arrival_time)
+    prefix = time.perf_counter() - start
+    start = time.perf_counter()
+    fork = scheduler.fork()
+    assert time.perf_counter() - start < prefix
+
+    # Shared pending processes and tables are copied before either side changes them
+    assert fork.run() == scheduler.run()
+    assert list(fork.gantt_chart) == list(scheduler.gantt_chart)
+    for run in (scheduler, fork):
+        assert all(process.is_completed for process in run.processes)
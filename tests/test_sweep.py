@@ -0,0 +1,58 @@
+import os
+import numpy as np
+import pandas as pd
+from utils.generator import WorkloadSpec, generate_table
+from utils.sweep import _task_id, _workload_names, build_tasks, sweep
+
+def workload(seed):
+    return generate_table(WorkloadSpec(200, seed=seed)).to_workload()
+
+def result_files(out_dir):
+    directory = os.path.join(out_dir, "results")
+    return {name: open(os.path.join(directory, name), "rb").read() for name in os.listdir(directory)}
+
+def test_round_robin_records_the_quantum_it_runs_with():
+    tasks = build_tasks(["Round Robin", "FCFS"], {"w": "w.bin"}, quanta=[None, 4.0])
+    assert [(task["algorithm"], task["quantum"]) for task in tasks] == [
+        ("Round Robin", 2.0), ("Round Robin", 4.0), ("FCFS", None)]
+
+def test_traces_with_the_same_name_in_different_directories_stay_apart(tmp_path):
+    paths = []
+    for directory, seed in (("a", 1), ("b", 2)):
+        os.makedirs(tmp_path / directory)
+        path = str(tmp_path / directory / "trace.csv")
+        pd.DataFrame(workload(seed)).to_csv(path, index=False)
+        paths.append(path)
+    names = _workload_names(paths + [paths[0]])
+    assert len(names) == 2 and all(name.startswith("trace-") for name in names)
+
+    # Even under the same workload name, tasks are keyed by the full path of their trace
+    tasks = [build_tasks(["FCFS"], {"trace": path})[0] for path in paths]
+    assert _task_id(tasks[0]) != _task_id(tasks[1])
+
+    results = sweep(["FCFS"], names, out_dir=str(tmp_path / "sweep"), max_workers=1)
+    assert sorted(results["workload"]) == sorted(names)
+    assert results["avg_waiting_time"].nunique() == 2
+
+def test_sweep_resumes_after_a_partial_run(tmp_path):
+    out_dir = str(tmp_path / "sweep")
+    args = (["FCFS", "Round Robin", "DVFS"], {"one": workload(1), "two": workload(2)},
+            [(1.0, 1.0), (0.8, 0.6)], [None, 4.0])
+    first = sweep(*args, out_dir=out_dir, max_workers=2)
+    assert len(first) == 2 * (2 + 2 * 2 + 1)  # DVFS picks its own speed and has no quantum
+    saved = result_files(out_dir)
+    assert len(saved) == len(first)
+
+    # Lose half of the results, as if the sweep had been interrupted
+    lost = sorted(saved)[::2]
+    for name in lost:
+        os.remove(os.path.join(out_dir, "results", name))
+    resumed = sweep(*args, out_dir=out_dir, max_workers=2)
+
+    now = result_files(out_dir)
+    assert sorted(now) == sorted(saved)
+    # Finished tasks are reused as they are: a rerun would change their wall_time
+    assert all(now[name] == saved[name] for name in saved if name not in lost)
+    columns = [column for column in first.columns if column != "wall_time"]
+    pd.testing.assert_frame_equal(resumed[columns], first[columns])
+    assert not np.isnan(resumed.loc[resumed["algorithm"] == "Round Robin", "quantum"]).any()
@@ -0,0 +1,108 @@
+import math
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from algorithms import ALGORITHMS
+from models.batch import WORKLOAD_DTYPE
+from utils.cli import CSVProcessReader
+from utils.workload import BinaryWorkload, CSVWorkload, ParquetWorkload, load_workload, write_binary
+
+MINIMAL = pd.DataFrame({"arrival_time": [0.0, 1.5, 4.0], "burst_time": [2.0, 0.25, 3.0]})
+
+def write_csv(path, frame):
+    frame.to_csv(path, index=False)
+
+def write_parquet(path, frame):
+    pytest.importorskip("pyarrow")
+    frame.to_parquet(path, index=False)
+
+# Reader class, file extension and writer for each tabular format
+TABULAR = {
+    "csv": (CSVProcessReader, ".csv", write_csv),
+    "pandas-csv": (lambda path: CSVWorkload(path, chunk_size=2), ".csv", write_csv),
+    "parquet": (lambda path: ParquetWorkload(path, chunk_size=2), ".parquet", write_parquet),
+}
+
+def open_trace(fmt, tmp_path, frame):
+    reader, extension, write = TABULAR[fmt]
+    path = str(tmp_path / f"trace{extension}")
+    write(path, frame)
+    return reader(path)
+
+def fields(process):
+    return (process.pid, process.arrival_time, process.burst_time, process.priority,
+            process.deadline, process.voltage, process.frequency)
+
+@pytest.mark.parametrize("fmt", TABULAR)
+def test_optional_columns_take_their_defaults(fmt, tmp_path):
+    processes = list(open_trace(fmt, tmp_path, MINIMAL))
+    assert [fields(p) for p in processes] == [
+        (1, 0.0, 2.0, 0, None, 1.0, 1.0),
+        (2, 1.5, 0.25, 0, None, 1.0, 1.0),
+        (3, 4.0, 3.0, 0, None, 1.0, 1.0),
+    ]
+
+@pytest.mark.parametrize("fmt", TABULAR)
+def test_every_column_is_read(fmt, tmp_path):
+    frame = MINIMAL.assign(pid=[7, 8, 9], priority=[2, 0, 1], deadline=[5.0, math.nan, 9.5],
+                           voltage=[0.8, 1.0, 0.7], frequency=[0.6, 1.0, 0.4])
+    processes = list(open_trace(fmt, tmp_path, frame))
+    assert [fields(p) for p in processes] == [
+        (7, 0.0, 2.0, 2, 5.0, 0.8, 0.6),
+        (8, 1.5, 0.25, 0, None, 1.0, 1.0),
+        (9, 4.0, 3.0, 1, 9.5, 0.7, 0.4),
+    ]
+
+@pytest.mark.parametrize("fmt", TABULAR)
+def test_missing_required_column_is_an_error(fmt, tmp_path):
+    reader = open_trace(fmt, tmp_path, MINIMAL.drop(columns="burst_time"))
+    with pytest.raises(ValueError, match="missing required column.*burst_time"):
+        next(reader)
+
+def test_malformed_csv_row_is_reported_with_its_number(tmp_path):
+    path = tmp_path / "trace.csv"
+    path.write_text("arrival_time,burst_time\n0,1\n1,fast\n")
+    reader = CSVProcessReader(str(path))
+    assert next(reader).pid == 1
+    with pytest.raises(ValueError, match="row 2"):
+        next(reader)
+    with pytest.raises(ValueError):
+        list(CSVWorkload(str(path)))
+
+def test_binary_trace_round_trips_and_rejects_other_files(tmp_path):
+    workload = np.zeros(3, dtype=WORKLOAD_DTYPE)
+    workload["pid"] = [1, 2, 3]
+    workload["arrival_time"] = MINIMAL["arrival_time"]
+    workload["burst_time"] = MINIMAL["burst_time"]
+    workload["deadline"] = [5.0, math.nan, 9.5]
+    workload["voltage"] = workload["frequency"] = 1.0
+    path = str(tmp_path / "trace.bin")
+    assert write_binary(path, workload) == 3
+    reader = load_workload(path, chunk_size=2)
+    assert isinstance(reader, BinaryWorkload) and len(reader) == 3
+    assert [(p.pid, p.arrival_time, p.deadline) for p in reader] == [(1, 0.0, 5.0), (2, 1.5, None), (3, 4.0, 9.5)]
+
+    path = tmp_path / "not-a-trace.bin"
+    path.write_bytes(b"arrival_time,burst_time\n")
+    with pytest.raises(ValueError, match="not a binary workload"):
+        list(BinaryWorkload(str(path)))
+
+@pytest.mark.parametrize("fmt", TABULAR)
+def test_unsorted_trace_is_rejected_by_the_scheduler(fmt, tmp_path):
+    frame = pd.DataFrame({"arrival_time": [0.0, 3.0, 1.0], "burst_time": [1.0, 1.0, 1.0]})
+    scheduler = ALGORITHMS["FCFS"]()
+    scheduler.add_source(open_trace(fmt, tmp_path, frame))
+    with pytest.raises(ValueError, match=r"not sorted by arrival time \(PID 3\)"):
+        scheduler.run()
+
+@pytest.mark.parametrize("fmt", TABULAR)
+def test_reader_resumes_from_a_pickle_mid_file(fmt, tmp_path):
+    frame = pd.DataFrame({"arrival_time": np.arange(7.0), "burst_time": np.ones(7)})
+    reader = open_trace(fmt, tmp_path, frame)
+    assert [next(reader).pid for _ in range(3)] == [1, 2, 3]  # Stops inside the second chunk
+    resumed = pickle.loads(pickle.dumps(reader))
+    assert resumed.position == 3
+    assert [p.pid for p in resumed] == [4, 5, 6, 7]
+    # The original is unaffected by the copy
+    assert [p.pid for p in reader] == [4, 5, 6, 7]
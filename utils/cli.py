@@ -0,0 +1,219 @@
+"""
+Headless command-line runner.
+
+    python -m utils.cli list
+    python -m utils.cli run SJF trace.csv --param context_switch_time=0.1 --gantt gantt.csv
+    python -m utils.cli run EA-EDF trace.csv --checkpoint run.ckpt --checkpoint-every 1000 --resume
+
+Runs a named algorithm on a workload file and writes the metrics as JSON
+(default) or CSV. Only the standard library and the simulation packages are
+imported up front: CSV traces are parsed with the csv module, and NumPy is
+loaded only for Parquet and binary traces. Nothing here touches tkinter or
+matplotlib.
+
+With --checkpoint the scheduler state is saved every --checkpoint-every
+units of simulated time, and --resume continues from the saved state after
+a crash instead of simulating the prefix again. --profile FILE times the
+engine phases, prints them to stderr and writes a Chrome trace (.json) or
+folded stacks for flame graphs (any other extension).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional
+from algorithms import algorithm_names, create_scheduler
+from models.process import Process
+from models.scheduler import Scheduler
+from utils.columns import COLUMN_DEFAULTS, check_columns
+
+class CSVProcessReader:
+    """Stream Process objects from a CSV trace without NumPy or pandas.
+
+    Columns and defaults are those of utils.workload.CSVWorkload; a missing
+    column or a malformed value raises ValueError naming the row. The
+    reader pickles as its path and position, so it can be checkpointed
+    with the scheduler and reopened where it stopped.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.fspath(path)
+        self.position = 0  # Rows already yielded
+        self._file = None
+        self._rows = None
+
+    def __iter__(self) -> "CSVProcessReader":
+        return self
+
+    def _open(self):
+        self._file = open(self.path, newline="")
+        self._rows = csv.DictReader(self._file)
+        try:
+            check_columns(self._rows.fieldnames or ())
+        except ValueError as exc:
+            self._file.close()
+            raise ValueError(f"{self.path}: {exc}") from None
+        for _ in range(self.position):
+            next(self._rows, None)
+
+    def __next__(self) -> Process:
+        if self._rows is None:
+            self._open()
+        try:
+            row = next(self._rows)
+        except StopIteration:
+            # Stay exhausted: the closed DictReader must not be read again
+            self._file.close()
+            self._rows = iter(())
+            raise
+        self.position += 1
+        try:
+            return self._to_process(row)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{self.path}, row {self.position}: {exc}") from None
+
+    def _to_process(self, row: dict) -> Process:
+        def value(name: str) -> float:
+            text = row.get(name)
+            return float(text) if text not in (None, "") else COLUMN_DEFAULTS[name]
+
+        pid = row.get("pid")
+        deadline = value("deadline")
+        process = Process(
+            int(pid) if pid not in (None, "") else self.position,
+            float(row["arrival_time"]),
+            float(row["burst_time"]),
+            int(value("priority")),
+            None if deadline != deadline else deadline,
+        )
+        process.set_dvfs_parameters(value("voltage"), value("frequency"))
+        return process
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(_file=None, _rows=None)
+        return state
+
+def read_csv_processes(path: str) -> Iterator[Process]:
+    """Stream Process objects from a CSV trace without NumPy or pandas"""
+    return CSVProcessReader(path)
+
+def open_workload(path: str) -> Iterable[Process]:
+    """Return a lazy process stream for any supported trace format"""
+    if path.lower().endswith(".csv"):
+        return read_csv_processes(path)
+    from utils.workload import load_workload
+    return load_workload(path)
+
+def _parse_param(text: str) -> tuple:
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+def _write_rows(stream, rows: List[dict], fmt: str):
+    if fmt == "json":
+        json.dump(rows if len(rows) != 1 else rows[0], stream, indent=2)
+        stream.write("\n")
+    else:
+        writer = csv.DictWriter(stream, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _write_gantt(path: str, segments: Iterable[tuple]):
+    fmt = "json" if path.lower().endswith(".json") else "csv"
+    with open(path, "w", newline="") as f:
+        if fmt == "json":
+            json.dump([{"pid": pid, "start_time": start, "end_time": end} for pid, start, end in segments], f)
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["pid", "start_time", "end_time"])
+            writer.writerows(segments)
+
+def run(args) -> int:
+    until = float('inf') if args.until is None else args.until
+    if args.resume and args.checkpoint and os.path.exists(args.checkpoint):
+        scheduler = Scheduler.load(args.checkpoint)
+    else:
+        params = dict(args.param)
+        params.setdefault("keep_completed", False)
+        try:
+            scheduler = create_scheduler(args.algorithm, **params)
+        except TypeError as exc:
+            raise ValueError(f"Invalid --param for {args.algorithm}: {exc}") from None
+        scheduler.add_source(open_workload(args.workload))
+    profiler = None
+    if args.profile:
+        from utils.profiling import Profiler
+        profiler = Profiler(scheduler, trace=args.profile.lower().endswith(".json")).attach()
+    if args.checkpoint:
+        while scheduler.current_time < until and not scheduler.is_complete():
+            scheduler.run_until(min(until, scheduler.current_time + args.checkpoint_every))
+            scheduler.save(args.checkpoint)
+    else:
+        scheduler.run_until(until)
+    if profiler is not None:
+        profiler.detach()
+        if args.profile.lower().endswith(".json"):
+            profiler.write_chrome_trace(args.profile)
+        else:
+            profiler.write_folded(args.profile)
+        print(profiler.format_report(), file=sys.stderr)
+    metrics = scheduler.get_metrics()
+
+    row = {"algorithm": args.algorithm, "workload": os.path.basename(args.workload),
+           "completed": scheduler.metrics.count, "end_time": scheduler.current_time}
+    row.update(metrics)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            _write_rows(f, [row], args.format)
+    else:
+        _write_rows(sys.stdout, [row], args.format)
+    if args.gantt:
+        chart = scheduler.gantt_chart
+        _write_gantt(args.gantt, chart if args.gantt_window is None else chart.between(*args.gantt_window))
+    return 0
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.cli",
+                                     description="Run CPU scheduling simulations without the GUI")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list the available algorithms")
+
+    run_parser = commands.add_parser("run", help="simulate one algorithm on a workload file")
+    run_parser.add_argument("algorithm", help="algorithm name, e.g. FCFS or 'Round Robin'")
+    run_parser.add_argument("workload", help="trace file (.csv, .parquet, .bin)")
+    run_parser.add_argument("--param", action="append", type=_parse_param, default=[],
+                            metavar="NAME=VALUE", help="scheduler argument, e.g. time_quantum=4")
+    run_parser.add_argument("--until", type=float, default=None, help="stop at this simulated time")
+    run_parser.add_argument("--format", choices=("json", "csv"), default="json", help="metrics format")
+    run_parser.add_argument("-o", "--output", help="metrics file (default: stdout)")
+    run_parser.add_argument("--gantt", metavar="FILE", help="write Gantt segments to FILE (.csv or .json)")
+    run_parser.add_argument("--gantt-window", type=float, nargs=2, metavar=("START", "END"),
+                            help="write only the Gantt segments overlapping [START, END)")
+    run_parser.add_argument("--profile", metavar="FILE",
+                            help="profile the run; write a Chrome trace (.json) or folded stacks to FILE")
+    run_parser.add_argument("--checkpoint", metavar="FILE", help="save the simulation state to FILE as it runs")
+    run_parser.add_argument("--checkpoint-every", type=float, default=1000.0, metavar="T",
+                            help="simulated time between checkpoints (default: 1000)")
+    run_parser.add_argument("--resume", action="store_true",
+                            help="continue from the --checkpoint file if it exists")
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.checkpoint_every <= 0:
+        parser.error("--checkpoint-every must be positive")
+
+    if args.command == "list":
+        print("\n".join(algorithm_names()))
+        return 0
+    try:
+        return run(args)
+    except (OSError, ValueError) as exc:
+        # Unreadable or malformed input, unknown algorithms and bad parameters
+        run_parser.error(str(exc))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""
+Columns of workload traces, shared by the readers of utils.workload and the
+NumPy-free CSV reader of utils.cli.
+
+Columns are named after the Process fields. Only arrival_time and
+burst_time are required; pid defaults to the row number (from 1) and the
+other columns to COLUMN_DEFAULTS.
+"""
+from typing import Iterable
+
+REQUIRED_COLUMNS = ("arrival_time", "burst_time")
+COLUMN_DEFAULTS = {"priority": 0, "deadline": float("nan"), "voltage": 1.0, "frequency": 1.0}
+
+def check_columns(names: Iterable[str]):
+    """Raise ValueError if a required column is missing"""
+    names = set(names)
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"Workload is missing required column(s): {', '.join(missing)}")
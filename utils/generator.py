@@ -0,0 +1,306 @@
+"""
+Vectorized, reproducible synthetic workloads.
+
+    python -m utils.generator web --size 1e6 --seed 7 --out web.bin
+    python -m utils.generator list
+
+A WorkloadSpec describes the arrival process, the distribution of burst
+times, the mix of priorities and the deadline slack. Rows are drawn with
+NumPy in fixed blocks of BLOCK_SIZE rows, each from its own seed derived
+from (seed, block number), so the same spec always produces the same
+workload however it is consumed: chunk_size only changes how rows are
+grouped, never their values. Memory stays bounded by one block plus one
+chunk whatever the size of the workload.
+
+Arrivals:
+- poisson: exponential gaps at the rate that gives the requested load.
+- uniform: gaps uniform between 0 and twice the mean gap, a steadier
+  stream at the same rate.
+- bursty: batches of simultaneous arrivals, of geometric size with mean
+  batch_size, at the same mean rate.
+- diurnal: a Poisson process whose rate follows a sinusoid of the given
+  period and relative amplitude, by inverting the integrated rate.
+
+Burst times are exponential, lognormal or Pareto (heavy-tailed) with the
+requested mean, never below min_burst. The shape parameter is the
+lognormal sigma or the Pareto alpha.
+
+Output is a WORKLOAD_DTYPE array stream (generate), a ProcessTable
+(generate_table), a picklable Process stream for Scheduler.add_source()
+(SyntheticWorkload), or a binary, CSV or Parquet trace file (write_workload).
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+import numpy as np
+from models.batch import WORKLOAD_DTYPE
+from models.process_table import ProcessTable
+from utils.workload import WorkloadReader, write_binary
+
+BLOCK_SIZE = 65536  # Rows drawn from one seed; fixed so output never depends on chunking
+ARRIVALS = ("poisson", "uniform", "bursty", "diurnal")
+BURSTS = ("exponential", "lognormal", "pareto")
+_DEFAULT_SHAPES = {"exponential": None, "lognormal": 1.0, "pareto": 1.5}
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    size: int
+    seed: int = 0
+    arrivals: str = "poisson"
+    load: float = 0.9  # Offered load per core: mean burst time * arrival rate / cores
+    cores: int = 1
+    batch_size: float = 16.0  # Mean batch size of bursty arrivals
+    period: float = 1440.0  # Period of diurnal arrivals
+    amplitude: float = 0.8  # Relative swing of the diurnal arrival rate, below 1
+    burst: str = "exponential"
+    mean_burst: float = 4.0
+    burst_shape: Optional[float] = None  # Lognormal sigma or Pareto alpha
+    min_burst: float = 0.1
+    priorities: Tuple[float, ...] = (1.0,)  # Weight of priority 0, 1, ...
+    deadline_fraction: float = 1.0  # Share of processes that have a deadline
+    slack: Tuple[float, float] = (2.0, 10.0)  # Deadline = arrival + burst * uniform(*slack)
+
+    def __post_init__(self):
+        if self.size < 0:
+            raise ValueError("size must not be negative")
+        if self.arrivals not in ARRIVALS:
+            raise ValueError(f"Unknown arrivals {self.arrivals!r}; choose from {', '.join(ARRIVALS)}")
+        if self.burst not in BURSTS:
+            raise ValueError(f"Unknown burst distribution {self.burst!r}; choose from {', '.join(BURSTS)}")
+        if self.load <= 0 or self.cores < 1 or self.mean_burst <= 0:
+            raise ValueError("load, cores and mean_burst must be positive")
+        if not 0 < self.min_burst < self.mean_burst:
+            raise ValueError("min_burst must be positive and below mean_burst")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if not 0 <= self.amplitude < 1 or self.period <= 0:
+            raise ValueError("amplitude must be in [0, 1) and period positive")
+        if self.burst == "pareto" and self.shape <= 1:
+            raise ValueError("Pareto bursts need alpha > 1 for a finite mean")
+        if not self.priorities or min(self.priorities) < 0 or sum(self.priorities) <= 0:
+            raise ValueError("priorities must be non-negative weights with a positive sum")
+        if not 0 <= self.deadline_fraction <= 1:
+            raise ValueError("deadline_fraction must be in [0, 1]")
+        if not 0 < self.slack[0] <= self.slack[1]:
+            raise ValueError("slack must satisfy 0 < low <= high")
+
+    @property
+    def shape(self) -> Optional[float]:
+        return _DEFAULT_SHAPES[self.burst] if self.burst_shape is None else self.burst_shape
+
+    @property
+    def rate(self) -> float:
+        """Mean arrivals per unit of time"""
+        return self.load * self.cores / self.mean_burst
+
+# Shapes loosely modelled on published datacenter traces. Priority 0 is the
+# most important, as in the Priority policies.
+PRESETS: Dict[str, dict] = {
+    # Interactive requests: a daily cycle, short lognormal service times,
+    # tight deadlines on every request
+    "web": dict(arrivals="diurnal", burst="lognormal", mean_burst=0.5, burst_shape=1.0,
+                min_burst=0.01, priorities=(0.9, 0.1), slack=(1.5, 4.0)),
+    # Batch analytics: job arrays arriving together, heavy-tailed run times,
+    # few deadlines and loose ones
+    "batch": dict(arrivals="bursty", batch_size=32.0, burst="pareto", mean_burst=20.0,
+                  burst_shape=1.3, min_burst=1.0, priorities=(0.05, 0.25, 0.7),
+                  deadline_fraction=0.2, slack=(5.0, 50.0)),
+    # Shared cluster: production, batch and best-effort tiers, bursty arrivals
+    # and lognormal run times spanning several orders of magnitude
+    "cluster": dict(arrivals="bursty", batch_size=8.0, burst="lognormal", mean_burst=8.0,
+                    burst_shape=2.0, min_burst=0.05, priorities=(0.15, 0.35, 0.5),
+                    deadline_fraction=0.5, slack=(2.0, 20.0)),
+    # HPC queue: independent long jobs, heavy tails, no priorities
+    "hpc": dict(arrivals="poisson", burst="pareto", mean_burst=100.0, burst_shape=1.8,
+                min_burst=5.0, deadline_fraction=0.0),
+}
+
+def preset(name: str, size: int, seed: int = 0, **overrides) -> WorkloadSpec:
+    """Return the spec of a preset, with fields overridden by keyword"""
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset {name!r}; choose from {', '.join(PRESETS)}")
+    return WorkloadSpec(size=size, seed=seed, **{**PRESETS[name], **overrides})
+
+def _block_rng(spec: WorkloadSpec, block: int) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(spec.seed, spawn_key=(block,)))
+
+def _gaps(spec: WorkloadSpec, rng: np.random.Generator, n: int) -> np.ndarray:
+    """Inter-arrival gaps at unit rate per process (rate applied by the caller)"""
+    if spec.arrivals == "bursty":
+        # Each row starts a new batch with probability 1 / batch_size
+        starts = rng.random(n) < 1 / spec.batch_size
+        return np.where(starts, rng.exponential(spec.batch_size, n), 0.0)
+    if spec.arrivals == "uniform":
+        return rng.uniform(0.0, 2.0, n)
+    return rng.exponential(1.0, n)
+
+def _warp_diurnal(spec: WorkloadSpec, operational: np.ndarray) -> np.ndarray:
+    """Map unit-rate arrival times onto a sinusoidal rate by solving Lambda(t) = s.
+
+    Lambda(t) = rate * (t - A * P / (2 pi) * sin(2 pi t / P)) is increasing
+    for A < 1, so Newton's method from t = s / rate converges quickly.
+    """
+    amplitude = spec.amplitude
+    omega = 2 * math.pi / spec.period
+    target = operational / spec.rate
+    tolerance = 1e-12 * max(float(target[-1]), spec.period)
+    t = target.copy()
+    for _ in range(100):
+        error = t - amplitude / omega * np.sin(omega * t) - target
+        t -= error / (1 - amplitude * np.cos(omega * t))
+        if np.max(np.abs(error)) <= tolerance:
+            break
+    return t
+
+def _bursts(spec: WorkloadSpec, rng: np.random.Generator, n: int) -> np.ndarray:
+    mean, shape = spec.mean_burst, spec.shape
+    if spec.burst == "exponential":
+        burst = spec.min_burst + rng.exponential(mean - spec.min_burst, n)
+    elif spec.burst == "lognormal":
+        burst = rng.lognormal(math.log(mean) - shape ** 2 / 2, shape, n)
+    else:
+        scale = mean * (shape - 1) / shape
+        burst = scale * (1 + rng.pareto(shape, n))
+    return np.maximum(burst, spec.min_burst)
+
+def _block(spec: WorkloadSpec, block: int, first_row: int, n: int, clock: float) -> Tuple[np.ndarray, float]:
+    """Draw one block of rows, continuing from the operational clock; returns the new clock"""
+    rng = _block_rng(spec, block)
+    operational = clock + np.cumsum(_gaps(spec, rng, n))
+    clock = float(operational[-1])
+    rows = np.empty(n, dtype=WORKLOAD_DTYPE)
+    rows["pid"] = np.arange(first_row + 1, first_row + n + 1)
+    if spec.arrivals == "diurnal":
+        rows["arrival_time"] = _warp_diurnal(spec, operational)
+    else:
+        rows["arrival_time"] = operational / spec.rate
+    burst = _bursts(spec, rng, n)
+    rows["burst_time"] = burst
+    weights = np.asarray(spec.priorities, dtype=float)
+    rows["priority"] = rng.choice(len(weights), n, p=weights / weights.sum())
+    deadline = rows["arrival_time"] + burst * rng.uniform(spec.slack[0], spec.slack[1], n)
+    rows["deadline"] = np.where(rng.random(n) < spec.deadline_fraction, deadline, np.nan)
+    rows["voltage"] = 1.0
+    rows["frequency"] = 1.0
+    return rows, clock
+
+def _blocks(spec: WorkloadSpec, start: int = 0) -> Iterator[np.ndarray]:
+    """Yield the workload in BLOCK_SIZE blocks, from row `start` on"""
+    clock = 0.0
+    for block, first_row in enumerate(range(0, spec.size, BLOCK_SIZE)):
+        n = min(BLOCK_SIZE, spec.size - first_row)
+        if first_row + n <= start:
+            # Skipped blocks still advance the arrival clock; only the gaps are drawn
+            clock = float((clock + np.cumsum(_gaps(spec, _block_rng(spec, block), n)))[-1])
+            continue
+        rows, clock = _block(spec, block, first_row, n, clock)
+        yield rows[max(start - first_row, 0):]
+
+def generate(spec: WorkloadSpec, chunk_size: int = 65536, start: int = 0) -> Iterator[np.ndarray]:
+    """Yield the workload as WORKLOAD_DTYPE arrays of chunk_size rows, from row `start` on"""
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    pending, held = [], 0
+    for rows in _blocks(spec, start):
+        pending.append(rows)
+        held += len(rows)
+        while held >= chunk_size:
+            joined = np.concatenate(pending) if len(pending) > 1 else pending[0]
+            yield joined[:chunk_size]
+            pending, held = [joined[chunk_size:]], held - chunk_size
+    if held:
+        yield np.concatenate(pending)
+
+def generate_table(spec: WorkloadSpec) -> ProcessTable:
+    """Generate the whole workload into a ProcessTable"""
+    table = ProcessTable(capacity=spec.size)
+    for rows in _blocks(spec):
+        table.extend(rows["arrival_time"], rows["burst_time"], rows["priority"], rows["deadline"],
+                     rows["voltage"], rows["frequency"], rows["pid"])
+    return table
+
+class SyntheticWorkload(WorkloadReader):
+    """Stream generated Process objects, like a workload file reader.
+
+    It pickles as its spec and position, so a checkpointed scheduler fed
+    from it resumes the same stream.
+    """
+
+    def __init__(self, spec: WorkloadSpec, chunk_size: int = 65536):
+        # Rows are generated rather than read; the path only labels the stream
+        super().__init__(f"<synthetic seed={spec.seed}>", chunk_size)
+        self.spec = spec
+
+    def _read_chunks(self, start: int) -> Iterator[np.ndarray]:
+        return generate(self.spec, self.chunk_size, start)
+
+    def to_table(self) -> ProcessTable:
+        return generate_table(self.spec)
+
+TRACE_FORMATS = (".bin", ".csv", ".parquet")
+
+def write_workload(path: str, spec: WorkloadSpec, chunk_size: int = 65536) -> int:
+    """Write the workload as a binary, CSV or Parquet trace, by extension; returns the rows written"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in TRACE_FORMATS:
+        raise ValueError(f"Unsupported trace format {extension!r}; use one of {', '.join(TRACE_FORMATS)}")
+    if extension == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet workloads requires pyarrow: pip install pyarrow") from None
+        count = 0
+        schema = pa.schema([(name, pa.from_numpy_dtype(WORKLOAD_DTYPE[name])) for name in WORKLOAD_DTYPE.names])
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in generate(spec, chunk_size):
+                writer.write_table(pa.table({name: chunk[name] for name in WORKLOAD_DTYPE.names}, schema=schema))
+                count += len(chunk)
+        return count
+    if extension == ".csv":
+        count = 0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(WORKLOAD_DTYPE.names)
+            for chunk in generate(spec, chunk_size):
+                columns = [chunk[name].tolist() for name in WORKLOAD_DTYPE.names]
+                # A missing deadline is an empty field
+                columns[4] = ["" if deadline != deadline else deadline for deadline in columns[4]]
+                writer.writerows(zip(*columns))
+                count += len(chunk)
+        return count
+    return write_binary(path, generate(spec, chunk_size))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.generator",
+                                     description="Generate synthetic workload traces")
+    parser.add_argument("preset", help=f"one of {', '.join(PRESETS)}, or 'list'")
+    parser.add_argument("--size", type=float, default=100000, help="number of processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load", type=float, help="offered load per core")
+    parser.add_argument("--cores", type=int, help="cores the load is offered to")
+    parser.add_argument("--out", help="trace file (.bin, .csv or .parquet)")
+    args = parser.parse_args(argv)
+
+    if args.preset == "list":
+        for name in PRESETS:
+            print(f"{name}: {preset(name, 0)}")
+        return 0
+    if not args.out:
+        parser.error("--out is required")
+    overrides = {name: value for name, value in (("load", args.load), ("cores", args.cores))
+                 if value is not None}
+    try:
+        spec = preset(args.preset, int(args.size), args.seed, **overrides)
+        rows = write_workload(args.out, spec)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(f"Wrote {rows} processes to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Running performance metrics that are O(1) to update and cheap to read.
+
+MetricsAccumulator is fed one completed process at a time. Averages use
+plain running sums, variances use Welford's method and percentiles come
+from a log-bucketed QuantileSketch with bounded relative error. Every part
+can be merged, so shards of a parallel run combine into one result.
+"""
+import math
+from bisect import bisect_right, insort
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative accuracy (DDSketch-style).
+
+    Positive values are counted in logarithmic buckets, so any quantile is
+    returned within `relative_accuracy` of the true value. Values at or
+    below `min_value` share a single zero bucket. Bucket indices are kept
+    sorted as they are created, and quantiles are cached until the next
+    add() or merge(), so repeated reads cost nothing.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self._indices: List[int] = []  # Keys of buckets, ascending
+        self._cache: Dict[float, float] = {}  # q -> quantile, until the next change
+
+    def add(self, value: float):
+        self.count += 1
+        if self._cache:
+            self._cache = {}
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        count = self.buckets.get(index)
+        if count is None:
+            insort(self._indices, index)
+            self.buckets[index] = 1
+        else:
+            self.buckets[index] = count + 1
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold another sketch with the same accuracy into this one"""
+        if other.gamma != self.gamma or other.min_value != self.min_value:
+            raise ValueError("Cannot merge sketches with different parameters")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self._indices = sorted(self.buckets)
+        self._cache = {}
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Return the value at quantile q (0 <= q <= 1), or 0 if empty"""
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """Return the values at several quantiles, from one cumulative count of the buckets"""
+        cache = self._cache
+        missing = [q for q in qs if q not in cache]
+        if missing:
+            if any(not 0 <= q <= 1 for q in missing):
+                raise ValueError("q must be between 0 and 1")
+            indices, gamma = self._indices, self.gamma
+            # seen[i] counts the values below the upper bound of bucket i - 1
+            seen = list(accumulate(map(self.buckets.__getitem__, indices), initial=self.zero_count))
+            for q in missing:
+                position = bisect_right(seen, q * (self.count - 1)) if self.count else 0
+                if position == 0:
+                    cache[q] = 0.0
+                else:
+                    cache[q] = 2 * gamma ** indices[min(position, len(indices)) - 1] / (gamma + 1)
+        return [cache[q] for q in qs]
+
+class RunningStats:
+    """Count, mean and variance via Welford's method, mergeable (Chan et al.)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats"):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """Population variance"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+class MetricsAccumulator:
+    """Per-process metrics accumulated as processes complete"""
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.count = 0
+        self.total_waiting_time = 0.0
+        self.total_turnaround_time = 0.0
+        self.total_response_time = 0.0
+        self.total_burst_time = 0.0
+        self.max_completion_time: Optional[float] = None
+        self.waiting = RunningStats()
+        self.response = RunningStats()
+        self.waiting_sketch = QuantileSketch(relative_accuracy)
+        self.response_sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, process):
+        """Record a completed process"""
+        self.count += 1
+        self.total_waiting_time += process.waiting_time
+        self.total_turnaround_time += process.turnaround_time
+        self.total_response_time += process.response_time
+        self.total_burst_time += process.burst_time
+        if self.max_completion_time is None or process.completion_time > self.max_completion_time:
+            self.max_completion_time = process.completion_time
+        self.waiting.add(process.waiting_time)
+        self.response.add(process.response_time)
+        self.waiting_sketch.add(process.waiting_time)
+        self.response_sketch.add(process.response_time)
+
+    def merge(self, other: "MetricsAccumulator"):
+        """Fold the metrics of another shard into this one"""
+        self.count += other.count
+        self.total_waiting_time += other.total_waiting_time
+        self.total_turnaround_time += other.total_turnaround_time
+        self.total_response_time += other.total_response_time
+        self.total_burst_time += other.total_burst_time
+        if other.max_completion_time is not None and (
+                self.max_completion_time is None or other.max_completion_time > self.max_completion_time):
+            self.max_completion_time = other.max_completion_time
+        self.waiting.merge(other.waiting)
+        self.response.merge(other.response)
+        self.waiting_sketch.merge(other.waiting_sketch)
+        self.response_sketch.merge(other.response_sketch)
+
+    @classmethod
+    def merged(cls, accumulators: Iterable["MetricsAccumulator"]) -> "MetricsAccumulator":
+        result = cls()
+        for accumulator in accumulators:
+            result.merge(accumulator)
+        return result
+
+    def summary(self) -> dict:
+        """Return the per-process metrics in Scheduler.get_metrics() form"""
+        if self.count == 0:
+            metrics = {
+                "avg_waiting_time": 0,
+                "avg_turnaround_time": 0,
+                "avg_response_time": 0,
+                "throughput": 0,
+                "cpu_utilization": 0,
+            }
+        else:
+            total_execution_time = self.max_completion_time
+            cpu_utilization = (self.total_burst_time / total_execution_time) * 100 if total_execution_time > 0 else 0
+            metrics = {
+                "avg_waiting_time": self.total_waiting_time / self.count,
+                "avg_turnaround_time": self.total_turnaround_time / self.count,
+                "avg_response_time": self.total_response_time / self.count,
+                "throughput": self.count / total_execution_time if total_execution_time > 0 else 0,
+                "cpu_utilization": cpu_utilization,
+            }
+        metrics["std_waiting_time"] = self.waiting.std
+        metrics["std_response_time"] = self.response.std
+        qs = [p / 100 for p in self.PERCENTILES]
+        waiting = self.waiting_sketch.quantiles(qs)
+        response = self.response_sketch.quantiles(qs)
+        for p, waiting_time, response_time in zip(self.PERCENTILES, waiting, response):
+            metrics[f"p{p}_waiting_time"] = waiting_time
+            metrics[f"p{p}_response_time"] = response_time
+        return metrics
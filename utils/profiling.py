@@ -0,0 +1,261 @@
+"""
+Opt-in profiling and tracing of a scheduler run.
+
+A Profiler wraps the engine's phase methods (dispatch, execution, Gantt
+updates, metric recording, ...) on one scheduler instance while it is
+attached. The classes themselves are never changed, so a scheduler that is
+not being profiled runs exactly the code it always did.
+
+While attached the profiler collects:
+
+- per-phase call counts, inclusive time and self time,
+- counters of arrivals, dispatches, requeues, preemptions and completions,
+- the ready queue length at every dispatch, against simulated time,
+- optionally (trace=True) one span per phase call, up to max_trace_events.
+
+Callbacks registered with on() are called for scheduling events as they
+happen. Results export as a Chrome trace (chrome://tracing or Perfetto),
+showing the profiled spans next to the simulated schedule, and as folded
+stacks for flamegraph.pl or speedscope.
+
+    profiler = Profiler(scheduler, trace=True)
+    with profiler:
+        scheduler.run()
+    profiler.write_chrome_trace("run.json")
+    profiler.write_folded("run.folded")
+"""
+import json
+from array import array
+from collections import defaultdict
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Engine methods timed by default, when the scheduler has them
+PHASES = (
+    "run_until", "admit_arrivals", "on_arrival", "_dispatch", "_dispatch_core", "next_process",
+    "_sync", "_sync_core", "execute_process", "update_gantt_chart", "_record_completion",
+    "_handle_events", "_handle_core_events", "preempt", "_preempt_core", "requeue", "rebalance",
+)
+
+# Scheduling events and the methods that signal them. The process is the
+# return value for dispatches, the running one for preemptions, and the
+# first argument otherwise
+EVENTS = {
+    "arrival": ("on_arrival",),
+    "dispatch": ("next_process",),
+    "requeue": ("requeue",),
+    "preempt": ("preempt", "_preempt_core"),
+    "completion": ("_record_completion",),
+}
+COUNTERS = {"arrival": "arrivals", "dispatch": "dispatches", "requeue": "requeues",
+            "preempt": "preemptions", "completion": "completions"}
+
+Callback = Callable[[str, float, object], None]
+
+class Profiler:
+    """Collect phase timings, counters and traces from one scheduler"""
+
+    def __init__(self, scheduler, phases: Optional[Iterable[str]] = None, trace: bool = False,
+                 max_trace_events: int = 1_000_000):
+        self.scheduler = scheduler
+        self.phases = tuple(PHASES if phases is None else phases)
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.wrapped: List[str] = []
+        self._callbacks: Dict[str, List[Callback]] = defaultdict(list)
+        self.clear()
+
+    def clear(self):
+        """Forget everything collected so far"""
+        if self.wrapped:
+            raise RuntimeError("Detach the profiler before clearing it")
+        self.stats: Dict[str, List[float]] = {}  # phase -> [calls, inclusive seconds, self seconds]
+        self.folded: Dict[Tuple[str, ...], float] = defaultdict(float)  # call stack -> self seconds
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.queue_times = array("d")  # Simulated time of each dispatch
+        self.queue_lengths = array("q")  # Ready processes at that dispatch
+        self.spans: List[tuple] = []  # (phase, start, duration) in seconds since the origin
+        self.dropped_spans = 0
+        self._stack: List[list] = []  # [call path, child seconds] per active call
+        self._origin = perf_counter()
+
+    def on(self, event: str, callback: Callback):
+        """Call callback(event, time, process) on every event of the given kind.
+
+        Events are arrival, dispatch, requeue, preempt and completion.
+        Callbacks registered while attached take effect at the next attach().
+        """
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event {event!r}; choose from {', '.join(EVENTS)}")
+        self._callbacks[event].append(callback)
+
+    # Attaching
+
+    @property
+    def attached(self) -> bool:
+        return bool(self.wrapped)
+
+    def attach(self) -> "Profiler":
+        """Start profiling: shadow the scheduler's methods with timed wrappers"""
+        if self.attached:
+            return self
+        scheduler = self.scheduler
+        if getattr(scheduler, "profiler", None) is not None:
+            raise RuntimeError("The scheduler already has a profiler attached")
+        hooks: Dict[str, List[tuple]] = defaultdict(list)
+        for event, methods in EVENTS.items():
+            for name in methods:
+                for callback in self._callbacks.get(event, ()):
+                    hooks[name].append((event, callback))
+        names = [name for name in dict.fromkeys(self.phases + tuple(hooks)) if hasattr(scheduler, name)]
+        for name in names:
+            setattr(scheduler, name, self._wrap(name, getattr(scheduler, name), hooks.get(name, ())))
+        self.wrapped = names
+        scheduler.profiler = self
+        return self
+
+    def detach(self):
+        """Stop profiling and restore the scheduler's own methods"""
+        for name in self.wrapped:
+            self.scheduler.__dict__.pop(name, None)
+        self.scheduler.__dict__.pop("profiler", None)
+        self.wrapped = []
+
+    def __enter__(self) -> "Profiler":
+        return self.attach()
+
+    def __exit__(self, *exc_info):
+        self.detach()
+
+    def _queue_length(self) -> int:
+        scheduler = self.scheduler
+        cores = getattr(scheduler, "cores", None)
+        if cores is not None:
+            return sum(len(core.ready_queue) for core in cores)
+        return len(scheduler.ready_queue)
+
+    def _wrap(self, name: str, method, hooks: Iterable[tuple]):
+        scheduler = self.scheduler
+        stack = self._stack
+        stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+        folded = self.folded
+        counters = self.counters
+        hooks = tuple(hooks)
+        event_name = next((event for event, methods in EVENTS.items() if name in methods), None)
+
+        def running(args):
+            # _preempt_core(core) preempts the core's process; preempt() the scheduler's
+            owner = args[0] if args else scheduler
+            return getattr(owner, "current_process", None)
+
+        def wrapper(*args):
+            before = running(args) if event_name == "preempt" else None
+            path = stack[-1][0] + (name,) if stack else (name,)
+            frame = [path, 0.0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                result = method(*args)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] += elapsed - frame[1]
+                folded[path] += elapsed - frame[1]
+                if stack:
+                    stack[-1][1] += elapsed
+                if self.trace:
+                    if len(self.spans) < self.max_trace_events:
+                        self.spans.append((name, start - self._origin, elapsed))
+                    else:
+                        self.dropped_spans += 1
+
+            if event_name is not None:
+                if event_name == "dispatch":
+                    process = result
+                elif event_name == "preempt":
+                    # A preempt that found the process finishing is not a preemption
+                    process = before if before is not None and not before.is_completed else None
+                else:
+                    process = args[0] if args else None
+                if process is not None:
+                    counters[COUNTERS[event_name]] += 1
+                    if event_name == "dispatch":
+                        self.queue_times.append(scheduler.current_time)
+                        self.queue_lengths.append(self._queue_length())
+                    for event, callback in hooks:
+                        callback(event, scheduler.current_time, process)
+            return result
+
+        return wrapper
+
+    # Results
+
+    def report(self) -> dict:
+        """Return phase timings, sorted by self time, and the event counters"""
+        phases = {
+            name: {"calls": int(calls), "total_time": total, "self_time": own,
+                   "mean_time": total / calls if calls else 0.0}
+            for name, (calls, total, own) in sorted(self.stats.items(), key=lambda item: -item[1][2])
+            if calls
+        }
+        counters = dict(self.counters)
+        counters["context_switches"] = self.scheduler.context_switches
+        if self.queue_lengths:
+            counters["max_queue_length"] = max(self.queue_lengths)
+            counters["mean_queue_length"] = sum(self.queue_lengths) / len(self.queue_lengths)
+        return {"phases": phases, "counters": counters}
+
+    def format_report(self) -> str:
+        """Return the phase timings as a text table"""
+        lines = [f"{'phase':<22}{'calls':>12}{'total s':>12}{'self s':>12}{'mean us':>12}"]
+        for name, row in self.report()["phases"].items():
+            lines.append(f"{name:<22}{row['calls']:>12}{row['total_time']:>12.4f}"
+                         f"{row['self_time']:>12.4f}{row['mean_time'] * 1e6:>12.2f}")
+        return "\n".join(lines)
+
+    def write_folded(self, path: str):
+        """Write self time per call stack in the folded format of flamegraph.pl, in microseconds"""
+        with open(path, "w") as f:
+            for stack, seconds in sorted(self.folded.items()):
+                microseconds = int(round(seconds * 1e6))
+                if microseconds > 0:
+                    f.write(f"{';'.join(stack)} {microseconds}\n")
+
+    def chrome_trace(self, time_scale: float = 1e6) -> dict:
+        """Return a Chrome trace with the profiled spans and the simulated schedule.
+
+        The schedule track uses simulated time, one unit shown as time_scale
+        microseconds; the Gantt segments of each core form one thread.
+        """
+        events = [
+            {"ph": "M", "name": "process_name", "pid": 1, "args": {"name": "simulator (wall clock)"}},
+            {"ph": "M", "name": "process_name", "pid": 2, "args": {"name": "schedule (simulated time)"}},
+        ]
+        events.extend({"ph": "X", "name": name, "pid": 1, "tid": 1, "ts": start * 1e6, "dur": duration * 1e6}
+                      for name, start, duration in self.spans)
+
+        scheduler = self.scheduler
+        charts = [core.gantt_chart for core in scheduler.cores] if hasattr(scheduler, "cores") \
+            else [scheduler.gantt_chart]
+        budget = self.max_trace_events
+        for tid, chart in enumerate(charts):
+            events.append({"ph": "M", "name": "thread_name", "pid": 2, "tid": tid,
+                           "args": {"name": f"core {tid}"}})
+            for pid, start, end in chart:
+                if budget <= 0:
+                    break
+                budget -= 1
+                events.append({"ph": "X", "name": f"P{pid}", "pid": 2, "tid": tid,
+                               "ts": start * time_scale, "dur": (end - start) * time_scale,
+                               "args": {"pid": pid}})
+        events.extend({"ph": "C", "name": "ready_queue", "pid": 2, "ts": time * time_scale,
+                       "args": {"length": length}}
+                      for time, length in zip(self.queue_times, self.queue_lengths))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str, time_scale: float = 1e6):
+        """Write chrome_trace() as JSON"""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(time_scale), f)
@@ -0,0 +1,332 @@
+"""
+Comparative reports over many simulation runs.
+
+    python -m utils.report sweep/results.csv --out report --formats csv parquet
+
+build_report() takes one row per run, as written by utils.sweep: the
+algorithm, workload and configuration columns followed by the metrics. It
+writes into out_dir:
+
+- runs.csv and summary.csv (and .parquet with formats=("csv", "parquet")):
+  every run, and the mean, minimum and maximum of each metric per workload
+  and algorithm,
+- figures/*.png: an overview, plus per-workload metric bars and an
+  energy/waiting-time trade-off plot,
+- report.pdf: the summary table and the figures, laid out with reportlab.
+
+Figures are drawn on matplotlib Agg canvases in worker processes, never
+through pyplot, so a report can be built from a background thread of the
+GUI without touching its Tk backend. Each figure is cached under a name
+derived from the hashes of the runs it shows and of how it is drawn;
+building the report again only renders the figures whose runs changed.
+pandas is required; reportlab is imported only to write the PDF.
+"""
+import argparse
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+CONFIG_COLUMNS = ("algorithm", "workload", "voltage", "frequency", "quantum")
+VOLATILE_COLUMNS = ("wall_time",)  # Vary between identical runs; left out of run hashes
+METRICS = ("total_energy_consumption", "avg_waiting_time", "avg_turnaround_time",
+           "avg_response_time", "deadline_misses", "context_switches")
+FIGURE_VERSION = 1  # Bump when drawing code changes, to invalidate cached figures
+FIGURE_SIZE = (10.0, 6.0)  # Inches
+DPI = 120
+
+def load_runs(source):
+    """Return runs as a DataFrame from a DataFrame, a list of dicts or a .csv/.parquet file"""
+    import pandas as pd
+    if isinstance(source, pd.DataFrame):
+        runs = source.copy()
+    elif isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.lower().endswith((".parquet", ".pq")):
+            runs = pd.read_parquet(path)
+        else:
+            runs = pd.read_csv(path, float_precision="round_trip")
+    else:
+        runs = pd.DataFrame(list(source))
+    if "algorithm" not in runs.columns:
+        raise ValueError("Runs need an 'algorithm' column")
+    if "workload" not in runs.columns:
+        runs["workload"] = "workload"
+    return runs
+
+def metric_columns(runs) -> List[str]:
+    """Numeric columns that hold results rather than configuration"""
+    skip = set(CONFIG_COLUMNS) | set(VOLATILE_COLUMNS)
+    return [name for name in runs.columns
+            if name not in skip and runs[name].dtype.kind in "biuf"]
+
+def run_hashes(runs) -> List[str]:
+    """Return a content hash per run, ignoring columns that vary between identical runs"""
+    columns = sorted(name for name in runs.columns if name not in VOLATILE_COLUMNS)
+    hashes = []
+    for row in runs[columns].itertuples(index=False, name=None):
+        # repr keeps floats exact; NaN and None hash alike
+        text = "|".join("nan" if value is None or value != value else repr(value) for value in row)
+        hashes.append(hashlib.sha1(f"{columns}|{text}".encode()).hexdigest())
+    return hashes
+
+def summarize(runs):
+    """Return mean, min and max of every metric per workload and algorithm"""
+    metrics = metric_columns(runs)
+    grouped = runs.groupby(["workload", "algorithm"], sort=True)
+    summary = grouped[metrics].agg(["mean", "min", "max"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    summary.insert(0, "runs", grouped.size())
+    return summary.reset_index()
+
+def write_tables(runs, summary, out_dir: str, formats: Sequence[str] = ("csv",)) -> List[str]:
+    """Write the runs and the summary in each format; returns the paths written"""
+    paths = []
+    for name, frame in (("runs", runs), ("summary", summary)):
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{name}.{fmt}")
+            partial = f"{path}.part"
+            if fmt == "csv":
+                frame.to_csv(partial, index=False)
+            elif fmt == "parquet":
+                frame.to_parquet(partial, index=False)
+            else:
+                raise ValueError(f"Unknown table format {fmt!r}; use csv or parquet")
+            os.replace(partial, path)
+            paths.append(path)
+    return paths
+
+# Figures
+
+def _figure_tasks(runs, hashes: List[str], figure_dir: str) -> List[dict]:
+    """Describe every figure of the report, with the data it needs and its cache path"""
+    metrics = [name for name in METRICS if name in runs.columns]
+    runs = runs.assign(_hash=hashes)
+    specs = [("overview", "All workloads", runs)]
+    for workload, group in runs.groupby("workload", sort=True):
+        specs.append(("metrics", str(workload), group))
+        if {"total_energy_consumption", "avg_waiting_time"} <= set(runs.columns):
+            specs.append(("tradeoff", str(workload), group))
+
+    tasks = []
+    for kind, title, group in specs:
+        columns = ["algorithm", "workload"] + metrics
+        key = json.dumps({"kind": kind, "title": title, "metrics": metrics, "version": FIGURE_VERSION,
+                          "size": FIGURE_SIZE, "dpi": DPI, "runs": sorted(group["_hash"])})
+        digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+        tasks.append({
+            "kind": kind,
+            "title": title,
+            "metrics": metrics,
+            "rows": group[columns].to_dict("records"),
+            "path": os.path.join(figure_dir, f"{kind}-{digest}.png"),
+        })
+    return tasks
+
+def _grouped(rows: List[dict], key: str) -> Dict[str, List[dict]]:
+    groups: Dict[str, List[dict]] = {}
+    for row in rows:
+        groups.setdefault(str(row[key]), []).append(row)
+    return dict(sorted(groups.items()))
+
+def _finite(values: Iterable) -> List[float]:
+    return [float(value) for value in values if value is not None and math.isfinite(value)]
+
+def _draw_metrics(figure, task: dict):
+    """One bar chart per metric: mean per algorithm, with the min-max range as error bars"""
+    metrics = task["metrics"]
+    by_algorithm = _grouped(task["rows"], "algorithm")
+    names = list(by_algorithm)
+    columns = min(3, max(len(metrics), 1))
+    rows = math.ceil(len(metrics) / columns) or 1
+    for index, metric in enumerate(metrics):
+        ax = figure.add_subplot(rows, columns, index + 1)
+        means, lower, upper = [], [], []
+        for name in names:
+            values = _finite(row[metric] for row in by_algorithm[name]) or [0.0]
+            mean = sum(values) / len(values)
+            means.append(mean)
+            lower.append(mean - min(values))
+            upper.append(max(values) - mean)
+        ax.bar(range(len(names)), means, yerr=[lower, upper], color=[f"C{i % 10}" for i in range(len(names))],
+               capsize=3)
+        ax.set_xticks(range(len(names)))
+        ax.set_xticklabels(names, rotation=45, ha="right", fontsize=7)
+        ax.set_title(metric.replace("_", " "), fontsize=9)
+        ax.tick_params(axis="y", labelsize=7)
+    figure.suptitle(f"Workload {task['title']}")
+
+def _draw_tradeoff(figure, task: dict):
+    """Energy against mean waiting time, one point per run"""
+    ax = figure.add_subplot(111)
+    for index, (name, rows) in enumerate(_grouped(task["rows"], "algorithm").items()):
+        ax.scatter([row["avg_waiting_time"] for row in rows], [row["total_energy_consumption"] for row in rows],
+                   label=name, color=f"C{index % 10}", s=18, alpha=0.8)
+    ax.set_xlabel("Average waiting time")
+    ax.set_ylabel("Total energy consumption")
+    ax.legend(fontsize=7)
+    ax.set_title(f"Energy / waiting time trade-off, workload {task['title']}")
+
+def _draw_overview(figure, task: dict):
+    """Mean of each metric per algorithm relative to the worst algorithm, over all workloads"""
+    metrics = task["metrics"]
+    by_workload = _grouped(task["rows"], "workload")
+    algorithms = sorted({str(row["algorithm"]) for row in task["rows"]})
+    # Average the per-workload ratios to the worst (highest) mean, so workloads weigh equally
+    ratios = [[[] for _ in metrics] for _ in algorithms]
+    for rows in by_workload.values():
+        by_algorithm = _grouped(rows, "algorithm")
+        for m, metric in enumerate(metrics):
+            means = {}
+            for name, group in by_algorithm.items():
+                values = _finite(row[metric] for row in group)
+                if values:
+                    means[name] = sum(values) / len(values)
+            worst = max(means.values(), default=0.0)
+            for a, name in enumerate(algorithms):
+                if name in means:
+                    ratios[a][m].append(means[name] / worst if worst > 0 else 0.0)
+    grid = [[sum(cell) / len(cell) if cell else float("nan") for cell in row] for row in ratios]
+
+    ax = figure.add_subplot(111)
+    image = ax.imshow(grid, cmap="RdYlGn_r", aspect="auto", vmin=0.0, vmax=1.0)
+    ax.set_xticks(range(len(metrics)))
+    ax.set_xticklabels([metric.replace("_", " ") for metric in metrics], rotation=30, ha="right", fontsize=8)
+    ax.set_yticks(range(len(algorithms)))
+    ax.set_yticklabels(algorithms, fontsize=8)
+    for a, row in enumerate(grid):
+        for m, value in enumerate(row):
+            if math.isfinite(value):
+                ax.text(m, a, f"{value:.2f}", ha="center", va="center", fontsize=7)
+    figure.colorbar(image, ax=ax, label="mean / worst mean (lower is better)")
+    ax.set_title(f"Relative performance over {len(by_workload)} workload(s)")
+
+_DRAW = {"metrics": _draw_metrics, "tradeoff": _draw_tradeoff, "overview": _draw_overview}
+
+def render_figure(task: dict) -> str:
+    """Draw one figure to its PNG path with the Agg canvas; returns the path"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=FIGURE_SIZE, dpi=DPI)
+    FigureCanvasAgg(figure)
+    _DRAW[task["kind"]](figure, task)
+    figure.tight_layout()
+    partial = task["path"] + ".part"
+    figure.savefig(partial, format="png")
+    os.replace(partial, task["path"])
+    return task["path"]
+
+def render_figures(tasks: List[dict], max_workers: Optional[int] = None) -> int:
+    """Render the figures that are not cached yet, in parallel; returns how many were drawn"""
+    todo = [task for task in tasks if not os.path.exists(task["path"])]
+    workers = min(max_workers or os.cpu_count() or 1, len(todo))
+    if workers <= 1:
+        for task in todo:
+            render_figure(task)
+    else:
+        # Spawned workers never inherit a GUI's Tk state
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            list(executor.map(render_figure, todo))
+    return len(todo)
+
+# PDF
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        return "" if value != value else f"{value:.4g}"
+    return str(value)
+
+def write_pdf(path: str, summary, tasks: List[dict], title: str = "Scheduling report"):
+    """Lay out the summary table and the figures as a PDF with reportlab"""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    page_width, _ = landscape(A4)
+    width = page_width - 3 * cm
+    partial = path + ".part"
+    document = SimpleDocTemplate(partial, pagesize=landscape(A4), title=title,
+                                 leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm)
+
+    columns = ["workload", "algorithm", "runs"] + [f"{metric}_mean" for metric in METRICS
+                                                   if f"{metric}_mean" in summary.columns]
+    header = [name.replace("_mean", "").replace("_", " ") for name in columns]
+    table = Table([header] + [[_format(value) for value in row]
+                              for row in summary[columns].itertuples(index=False, name=None)],
+                  repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("ALIGN", (2, 1), (-1, -1), "RIGHT"),
+    ]))
+    story = [
+        Paragraph(title, styles["Title"]),
+        Paragraph(f"{int(summary['runs'].sum())} runs of {summary['algorithm'].nunique()} algorithm(s) "
+                  f"on {summary['workload'].nunique()} workload(s). Metrics are means over the runs "
+                  "of each algorithm and workload.", styles["Normal"]),
+        Spacer(1, 0.5 * cm),
+        table,
+    ]
+    height = width * FIGURE_SIZE[1] / FIGURE_SIZE[0]
+    scale = min(1.0, (landscape(A4)[1] - 4 * cm) / height)
+    for task in tasks:
+        story.extend([PageBreak(), Image(task["path"], width=width * scale, height=height * scale)])
+    document.build(story)
+    os.replace(partial, path)
+
+def build_report(source, out_dir: str, formats: Sequence[str] = ("csv",), pdf: bool = True,
+                 max_workers: Optional[int] = None, title: str = "Scheduling report") -> dict:
+    """Write tables, figures and the PDF for the runs in source.
+
+    Returns the paths written and how many figures were rendered rather
+    than reused from the cache.
+    """
+    runs = load_runs(source)
+    figure_dir = os.path.join(out_dir, "figures")
+    os.makedirs(figure_dir, exist_ok=True)
+
+    summary = summarize(runs)
+    tables = write_tables(runs, summary, out_dir, formats)
+    tasks = _figure_tasks(runs, run_hashes(runs), figure_dir)
+    rendered = render_figures(tasks, max_workers)
+
+    # Figures of runs no longer in the report are stale
+    current = {os.path.basename(task["path"]) for task in tasks}
+    for name in os.listdir(figure_dir):
+        if name.endswith(".png") and name not in current:
+            os.remove(os.path.join(figure_dir, name))
+
+    result = {"tables": tables, "figures": [task["path"] for task in tasks], "rendered": rendered}
+    if pdf:
+        result["pdf"] = os.path.join(out_dir, "report.pdf")
+        write_pdf(result["pdf"], summary, tasks, title)
+    return result
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.report",
+                                     description="Build a comparative report from simulation runs")
+    parser.add_argument("runs", help="runs table (.csv or .parquet), e.g. a sweep's results.csv")
+    parser.add_argument("--out", required=True, help="report directory, reused to cache figures")
+    parser.add_argument("--formats", nargs="+", choices=("csv", "parquet"), default=["csv"],
+                        help="table formats")
+    parser.add_argument("--no-pdf", action="store_true", help="write tables and figures only")
+    parser.add_argument("--workers", type=int, default=None, help="processes rendering figures")
+    parser.add_argument("--title", default="Scheduling report")
+    args = parser.parse_args(argv)
+
+    result = build_report(args.runs, args.out, args.formats, not args.no_pdf, args.workers, args.title)
+    print(f"{len(result['figures'])} figures ({result['rendered']} rendered), "
+          f"report in {result.get('pdf', args.out)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Parallel parameter sweeps: algorithm x workload x DVFS operating point x quantum.
+
+Every workload is written once to the memory-mapped binary format of
+utils.workload, and worker processes stream it from disk, so tasks carry
+only a file path and a few parameters. Every finished task is saved under
+out_dir/results, named by a hash of the task and of the trace it read, so
+an interrupted sweep resumes where it stopped when run again with the same
+out_dir, whatever the number of workers. Only the missing tasks are
+grouped into chunks for the workers.
+
+Operating points apply to the policies that run at a fixed speed; those
+that choose their own operating point at every dispatch (DVFS, EA-SJF,
+GRR, EA-EDF, YDS) run once per workload and quantum, with NaN voltage and
+frequency in their rows.
+
+Usage:
+    python -m utils.sweep --algorithms FCFS SJF "Round Robin" \\
+        --workloads trace.csv --dvfs 1.0:1.0 0.8:0.6 --quanta 1 2 4 --out sweep
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from algorithms import get_algorithm
+from utils.workload import BinaryWorkload, load_workload, write_binary
+
+Workload = Union[np.ndarray, str]
+
+def _parameter(cls, name: str) -> Optional[inspect.Parameter]:
+    """Return the named constructor argument of a scheduler class, if it takes one"""
+    for klass in cls.__mro__:
+        init = klass.__dict__.get("__init__")
+        if init is None:
+            continue
+        parameters = inspect.signature(init).parameters
+        if name in parameters:
+            return parameters[name]
+        if not any(p.kind is p.VAR_KEYWORD for p in parameters.values()):
+            return None
+    return None
+
+def _accepts(cls, name: str) -> bool:
+    """Whether a scheduler class takes the named constructor argument"""
+    return _parameter(cls, name) is not None
+
+def _file_key(path: str) -> str:
+    """Identify a file by its path, size and modification time"""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def _stage_workload(name: str, workload: Workload, directory: str) -> str:
+    """Write a workload to a binary trace in the sweep directory, once"""
+    if isinstance(workload, str) and workload.lower().endswith((".bin", ".wl")):
+        return os.path.abspath(workload)
+    # Name staged workloads by content, or by file identity, so an edited
+    # workload is never mistaken for a cached one
+    if isinstance(workload, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(workload).tobytes()).hexdigest()[:12]
+    else:
+        digest = hashlib.sha1(_file_key(workload).encode()).hexdigest()[:12]
+    path = os.path.join(directory, f"{name}-{digest}.bin")
+    if not os.path.exists(path):
+        chunks = [workload] if isinstance(workload, np.ndarray) else load_workload(workload).iter_chunks()
+        partial = path + ".part"
+        write_binary(partial, chunks)
+        os.replace(partial, path)
+    return path
+
+def build_tasks(algorithms: Sequence[str], workloads: Dict[str, str],
+                operating_points: Sequence[Tuple[float, float]] = ((1.0, 1.0),),
+                quanta: Sequence[Optional[float]] = (None,)) -> List[dict]:
+    """Expand the sweep grid into task dicts.
+
+    Quanta only apply to algorithms that take a time_quantum, and operating
+    points only to those that do not pick their own (no operating_points
+    argument); the others run once per remaining combination. A None
+    quantum stands for the algorithm's default, which is recorded instead.
+    """
+    tasks = []
+    for algorithm, (workload, path) in product(algorithms, workloads.items()):
+        policy = get_algorithm(algorithm)
+        points = ((None, None),) if _accepts(policy, "operating_points") else operating_points
+        quantum_parameter = _parameter(policy, "time_quantum")
+        if quantum_parameter is None:
+            policy_quanta = (None,)
+        else:
+            policy_quanta = [quantum_parameter.default if quantum is None else quantum for quantum in quanta]
+        for point, quantum in product(points, policy_quanta):
+            tasks.append({
+                "algorithm": algorithm,
+                "workload": workload,
+                "path": path,
+                "voltage": point[0],
+                "frequency": point[1],
+                "quantum": quantum,
+            })
+    return tasks
+
+def run_task(task: dict) -> dict:
+    """Run one sweep task and return its metrics row"""
+    kwargs = {} if task["quantum"] is None else {"time_quantum": task["quantum"]}
+    scheduler = get_algorithm(task["algorithm"])(keep_completed=False, **kwargs)
+    voltage, frequency = task["voltage"], task["frequency"]
+
+    def processes():
+        for process in BinaryWorkload(task["path"]):
+            process.set_dvfs_parameters(voltage, frequency)
+            yield process
+
+    started = time.perf_counter()
+    scheduler.add_source(BinaryWorkload(task["path"]) if voltage is None else processes())
+    metrics = scheduler.run()
+    row = {name: value for name, value in task.items() if name != "path"}
+    for name in ("voltage", "frequency", "quantum"):
+        if task[name] is None:
+            row[name] = np.nan
+    row.update(metrics)
+    row["completed"] = scheduler.metrics.count
+    row["wall_time"] = time.perf_counter() - started
+    return row
+
+def _run_chunk(tasks: List[dict]) -> List[dict]:
+    return [run_task(task) for task in tasks]
+
+def _task_id(task: dict) -> str:
+    """Stable name for a task, derived from its parameters and the trace it reads"""
+    key = json.dumps(dict(task, path=_file_key(task["path"])), sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+def sweep(algorithms: Sequence[str], workloads: Dict[str, Workload],
+          operating_points: Sequence[Tuple[float, float]] = ((1.0, 1.0),),
+          quanta: Sequence[Optional[float]] = (None,),
+          out_dir: Optional[str] = None, max_workers: Optional[int] = None,
+          chunk_size: Optional[int] = None):
+    """Run the full sweep grid in parallel and return a pandas DataFrame.
+
+    Workloads map a name to a workload array or a trace file. Results of
+    finished tasks are kept in out_dir and reused when the sweep is rerun.
+    """
+    import pandas as pd
+
+    out_dir = out_dir or tempfile.mkdtemp(prefix="sweep-")
+    results_dir = os.path.join(out_dir, "results")
+    workload_dir = os.path.join(out_dir, "workloads")
+    os.makedirs(results_dir, exist_ok=True)
+    os.makedirs(workload_dir, exist_ok=True)
+
+    paths = {name: _stage_workload(name, workload, workload_dir) for name, workload in workloads.items()}
+    tasks = build_tasks(algorithms, paths, operating_points, quanta)
+
+    frames = []
+    todo = []
+    for task in tasks:
+        path = os.path.join(results_dir, f"task-{_task_id(task)}.csv")
+        if os.path.exists(path):
+            frames.append(pd.read_csv(path, float_precision="round_trip"))
+        else:
+            todo.append((path, task))
+
+    if todo:
+        max_workers = max_workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(1, len(todo) // (max_workers * 4))
+        chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_run_chunk, [task for _, task in chunk]): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                for (path, _), row in zip(futures[future], future.result()):
+                    frame = pd.DataFrame([row])
+                    # Write then rename so a crash never leaves a partial result behind
+                    frame.to_csv(path + ".part", index=False)
+                    os.replace(path + ".part", path)
+                    frames.append(frame)
+
+    results = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if not results.empty:
+        results = results.sort_values(["algorithm", "workload", "voltage", "frequency", "quantum"],
+                                      na_position="first", ignore_index=True)
+    results.to_csv(os.path.join(out_dir, "results.csv"), index=False)
+    return results
+
+def _workload_names(paths: Sequence[str]) -> Dict[str, str]:
+    """Name trace files after their base name, adding a hash of the path when several share it"""
+    paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    return {stem if stems.count(stem) == 1 else f"{stem}-{hashlib.sha1(path.encode()).hexdigest()[:8]}": path
+            for stem, path in zip(stems, paths)}
+
+def _operating_point(text: str) -> Tuple[float, float]:
+    try:
+        voltage, frequency = (float(value) for value in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected VOLTAGE:FREQUENCY, got {text!r}") from None
+    return voltage, frequency
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Run a parallel scheduling parameter sweep")
+    parser.add_argument("--algorithms", nargs="+", required=True, help="algorithm names")
+    parser.add_argument("--workloads", nargs="+", required=True, help="trace files (.csv, .parquet, .bin)")
+    parser.add_argument("--dvfs", nargs="+", type=_operating_point, default=[(1.0, 1.0)],
+                        metavar="V:F", help="voltage:frequency operating points of fixed-speed policies")
+    parser.add_argument("--quanta", nargs="+", type=float, default=[None],
+                        help="time quanta for quantum-based algorithms")
+    parser.add_argument("--out", required=True, help="sweep directory, reused to resume")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="tasks per work unit")
+    args = parser.parse_args(argv)
+
+    workloads = _workload_names(args.workloads)
+    results = sweep(args.algorithms, workloads, args.dvfs, args.quanta,
+                    out_dir=args.out, max_workers=args.workers, chunk_size=args.chunk_size)
+    print(f"{len(results)} runs written to {os.path.join(args.out, 'results.csv')}")
+
+if __name__ == "__main__":
+    main()
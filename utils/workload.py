@@ -0,0 +1,185 @@
+"""
+Streaming workload loaders for CSV, Parquet and a memory-mapped binary format.
+
+Readers yield Process objects in file order, reading one chunk at a time, so
+a trace of any length can be fed to Scheduler.add_source() with bounded
+memory. Traces must be sorted by arrival time. Columns are named after the
+Process fields; only arrival_time and burst_time are required (see
+utils.columns).
+
+Readers can be pickled mid-stream: they keep their position and reopen the
+file when resumed.
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Optional, Union
+import numpy as np
+from models.batch import WORKLOAD_DTYPE
+from models.process import Process
+from models.process_table import ProcessTable
+from utils.columns import COLUMN_DEFAULTS, check_columns
+
+# Binary traces: 8-byte magic, little-endian uint64 row count, then raw records
+_MAGIC = b"CPUWL\x00\x01\x00"
+_HEADER_SIZE = 16
+_FILE_DTYPE = WORKLOAD_DTYPE.newbyteorder("<")
+
+def _frame_to_workload(frame, first_row: int) -> np.ndarray:
+    """Convert a pandas chunk into a workload array"""
+    check_columns(frame.columns)
+    workload = np.empty(len(frame), dtype=WORKLOAD_DTYPE)
+    for name in WORKLOAD_DTYPE.names:
+        if name in frame.columns:
+            workload[name] = frame[name].to_numpy()
+        elif name == "pid":
+            workload[name] = np.arange(first_row + 1, first_row + len(frame) + 1)
+        else:
+            workload[name] = COLUMN_DEFAULTS[name]
+    return workload
+
+def _row_to_process(row: tuple) -> Process:
+    pid, arrival, burst, priority, deadline, voltage, frequency = row
+    process = Process(pid, arrival, burst, priority, None if deadline != deadline else deadline)
+    process.set_dvfs_parameters(voltage, frequency)
+    return process
+
+class WorkloadReader(ABC):
+    """Base class for chunked, resumable workload readers"""
+
+    def __init__(self, path: str, chunk_size: int = 65536):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.path = os.fspath(path)
+        self.chunk_size = chunk_size
+        self.position = 0  # Rows already yielded by __next__
+        self._chunks: Optional[Iterator[np.ndarray]] = None
+        self._rows: List[tuple] = []
+        self._offset = 0
+
+    @abstractmethod
+    def _read_chunks(self, start: int) -> Iterator[np.ndarray]:
+        """Yield workload arrays of up to chunk_size rows, from row `start` on"""
+        pass
+
+    def iter_chunks(self) -> Iterator[np.ndarray]:
+        """Yield the whole trace as workload arrays, independently of __next__"""
+        return self._read_chunks(0)
+
+    def __iter__(self) -> "WorkloadReader":
+        return self
+
+    def __next__(self) -> Process:
+        if self._offset == len(self._rows):
+            if self._chunks is None:
+                self._chunks = self._read_chunks(self.position)
+            chunk = next(self._chunks)  # StopIteration ends the stream
+            self._rows = chunk.tolist()
+            self._offset = 0
+            if not self._rows:
+                return next(self)
+        row = self._rows[self._offset]
+        self._offset += 1
+        self.position += 1
+        return _row_to_process(row)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(_chunks=None, _rows=[], _offset=0)
+        return state
+
+    def to_table(self) -> ProcessTable:
+        """Read the whole trace into a ProcessTable"""
+        table = ProcessTable()
+        for chunk in self.iter_chunks():
+            table.extend(chunk["arrival_time"], chunk["burst_time"], chunk["priority"],
+                         chunk["deadline"], chunk["voltage"], chunk["frequency"], chunk["pid"])
+        return table
+
+class CSVWorkload(WorkloadReader):
+    """Stream a CSV trace with a header row"""
+
+    def _read_chunks(self, start: int) -> Iterator[np.ndarray]:
+        import pandas as pd
+        skip = range(1, start + 1) if start else None
+        with pd.read_csv(self.path, chunksize=self.chunk_size, skiprows=skip,
+                         float_precision="round_trip") as reader:
+            first_row = start
+            for frame in reader:
+                yield _frame_to_workload(frame, first_row)
+                first_row += len(frame)
+
+class ParquetWorkload(WorkloadReader):
+    """Stream a Parquet trace one record batch at a time (requires pyarrow)"""
+
+    def _read_chunks(self, start: int) -> Iterator[np.ndarray]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet workloads requires pyarrow: pip install pyarrow") from None
+        parquet = pq.ParquetFile(self.path)
+        first_row = 0
+        for batch in parquet.iter_batches(batch_size=self.chunk_size):
+            if first_row + batch.num_rows <= start:
+                first_row += batch.num_rows
+                continue
+            frame = batch.to_pandas()
+            if first_row < start:
+                frame = frame.iloc[start - first_row:]
+                first_row = start
+            yield _frame_to_workload(frame, first_row)
+            first_row += len(frame)
+
+class BinaryWorkload(WorkloadReader):
+    """Stream a binary trace written by write_binary() through a memory map"""
+
+    def __len__(self) -> int:
+        return len(self.records())
+
+    def records(self) -> np.ndarray:
+        """Return the whole trace as a read-only memory-mapped array"""
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[:8] != _MAGIC:
+            raise ValueError(f"{self.path} is not a binary workload file")
+        count = int.from_bytes(header[8:], "little")
+        if count == 0:
+            return np.empty(0, dtype=_FILE_DTYPE)
+        return np.memmap(self.path, dtype=_FILE_DTYPE, mode="r", offset=_HEADER_SIZE, shape=(count,))
+
+    def _read_chunks(self, start: int) -> Iterator[np.ndarray]:
+        records = self.records()
+        for offset in range(start, len(records), self.chunk_size):
+            yield records[offset:offset + self.chunk_size]
+
+def write_binary(path: str, workload: Union[np.ndarray, Iterable[np.ndarray]]) -> int:
+    """Write a workload array, or an iterable of chunks, as a binary trace.
+
+    Returns the number of rows written.
+    """
+    chunks = [workload] if isinstance(workload, np.ndarray) else workload
+    count = 0
+    with open(path, "wb") as f:
+        f.write(_MAGIC + bytes(8))
+        for chunk in chunks:
+            chunk = np.asarray(chunk).astype(_FILE_DTYPE, copy=False)
+            chunk.tofile(f)
+            count += len(chunk)
+        f.seek(8)
+        f.write(count.to_bytes(8, "little"))
+    return count
+
+_READERS = {
+    ".csv": CSVWorkload,
+    ".parquet": ParquetWorkload,
+    ".pq": ParquetWorkload,
+    ".bin": BinaryWorkload,
+    ".wl": BinaryWorkload,
+}
+
+def load_workload(path: str, chunk_size: int = 65536) -> WorkloadReader:
+    """Open a workload file with the reader matching its extension"""
+    extension = os.path.splitext(os.fspath(path))[1].lower()
+    if extension not in _READERS:
+        raise ValueError(f"Unsupported workload format {extension!r}; "
+                         f"use one of {', '.join(sorted(_READERS))}")
+    return _READERS[extension](path, chunk_size=chunk_size)